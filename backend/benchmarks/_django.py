@@ -0,0 +1,53 @@
+# benchmarks/_django.py
+"""
+Arranque común de los benchmarks: configura Django y crea una base de
+prueba descartable (SQLite en memoria, o la de DATABASE_URL con prefijo test_).
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def preparar_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+    import django
+    django.setup()
+
+
+def crear_base_de_prueba():
+    """Crea la base de prueba y devuelve la función para destruirla."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    nombre_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+
+    def destruir():
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+    return destruir
+
+
+def cronometrar(fn, repeticiones=3):
+    """Mejor tiempo (segundos) de `repeticiones` corridas de fn()."""
+    mejor = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor
+
+
+def percentil(valores, p):
+    """Percentil p (0..1) de una lista de valores, sin interpolar."""
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
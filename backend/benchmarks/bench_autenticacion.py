@@ -0,0 +1,78 @@
+# benchmarks/bench_autenticacion.py
+"""
+Queries y requests/segundo de un GET autenticado con JWT:
+JWTAuthentication (SELECT de auth_user por request) vs
+StatelessJWTAuthentication (core_app.authentication, usuario desde los claims).
+
+    cd backend
+    python -m benchmarks.bench_autenticacion        # 500 requests
+    python -m benchmarks.bench_autenticacion 2000
+"""
+import sys
+
+from benchmarks._django import crear_base_de_prueba, cronometrar, preparar_django
+
+preparar_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.models import Group  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.utils.module_loading import import_string  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from catalogo.models import Categoria  # noqa: E402
+from catalogo.views import CategoriaViewSet  # noqa: E402
+from core_app.models import Local  # noqa: E402
+from core_app.serializers import MyTokenObtainPairSerializer  # noqa: E402
+
+URL = "/api/catalogo/categorias/"
+
+CLASES = {
+    "JWTAuthentication": "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "StatelessJWTAuthentication": "core_app.authentication.StatelessJWTAuthentication",
+}
+
+
+def sembrar():
+    local = Local.objects.create(nombre="Bench")
+    Categoria.objects.bulk_create(Categoria(local=local, nombre=f"Cat {i}") for i in range(20))
+    user = get_user_model().objects.create_user(username="bench", password="x")
+    user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+    token = MyTokenObtainPairSerializer.get_token(user).access_token
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_X_LOCAL_ID=str(local.id))
+    return client
+
+
+def medir(nombre, clase, client, n):
+    # las vistas leen DEFAULT_AUTHENTICATION_CLASSES al importarse: cambiamos la clase directo
+    CategoriaViewSet.authentication_classes = [import_string(clase)]
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(URL).status_code == 200
+    # cada request vacía connection.queries: contamos antes de seguir
+    queries = len(ctx.captured_queries)
+
+    def requests():
+        for _ in range(n):
+            client.get(URL)
+
+    t = cronometrar(requests)
+    print(f"{nombre:<28} {queries:>8} {n / t:>12,.0f}")
+
+
+def main(n):
+    destruir = crear_base_de_prueba()
+    try:
+        client = sembrar()
+        print(f"{'autenticación':<28} {'queries':>8} {'requests/s':>12}")
+        for nombre, clase in CLASES.items():
+            medir(nombre, clase, client, n)
+    finally:
+        destruir()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
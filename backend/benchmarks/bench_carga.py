@@ -0,0 +1,423 @@
+# benchmarks/bench_carga.py
+"""
+Prueba de carga de punta a punta de las cajas.
+
+Crea una base descartable y la siembra (local, productos, usuario con JWT).
+Después levanta la app con gunicorn.conf.py en un puerto local y la carga con
+N usuarios concurrentes, cada uno repitiendo una mezcla de escenarios:
+
+- checkout:  escanear productos -> crear venta -> confirmar -> ticket
+- catalogo:  lista de precios con If-None-Match + delta-sync de productos
+- dashboard: resumen financiero, top productos e historial de ventas
+
+Informa throughput y p50/p95/p99 por endpoint y checkouts por segundo. Lo
+compara con un baseline guardado y sale con código 1 si algo empeoró más
+que --tolerancia, así se puede correr antes de cada deploy.
+
+    cd backend
+    python -m benchmarks.bench_carga                                # SQLite temporal
+    DATABASE_URL=postgres://... python -m benchmarks.bench_carga    # base test_<nombre>
+    python -m benchmarks.bench_carga --usuarios 32 --duracion 60 --workers 4
+    python -m benchmarks.bench_carga --guardar-baseline             # fija el baseline
+
+Con Postgres se crea (y se borra al final) test_<nombre>, como en los tests.
+SQLite (en WAL) sirve para probar el harness, pero serializa todas las
+escrituras: sus números no dicen nada de producción. El baseline depende de
+la máquina: hay que guardarlo en la misma donde se compara.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks._django import BACKEND_DIR, percentil
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "carga.json"
+MEZCLA = "checkout=60,catalogo=25,dashboard=15"
+
+
+# ---------------------------------------------------------------------------
+# base sembrada
+# ---------------------------------------------------------------------------
+def crear_base(directorio, productos):
+    """Crea y siembra la base. Devuelve (DATABASE_URL para la app, token, codigos, destruir)."""
+    url_original = os.environ.get("DATABASE_URL", "")
+    if not url_original:
+        # sin Postgres: un archivo SQLite que comparten el harness y los workers.
+        # IMMEDIATE + timeout: las transacciones esperan el lock de escritura en
+        # vez de fallar con "database is locked" al pasar de leer a escribir
+        os.environ["DATABASE_URL"] = (
+            f"sqlite:///{directorio / 'bench.sqlite3'}?transaction_mode=IMMEDIATE&timeout=30"
+        )
+
+    from benchmarks._django import preparar_django
+
+    preparar_django()
+
+    from django.db import connection
+
+    nombre_original = connection.settings_dict["NAME"]
+    if url_original:
+        nombre = connection.creation.create_test_db(verbosity=0)
+        url_app = urlsplit(url_original)._replace(path=f"/{nombre}").geturl()
+
+        def destruir():
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+    else:
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        with connection.cursor() as cursor:
+            # WAL queda guardado en el archivo: las lecturas no esperan a las escrituras
+            cursor.execute("PRAGMA journal_mode=WAL")
+        url_app = os.environ["DATABASE_URL"]
+
+        def destruir():
+            connection.close()
+
+    token, codigos = sembrar(productos)
+    connection.close()
+    return url_app, token, codigos, destruir
+
+
+def sembrar(cantidad):
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+
+    from catalogo.models import Categoria, Producto
+    from core_app.models import Local
+    from core_app.serializers import MyTokenObtainPairSerializer
+
+    # VentaViewSet.create usa local_id=1 fijo
+    local, _ = Local.objects.get_or_create(id=1, defaults={"nombre": "Bench"})
+    categorias = Categoria.objects.bulk_create(
+        Categoria(local=local, nombre=f"Categoría {i}") for i in range(40)
+    )
+    codigos = [f"B{i:07d}" for i in range(cantidad)]
+    Producto.objects.bulk_create(
+        (
+            Producto(
+                local=local, codigo=codigo, nombre=f"Producto {codigo}",
+                categoria=categorias[i % len(categorias)], marca=f"Marca {i % 25}",
+                precio_compra_prom=Decimal("600"), precio_venta=Decimal("1000") + i % 500,
+                stock_actual=Decimal("1000000"),
+            )
+            for i, codigo in enumerate(codigos)
+        ),
+        batch_size=1000,
+    )
+
+    user = get_user_model().objects.create_user(username="bench", password="bench")
+    user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+    token = str(MyTokenObtainPairSerializer.get_token(user).access_token)
+    return token, codigos
+
+
+# ---------------------------------------------------------------------------
+# servidor
+# ---------------------------------------------------------------------------
+def levantar_servidor(url_base, puerto, workers, directorio):
+    env = {
+        **os.environ,
+        "DATABASE_URL": url_base,
+        "PORT": str(puerto),
+        "WEB_CONCURRENCY": str(workers),
+        "DJANGO_SECRET_KEY": os.environ.get("DJANGO_SECRET_KEY", "benchmark"),
+        "LISTAS_PRECIOS_DIR": str(directorio / "listas_precios"),
+        "PROMETHEUS_MULTIPROC_DIR": str(directorio / "prometheus"),
+        "LOG_LEVEL": "warning",
+    }
+    log = open(directorio / "gunicorn.log", "wb")
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "core.asgi:application"],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            sys.exit(f"gunicorn terminó al arrancar, ver {directorio / 'gunicorn.log'}")
+        try:
+            conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=2)
+            conexion.request("GET", "/api/health")
+            if conexion.getresponse().status == 200:
+                return proceso
+        except OSError:
+            time.sleep(0.2)
+    proceso.terminate()
+    sys.exit("gunicorn no respondió /api/health en 60 s")
+
+
+# ---------------------------------------------------------------------------
+# carga
+# ---------------------------------------------------------------------------
+class Resultados:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.escenarios = defaultdict(int)
+        self.midiendo = False
+
+    def registrar(self, endpoint, segundos, ok):
+        if not self.midiendo:
+            return
+        with self.lock:
+            self.latencias[endpoint].append(segundos)
+            if not ok:
+                self.errores[endpoint] += 1
+
+    def escenario(self, nombre):
+        if self.midiendo:
+            with self.lock:
+                self.escenarios[nombre] += 1
+
+
+class Caja:
+    """Un usuario virtual: su propia conexión keep-alive y su estado (ETag, cursor)."""
+
+    def __init__(self, puerto, token, codigos, resultados):
+        self.puerto = puerto
+        self.codigos = codigos
+        self.resultados = resultados
+        self.headers = {"Authorization": f"Bearer {token}", "X-Local-ID": "1"}
+        self.conexion = None
+        self.etag = None
+        self.cursor = ""
+        # la fecha del dashboard en la zona horaria de la app, no la de la máquina
+        from django.utils import timezone
+
+        self.hoy = timezone.localdate().isoformat()
+
+    def pedir(self, endpoint, metodo, ruta, cuerpo=None, headers=None, esperado=(200,)):
+        """Devuelve el JSON de la respuesta, o None si falló."""
+        h = dict(self.headers, **(headers or {}))
+        if cuerpo is not None:
+            cuerpo = json.dumps(cuerpo)
+            h["Content-Type"] = "application/json"
+
+        t0 = time.perf_counter()
+        try:
+            if self.conexion is None:
+                self.conexion = http.client.HTTPConnection("127.0.0.1", self.puerto, timeout=30)
+            self.conexion.request(metodo, ruta, body=cuerpo, headers=h)
+            respuesta = self.conexion.getresponse()
+            datos = respuesta.read()
+            ok = respuesta.status in esperado
+        except (OSError, http.client.HTTPException):
+            self.conexion = None
+            respuesta, datos, ok = None, b"", False
+        self.resultados.registrar(endpoint, time.perf_counter() - t0, ok)
+
+        if not ok:
+            return None
+        if respuesta.getheader("ETag"):
+            self.etag = respuesta.getheader("ETag")
+        if respuesta.getheader("Content-Encoding") == "gzip" or not datos:
+            return {}
+        return json.loads(datos)
+
+    def checkout(self):
+        detalles = []
+        for codigo in random.sample(self.codigos, random.randint(1, 4)):
+            encontrados = self.pedir(
+                "GET productos (escaneo)", "GET",
+                f"/api/catalogo/productos/?search={codigo}&fields=id,codigo,precio_venta",
+            )
+            if not encontrados or not encontrados["results"]:
+                return False
+            producto = encontrados["results"][0]
+            detalles.append({"producto": producto["id"], "cantidad": "1", "precio_unitario": producto["precio_venta"]})
+
+        venta = self.pedir("POST ventas", "POST", "/api/ventas/", {"detalles": detalles}, esperado=(201,))
+        if venta is None:
+            return False
+        if self.pedir("POST ventas/{id}/confirmar", "POST", f"/api/ventas/{venta['id']}/confirmar/") is None:
+            return False
+        return self.pedir("GET ventas/{id}/ticket", "GET", f"/api/ventas/{venta['id']}/ticket/") is not None
+
+    def catalogo(self):
+        headers = {"Accept-Encoding": "gzip"}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.pedir("GET lista-precios", "GET", "/api/catalogo/lista-precios/", headers=headers, esperado=(200, 304)) is None:
+            return False
+        cambios = self.pedir("GET productos/cambios", "GET", f"/api/catalogo/productos/cambios/?since={self.cursor}")
+        if cambios is None:
+            return False
+        self.cursor = cambios["cursor"] or ""
+        return True
+
+    def dashboard(self):
+        rango = f"desde={self.hoy}&hasta={self.hoy}"
+        return all(
+            self.pedir(endpoint, "GET", ruta) is not None
+            for endpoint, ruta in (
+                ("GET reportes/financieros", f"/api/reportes/financieros/?{rango}"),
+                ("GET reportes/top-productos", f"/api/reportes/top-productos/?{rango}"),
+                ("GET ventas/historial", f"/api/ventas/historial/?{rango}"),
+            )
+        )
+
+    def correr(self, mezcla, hasta):
+        escenarios = list(mezcla)
+        pesos = list(mezcla.values())
+        while time.monotonic() < hasta:
+            nombre = random.choices(escenarios, pesos)[0]
+            if getattr(self, nombre)():
+                self.resultados.escenario(nombre)
+
+
+def cargar(puerto, token, codigos, usuarios, mezcla, calentamiento, duracion):
+    resultados = Resultados()
+    inicio = time.monotonic()
+    hasta = inicio + calentamiento + duracion
+    cajas = [Caja(puerto, token, codigos, resultados) for _ in range(usuarios)]
+    threads = [threading.Thread(target=c.correr, args=(mezcla, hasta), daemon=True) for c in cajas]
+    for t in threads:
+        t.start()
+
+    time.sleep(calentamiento)
+    resultados.midiendo = True
+    t0 = time.monotonic()
+    for t in threads:
+        t.join()
+    return resultados, time.monotonic() - t0
+
+
+# ---------------------------------------------------------------------------
+# informe y baseline
+# ---------------------------------------------------------------------------
+def resumir(resultados, segundos, config):
+    endpoints = {}
+    for endpoint, latencias in sorted(resultados.latencias.items()):
+        endpoints[endpoint] = {
+            "requests": len(latencias),
+            "req_s": len(latencias) / segundos,
+            "p50_ms": percentil(latencias, 0.50) * 1000,
+            "p95_ms": percentil(latencias, 0.95) * 1000,
+            "p99_ms": percentil(latencias, 0.99) * 1000,
+            "errores": resultados.errores[endpoint],
+        }
+    return {
+        "config": config,
+        "segundos": segundos,
+        "escenarios_s": {nombre: n / segundos for nombre, n in sorted(resultados.escenarios.items())},
+        "endpoints": endpoints,
+    }
+
+
+def imprimir(resumen):
+    print(f"\n{'endpoint':<30} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errores':>8}")
+    for endpoint, m in resumen["endpoints"].items():
+        print(
+            f"{endpoint:<30} {m['requests']:>7} {m['req_s']:>8.1f} {m['p50_ms']:>8.1f} "
+            f"{m['p95_ms']:>8.1f} {m['p99_ms']:>8.1f} {m['errores']:>8}"
+        )
+    print()
+    for nombre, por_segundo in resumen["escenarios_s"].items():
+        print(f"{nombre + '/s':<30} {por_segundo:>8.2f}")
+
+
+def comparar(resumen, baseline, tolerancia):
+    """Lista de regresiones contra el baseline (vacía si está todo bien)."""
+    regresiones = []
+    if baseline["config"] != resumen["config"]:
+        print(f"\nOjo: el baseline se tomó con otra configuración: {baseline['config']}")
+
+    for nombre, base in baseline["escenarios_s"].items():
+        actual = resumen["escenarios_s"].get(nombre, 0.0)
+        if actual < base * (1 - tolerancia):
+            regresiones.append(f"{nombre}/s: {actual:.2f} (baseline {base:.2f})")
+
+    for endpoint, base in baseline["endpoints"].items():
+        actual = resumen["endpoints"].get(endpoint)
+        if actual is None:
+            continue
+        if actual["p95_ms"] > base["p95_ms"] * (1 + tolerancia):
+            regresiones.append(f"{endpoint} p95: {actual['p95_ms']:.1f} ms (baseline {base['p95_ms']:.1f} ms)")
+        if actual["errores"] > base["errores"]:
+            regresiones.append(f"{endpoint} errores: {actual['errores']} (baseline {base['errores']})")
+    return regresiones
+
+
+def _mezcla(texto):
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, peso = parte.split("=")
+        if nombre not in ("checkout", "catalogo", "dashboard"):
+            raise argparse.ArgumentTypeError(f"escenario desconocido: {nombre}")
+        mezcla[nombre] = float(peso)
+    return mezcla
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--usuarios", type=int, default=16, help="cajas concurrentes")
+    parser.add_argument("--duracion", type=float, default=30, help="segundos medidos")
+    parser.add_argument("--calentamiento", type=float, default=5, help="segundos sin medir al arrancar")
+    parser.add_argument("--workers", type=int, default=2, help="WEB_CONCURRENCY de gunicorn")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--productos", type=int, default=2000)
+    parser.add_argument("--mezcla", type=_mezcla, default=MEZCLA, help=f"pesos por escenario (default {MEZCLA})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--guardar-baseline", action="store_true")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="empeoramiento aceptado (0.20 = 20%%)")
+    args = parser.parse_args()
+    mezcla = args.mezcla  # argparse también le aplica _mezcla al default
+
+    config = {
+        "usuarios": args.usuarios, "duracion": args.duracion, "workers": args.workers,
+        "productos": args.productos, "mezcla": mezcla,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_carga_") as tmp:
+        directorio = Path(tmp)
+        print(f"Sembrando {args.productos} productos...")
+        url_base, token, codigos, destruir = crear_base(directorio, args.productos)
+        servidor = levantar_servidor(url_base, args.puerto, args.workers, directorio)
+        try:
+            print(f"{args.usuarios} cajas × {args.duracion:.0f} s contra {args.workers} workers ({mezcla})")
+            resultados, segundos = cargar(
+                args.puerto, token, codigos, args.usuarios, mezcla, args.calentamiento, args.duracion,
+            )
+        finally:
+            servidor.send_signal(signal.SIGTERM)
+            servidor.wait(timeout=30)
+            destruir()
+
+    resumen = resumir(resultados, segundos, config)
+    imprimir(resumen)
+
+    if args.guardar_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(resumen, indent=2, ensure_ascii=False) + "\n")
+        print(f"\nBaseline guardado en {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"\nSin baseline en {args.baseline}: correr con --guardar-baseline para fijarlo")
+        return
+
+    regresiones = comparar(resumen, json.loads(args.baseline.read_text()), args.tolerancia)
+    if regresiones:
+        print(f"\nREGRESIONES (tolerancia {args.tolerancia:.0%}):")
+        for r in regresiones:
+            print(f"  - {r}")
+        sys.exit(1)
+    print(f"\nSin regresiones contra {args.baseline} (tolerancia {args.tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_conexiones.py
+"""
+Ráfagas de requests cortos contra Postgres (apertura de locales: muchas cajas a
+la vez) con los tres modos de conexión de core/settings.py:
+
+- sin_persistencia: DB_CONN_MAX_AGE=0 (conexión + SSL nuevos en cada request)
+- persistente:      DB_CONN_MAX_AGE=600 (una conexión por thread, se reusa)
+- pool:             DB_POOL=1 (pool de psycopg 3 compartido por el proceso)
+
+Cada "request" es request_started -> SELECT 1 -> request_finished, igual que lo
+que hace Django al atender uno, así que se ejercita el cierre/devolución real de
+conexiones. Cada modo corre en un subproceso porque DATABASES se lee al arrancar.
+
+    cd backend
+    DATABASE_URL=postgres://... python -m benchmarks.bench_conexiones
+    DATABASE_URL=postgres://... python -m benchmarks.bench_conexiones 16 50   # threads, requests por thread
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# como bajo el worker sync: con el ASGI core/settings.py no deja conexiones persistentes
+MODOS = {
+    "sin_persistencia": {"GUNICORN_WORKER_CLASS": "sync", "DB_POOL": "0", "DB_CONN_MAX_AGE": "0"},
+    "persistente": {"GUNICORN_WORKER_CLASS": "sync", "DB_POOL": "0", "DB_CONN_MAX_AGE": "600"},
+    "pool": {"GUNICORN_WORKER_CLASS": "sync", "DB_POOL": "1"},
+}
+
+
+def correr_rafaga(threads, por_thread):
+    """Corre dentro del subproceso: devuelve métricas del modo configurado."""
+    from benchmarks._django import percentil, preparar_django
+
+    preparar_django()
+
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    def request():
+        t0 = time.perf_counter()
+        request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        request_finished.send(sender=None)
+        return time.perf_counter() - t0
+
+    def worker(_):
+        return [request() for _ in range(por_thread)]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencias = [lat for lista in pool.map(worker, range(threads)) for lat in lista]
+    total = time.perf_counter() - t0
+
+    return {
+        "req_s": len(latencias) / total,
+        "p50_ms": percentil(latencias, 0.50) * 1000,
+        "p95_ms": percentil(latencias, 0.95) * 1000,
+    }
+
+
+def main(threads, por_thread):
+    if not os.getenv("DATABASE_URL", "").startswith("postgres"):
+        sys.exit("Hace falta DATABASE_URL apuntando a Postgres (el pool es de psycopg 3).")
+
+    print(f"{threads} threads × {por_thread} requests")
+    print(f"{'modo':<18} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for nombre, env in MODOS.items():
+        salida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_conexiones", "--hijo", str(threads), str(por_thread)],
+            env={**os.environ, **env},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        m = json.loads(salida.strip().splitlines()[-1])
+        print(f"{nombre:<18} {m['req_s']:>10,.0f} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--hijo":
+        print(json.dumps(correr_rafaga(int(args[1]), int(args[2]))))
+    else:
+        main(int(args[0]) if args else 16, int(args[1]) if len(args) > 1 else 50)
@@ -0,0 +1,102 @@
+# benchmarks/bench_renderizado.py
+"""
+Render JSON y compresión de listados grandes: JSONRenderer de DRF (json de la
+stdlib) vs core_app.renderers.JSONRenderer (orjson), y bytes / tiempo de gzip
+y brotli con los niveles de core_app.compresion.
+
+    cd backend
+    python -m benchmarks.bench_renderizado            # 1k, 10k, 50k filas
+    python -m benchmarks.bench_renderizado 500 5000   # tamaños a elección
+"""
+import sys
+from decimal import Decimal
+
+from benchmarks._django import crear_base_de_prueba, cronometrar, preparar_django
+
+preparar_django()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework import renderers  # noqa: E402
+
+from catalogo.models import Categoria, Producto, Proveedor  # noqa: E402
+from catalogo.serializers import ProductoSerializer  # noqa: E402
+from compras.models import Compra, CompraDetalle  # noqa: E402
+from compras.serializers import CompraReadSerializer  # noqa: E402
+from core_app.compresion import CODIFICACIONES  # noqa: E402
+from core_app.models import Local  # noqa: E402
+from core_app.renderers import JSONRenderer  # noqa: E402
+
+TAMANIOS = [1_000, 10_000, 50_000]
+RENGLONES_POR_COMPRA = 3
+
+
+def sembrar(n):
+    local = Local.objects.create(nombre="Bench")
+    cats = Categoria.objects.bulk_create(Categoria(local=local, nombre=f"Cat {i}") for i in range(20))
+    productos = Producto.objects.bulk_create(
+        (
+            Producto(
+                local=local, codigo=f"P{i:07d}", nombre=f"Producto {i}", marca="Marca",
+                categoria=cats[i % len(cats)], precio_venta=Decimal("1234.5678"),
+                precio_compra_prom=Decimal("987.6543"), stock_actual=Decimal(i % 500),
+            )
+            for i in range(n)
+        ),
+        batch_size=5000,
+    )
+    proveedor = Proveedor.objects.create(local=local, nombre="Proveedor")
+    ahora = timezone.now()
+    compras = Compra.objects.bulk_create(
+        (
+            Compra(local=local, proveedor=proveedor, fecha=ahora, estado="confirmada",
+                   subtotal=Decimal("2962.9629"), total=Decimal("2962.9629"))
+            for _ in range(n)
+        ),
+        batch_size=5000,
+    )
+    CompraDetalle.objects.bulk_create(
+        (
+            CompraDetalle(compra=compra, producto=productos[(i + j) % n], cantidad=Decimal("1.0000"),
+                          costo_unitario=Decimal("987.6543"))
+            for i, compra in enumerate(compras)
+            for j in range(RENGLONES_POR_COMPRA)
+        ),
+        batch_size=5000,
+    )
+
+
+def medir(nombre, datos):
+    drf, rapido = renderers.JSONRenderer(), JSONRenderer()
+    assert drf.render(datos) == rapido.render(datos)
+
+    t_drf = cronometrar(lambda: drf.render(datos))
+    t_orjson = cronometrar(lambda: rapido.render(datos))
+    contenido = rapido.render(datos)
+    fila = f"{nombre:<18} {len(datos):>7} {t_drf * 1000:>9.1f} {t_orjson * 1000:>9.1f} {t_drf / t_orjson:>6.1f}x"
+    fila += f" {len(contenido) / 1024:>9.0f}"
+    for comprimir in CODIFICACIONES.values():
+        t = cronometrar(lambda: comprimir(contenido))
+        fila += f" {len(comprimir(contenido)) / 1024:>7.0f} {t * 1000:>7.1f}"
+    print(fila)
+
+
+def main(tamanios):
+    destruir = crear_base_de_prueba()
+    try:
+        sembrar(max(tamanios))
+        print(
+            f"{'listado':<18} {'filas':>7} {'drf ms':>9} {'orjson ms':>9} {'mejora':>7} {'KiB':>9}"
+            + "".join(f" {c + ' KiB':>7} {c + ' ms':>7}" for c in CODIFICACIONES)
+        )
+        productos = Producto.objects.select_related("categoria").order_by("id")
+        compras = Compra.objects.prefetch_related("detalles").order_by("id")
+        for n in tamanios:
+            medir("productos", ProductoSerializer(productos[:n], many=True).data)
+        for n in tamanios:
+            medir("compras+detalles", CompraReadSerializer(compras[:n], many=True).data)
+    finally:
+        destruir()
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or TAMANIOS)
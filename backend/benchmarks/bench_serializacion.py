@@ -0,0 +1,92 @@
+# benchmarks/bench_serializacion.py
+"""
+Filas/segundo: ModelSerializer vs ValuesSerializer (core_app.fast_serializers).
+
+    cd backend
+    python -m benchmarks.bench_serializacion            # 1k, 10k, 100k
+    python -m benchmarks.bench_serializacion 1000 5000  # tamaños a elección
+"""
+import sys
+from decimal import Decimal
+
+from benchmarks._django import crear_base_de_prueba, cronometrar, preparar_django
+
+preparar_django()
+
+from django.utils import timezone  # noqa: E402
+
+from catalogo.models import Categoria, Producto  # noqa: E402
+from catalogo.serializers import ProductoSerializer  # noqa: E402
+from core_app.fast_serializers import ValuesSerializer  # noqa: E402
+from core_app.models import Local  # noqa: E402
+from ventas.models import Venta  # noqa: E402
+from ventas.serializers import VentaReadSerializer  # noqa: E402
+
+TAMANIOS = [1_000, 10_000, 100_000]
+
+
+def sembrar(n):
+    local = Local.objects.create(nombre="Bench")
+    cats = Categoria.objects.bulk_create(
+        Categoria(local=local, nombre=f"Cat {i}") for i in range(20)
+    )
+    Producto.objects.bulk_create(
+        (
+            Producto(
+                local=local,
+                codigo=f"P{i:07d}",
+                nombre=f"Producto {i}",
+                marca="Marca",
+                categoria=cats[i % len(cats)],
+                precio_venta=Decimal("1234.5678"),
+                stock_actual=Decimal(i % 500),
+            )
+            for i in range(n)
+        ),
+        batch_size=5000,
+    )
+    ahora = timezone.now()
+    Venta.objects.bulk_create(
+        (
+            Venta(local=local, fecha=ahora, total=Decimal("999.99"), subtotal=Decimal("999.99"))
+            for _ in range(n)
+        ),
+        batch_size=5000,
+    )
+
+
+def medir(nombre, serializer_class, qs, n):
+    qs = qs[:n]
+    # como en el listado: sin ?expand los anidados (detalles) no van
+    context = {"expand": set()}
+
+    def con_serializer():
+        return serializer_class(list(qs), many=True, context=context).data
+
+    fast = ValuesSerializer(serializer_class(context=context))
+
+    def con_values():
+        return fast.serialize(fast.values(qs))
+
+    t_ser = cronometrar(con_serializer)
+    t_fast = cronometrar(con_values)
+    print(
+        f"{nombre:<10} {n:>8} {n / t_ser:>14,.0f} {n / t_fast:>14,.0f} {t_ser / t_fast:>8.1f}x"
+    )
+
+
+def main(tamanios):
+    destruir = crear_base_de_prueba()
+    try:
+        sembrar(max(tamanios))
+        print(f"{'modelo':<10} {'filas':>8} {'serializer/s':>14} {'values/s':>14} {'mejora':>9}")
+        for n in tamanios:
+            medir("Producto", ProductoSerializer, Producto.objects.select_related("categoria").order_by("id"), n)
+        for n in tamanios:
+            medir("Venta", VentaReadSerializer, Venta.objects.select_related("local", "usuario").order_by("id"), n)
+    finally:
+        destruir()
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or TAMANIOS)
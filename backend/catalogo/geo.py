@@ -0,0 +1,104 @@
+# catalogo/geo.py
+"""
+Búsqueda de clientes cercanos sin PostGIS (anda igual en SQLite).
+
+1. prefiltro en la base con un bounding box sobre el índice (lat, lng)
+2. distancia exacta (haversine) vectorizada con NumPy sobre los candidatos
+3. orden por distancia
+
+NumPy se importa dentro de las funciones: sólo lo paga quien busca clientes.
+"""
+import math
+
+from .models import Cliente
+
+RADIO_TIERRA_KM = 6371.0088
+KM_POR_GRADO_LAT = 111.32
+
+# búsqueda de "los N más cercanos" sin radio: arrancamos chico y duplicamos
+RADIO_INICIAL_KM = 2.0
+RADIO_MAXIMO_KM = 20_000.0
+
+
+def bounding_box(lat, lng, radio_km):
+    """(lat_min, lat_max, lng_min, lng_max); lng = None si hay que ignorar la longitud."""
+    dlat = radio_km / KM_POR_GRADO_LAT
+    lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6 or lat_min <= -90.0 or lat_max >= 90.0:
+        return lat_min, lat_max, None, None
+
+    dlng = radio_km / (KM_POR_GRADO_LAT * cos_lat)
+    if dlng >= 180.0 or lng - dlng < -180.0 or lng + dlng > 180.0:
+        # cruza el antimeridiano: filtramos sólo por latitud
+        return lat_min, lat_max, None, None
+    return lat_min, lat_max, lng - dlng, lng + dlng
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Distancia en km desde (lat, lng) a cada punto de los arrays lats/lngs."""
+    import numpy as np
+
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2.0) ** 2
+    )
+    return 2.0 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _candidatos(qs, lat, lng, radio_km):
+    import numpy as np
+
+    lat_min, lat_max, lng_min, lng_max = bounding_box(lat, lng, radio_km)
+    qs = qs.filter(lat__gte=lat_min, lat__lte=lat_max)
+    if lng_min is not None:
+        qs = qs.filter(lng__gte=lng_min, lng__lte=lng_max)
+    else:
+        qs = qs.filter(lng__isnull=False)
+
+    filas = list(qs.values_list("id", "lat", "lng"))
+    if not filas:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    datos = np.array(filas, dtype=np.float64)
+    ids = datos[:, 0].astype(np.int64)
+    return ids, haversine_km(lat, lng, datos[:, 1], datos[:, 2])
+
+
+def clientes_cercanos(lat, lng, radio_km=None, limit=None, qs=None):
+    """
+    Devuelve [(cliente_id, distancia_km), ...] ordenado por distancia.
+
+    - con radio_km: todos los que están dentro del radio (hasta `limit`)
+    - sin radio_km: los `limit` más cercanos
+    """
+    import numpy as np
+
+    if qs is None:
+        qs = Cliente.objects.filter(activo=True)
+
+    if radio_km is not None:
+        ids, dist = _candidatos(qs, lat, lng, radio_km)
+    else:
+        if not limit:
+            raise ValueError("Sin radio_km hace falta limit")
+        radio_km = RADIO_INICIAL_KM
+        while True:
+            ids, dist = _candidatos(qs, lat, lng, radio_km)
+            # si hay >= limit dentro del radio, los `limit` más cercanos están ahí seguro
+            if np.count_nonzero(dist <= radio_km) >= limit or radio_km >= RADIO_MAXIMO_KM:
+                break
+            radio_km *= 2
+
+    dentro = dist <= radio_km
+    ids, dist = ids[dentro], dist[dentro]
+
+    if limit is not None and limit < len(dist):
+        top = np.argpartition(dist, limit)[:limit]
+        ids, dist = ids[top], dist[top]
+
+    orden = np.argsort(dist, kind="stable")
+    return [(int(i), float(d)) for i, d in zip(ids[orden], dist[orden])]
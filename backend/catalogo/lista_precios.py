@@ -0,0 +1,128 @@
+# catalogo/lista_precios.py
+"""
+Lista de precios pre-serializada por local, para el arranque de las cajas.
+
+Se publica como un único JSON comprimido con gzip en disco
+(LISTAS_PRECIOS_DIR/local_<id>.json.gz) junto con su versión/ETag
+(local_<id>.etag). Servirla es leer dos archivos: cero queries.
+
+Cuando cambian productos o categorías (catalogo/signals.py) no se reconstruye
+ahí mismo: se anota en la cache compartida una marca nueva para el local, y el
+archivo guarda la marca con la que se generó. La primera lectura que ve una
+marca distinta la reconstruye; así no se pierde si el worker que hizo el cambio
+se recicla, ni si la lee otra réplica. A mano: `manage.py publicar_listas_precios`.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Producto
+
+# segundos que una reconstrucción en curso frena a las demás del mismo local
+RECONSTRUCCION_TIMEOUT = 60
+
+
+def _clave_marca(local_id):
+    return f"lista_precios:marca:{int(local_id)}"
+
+
+def _directorio() -> Path:
+    directorio = Path(settings.LISTAS_PRECIOS_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+def _rutas(local_id):
+    directorio = _directorio()
+    return directorio / f"local_{int(local_id)}.json.gz", directorio / f"local_{int(local_id)}.etag"
+
+
+def _escribir_atomico(destino: Path, contenido: bytes):
+    # escribimos a un temporal y renombramos: quien lee nunca ve un archivo a medias
+    fd, tmp = tempfile.mkstemp(dir=destino.parent, prefix=destino.name, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(contenido)
+    os.replace(tmp, destino)
+
+
+def construir_lista_precios(local_id: int) -> str:
+    """Genera y publica la lista del local. Devuelve el ETag (versión)."""
+    # la marca se lee antes de consultar: un cambio que entre mientras tanto
+    # deja otra marca y la próxima lectura vuelve a reconstruir
+    marca = cache.get(_clave_marca(local_id)) or ""
+
+    # mismo formato que ProductoSerializer (todos los decimales del campo)
+    decimales = Producto._meta.get_field("precio_venta").decimal_places
+    productos = [
+        {"codigo": codigo, "nombre": nombre, "precio_venta": f"{precio:.{decimales}f}", "categoria": categoria}
+        for codigo, nombre, precio, categoria in (
+            Producto.objects
+            .filter(local_id=local_id, activo=True)
+            .order_by("codigo")
+            .values_list("codigo", "nombre", "precio_venta", "categoria__nombre")
+        )
+    ]
+
+    # la versión depende sólo del contenido: si nada cambió, el ETag tampoco
+    cuerpo = json.dumps(productos, ensure_ascii=False, separators=(",", ":"))
+    version = hashlib.sha256(cuerpo.encode()).hexdigest()[:20]
+
+    documento = (
+        f'{{"local":{int(local_id)},"version":"{version}",'
+        f'"generada":"{timezone.now().isoformat()}","productos":{cuerpo}}}'
+    )
+
+    ruta_json, ruta_etag = _rutas(local_id)
+    _escribir_atomico(ruta_json, gzip.compress(documento.encode(), compresslevel=9, mtime=0))
+    _escribir_atomico(ruta_etag, f"{version}\n{marca}".encode())
+    return version
+
+
+def _etag_publicado(local_id):
+    """(etag, al_dia). etag None si todavía no se publicó."""
+    try:
+        version, _, marca = _rutas(local_id)[1].read_text().partition("\n")
+    except FileNotFoundError:
+        return None, False
+    # sin marca en la cache (nadie cambió nada, o se vació) vale lo publicado
+    vigente = cache.get(_clave_marca(local_id))
+    return version, vigente is None or vigente == marca
+
+
+def leer_lista_precios(local_id: int):
+    """(etag, bytes_gzip). Si no existe o quedó atrás, la construye en el momento."""
+    etag, al_dia = _etag_publicado(local_id)
+    if not al_dia:
+        # si otro request ya la está reconstruyendo, mientras tanto va la publicada
+        clave = f"lista_precios:reconstruyendo:{int(local_id)}"
+        if etag is None or cache.add(clave, 1, RECONSTRUCCION_TIMEOUT):
+            try:
+                etag = construir_lista_precios(local_id)
+            finally:
+                cache.delete(clave)
+    return etag, _rutas(local_id)[0].read_bytes()
+
+
+def leer_etag(local_id: int):
+    """ETag de la lista publicada, o None si no existe o quedó atrás."""
+    etag, al_dia = _etag_publicado(local_id)
+    return etag if al_dia else None
+
+
+def programar_reconstruccion(local_id):
+    """
+    Marca la lista del local como vieja (llamar después del commit). Una
+    importación masiva deja muchas marcas pero una sola reconstrucción: la
+    de la siguiente lectura.
+    """
+    if local_id is None:
+        return
+    cache.set(_clave_marca(local_id), uuid.uuid4().hex, None)
@@ -0,0 +1,29 @@
+# catalogo/management/commands/publicar_listas_precios.py
+from django.core.management.base import BaseCommand
+
+from catalogo.lista_precios import construir_lista_precios
+from core_app.models import Local
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera la lista de precios pre-serializada (gzip + ETag) de cada local. "
+        "Útil después de un deploy o de cargar precios por fuera de la API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--local", type=int, action="append", dest="locales",
+            help="ID de local (repetible). Por defecto todos los activos.",
+        )
+
+    def handle(self, *args, **options):
+        locales = options["locales"] or list(
+            Local.objects.filter(activo=True).values_list("id", flat=True)
+        )
+
+        for local_id in locales:
+            version = construir_lista_precios(local_id)
+            self.stdout.write(f"Local {local_id}: lista de precios versión {version}")
+
+        self.stdout.write(self.style.SUCCESS("Listas de precios publicadas."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 22:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogo', '0005_alter_producto_local_alter_proveedor_local'),
+        ('core_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductoEliminado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('producto_id', models.BigIntegerField()),
+                ('codigo', models.CharField(max_length=50)),
+                ('eliminado_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Producto eliminado',
+                'verbose_name_plural': 'Productos eliminados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['local', 'updated_at', 'id'], name='catalogo_prod_local_upd_idx'),
+        ),
+        migrations.AddField(
+            model_name='productoeliminado',
+            name='local',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='productos_eliminados', to='core_app.local'),
+        ),
+        migrations.AddIndex(
+            model_name='productoeliminado',
+            index=models.Index(fields=['local', 'eliminado_at', 'producto_id'], name='catalogo_prodelim_local_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogo', '0006_producto_delta_sync'),
+        ('core_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['local', 'id'], name='catalogo_prod_local_id_idx'),
+        ),
+    ]
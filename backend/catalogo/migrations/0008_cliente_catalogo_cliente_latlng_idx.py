@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogo', '0007_producto_catalogo_prod_local_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['lat', 'lng'], name='catalogo_cliente_latlng_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogo', '0008_cliente_catalogo_cliente_latlng_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='preciohistorico',
+            index=models.Index(fields=['producto', 'proveedor', '-fecha'], name='catalogo_precio_prod_prov_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='preciohistorico',
+            index=models.Index(fields=['producto', '-fecha'], name='catalogo_precio_prod_fecha_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 # catalogo/models.py
 from django.db import models
+from django.utils import timezone
 from core_app.models import Local # Importamos el modelo central 'Local'
 
 # --- MODELO DE CATEGORÍA (AHORA ASOCIADO A UN LOCAL) ---
@@ -58,6 +59,26 @@ class Producto(models.Model):
 
     class Meta:
         unique_together = ('local', 'codigo')
+        indexes = [
+            # delta-sync de las cajas: WHERE local_id = ? ORDER BY updated_at, id
+            models.Index(fields=['local', 'updated_at', 'id'], name='catalogo_prod_local_upd_idx'),
+            # listado/keyset: WHERE local_id = ? ORDER BY id DESC
+            models.Index(fields=['local', 'id'], name='catalogo_prod_local_id_idx'),
+        ]
+
+    # lo que publica la lista de precios (catalogo/lista_precios.py)
+    CAMPOS_LISTA_PRECIOS = ("codigo", "nombre", "precio_venta", "categoria_id", "activo")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # foto de los campos de la lista, para saber al guardar si hay que regenerarla
+        if not instance.get_deferred_fields() & set(cls.CAMPOS_LISTA_PRECIOS):
+            instance._valores_lista_precios = instance.valores_lista_precios()
+        return instance
+
+    def valores_lista_precios(self):
+        return tuple(getattr(self, campo) for campo in self.CAMPOS_LISTA_PRECIOS)
 
     def __str__(self):
         try:
@@ -65,6 +86,23 @@ class Producto(models.Model):
         except AttributeError:
             return f"{self.codigo} - {self.nombre}"
 
+# --- TOMBSTONE DE PRODUCTOS BORRADOS (para el delta-sync de las cajas) ---
+class ProductoEliminado(models.Model):
+    local = models.ForeignKey(Local, on_delete=models.CASCADE, related_name="productos_eliminados")
+    producto_id = models.BigIntegerField()
+    codigo = models.CharField(max_length=50)
+    eliminado_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Producto eliminado"
+        verbose_name_plural = "Productos eliminados"
+        indexes = [
+            models.Index(fields=['local', 'eliminado_at', 'producto_id'], name='catalogo_prodelim_local_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.codigo} (eliminado {self.eliminado_at:%Y-%m-%d})"
+
 # --- MODELO DE CLIENTE (SIN CAMBIOS) ---
 class Cliente(models.Model):
     nombre = models.CharField(max_length=255)
@@ -79,6 +117,13 @@ class Cliente(models.Model):
     activo = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # prefiltro por bounding box en la búsqueda de cercanos (catalogo/geo.py)
+            models.Index(fields=['lat', 'lng'], name='catalogo_cliente_latlng_idx'),
+        ]
+
     def __str__(self):
         return self.nombre
 
@@ -90,5 +135,13 @@ class PrecioHistorico(models.Model):
     proveedor = models.ForeignKey(Proveedor, on_delete=models.SET_NULL, null=True, blank=True)
     moneda = models.CharField(max_length=10, default="ARS")
 
+    class Meta:
+        indexes = [
+            # "último costo de X en el proveedor Y" / último costo por (producto, proveedor)
+            models.Index(fields=['producto', 'proveedor', '-fecha'], name='catalogo_precio_prod_prov_idx'),
+            # "último costo de X" sin importar proveedor
+            models.Index(fields=['producto', '-fecha'], name='catalogo_precio_prod_fecha_idx'),
+        ]
+
     def __str__(self):
         return f"{self.producto.codigo} @ {self.costo_unitario} ({self.fecha:%Y-%m-%d})" 
@@ -1,14 +1,15 @@
 # catalogo/serializers.py
 from rest_framework import serializers
+from core_app.sparse import SparseFieldsMixin
 from .models import Categoria, Producto, Cliente, Proveedor, PrecioHistorico
 
-class CategoriaSerializer(serializers.ModelSerializer):
+class CategoriaSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Categoria
         fields = ["id", "nombre"]  # local lo setea el servidor
         read_only_fields = ["id"]
 
-class ProductoSerializer(serializers.ModelSerializer):
+class ProductoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     categoria_nombre = serializers.CharField(source="categoria.nombre", read_only=True, default=None)
 
     class Meta:
@@ -29,18 +30,18 @@ class ProductoSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"stock_actual": "No puede ser negativo"})
         return attrs
 
-class ClienteSerializer(serializers.ModelSerializer):
+class ClienteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Cliente
         fields = "__all__"
 
-class ProveedorSerializer(serializers.ModelSerializer):
+class ProveedorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Proveedor
         fields = ["id", "nombre", "cuit", "email", "telefono", "direccion", "activo", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
 
-class PrecioHistoricoSerializer(serializers.ModelSerializer):
+class PrecioHistoricoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     producto_codigo = serializers.CharField(source="producto.codigo", read_only=True)
     proveedor_nombre = serializers.CharField(source="proveedor.nombre", read_only=True)
 
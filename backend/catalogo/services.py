@@ -0,0 +1,121 @@
+# catalogo/services.py
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from .models import Categoria, PrecioHistorico
+
+CENTAVOS = Decimal("0.01")
+
+_MONTO = DecimalField(max_digits=28, decimal_places=8)
+
+
+def _clave_resumen_categorias(local_id):
+    return f"catalogo:resumen_categorias:{local_id}"
+
+
+def resumen_categorias(local_id: int):
+    """
+    Categorías del local con cantidad de productos, activos, bajo stock
+    y valor del stock a costo y a precio de venta.
+
+    Es una sola query agrupada (LEFT JOIN categoría -> productos) y queda
+    cacheada hasta que cambie algún producto/categoría del local
+    (ver catalogo/signals.py) o venza CATALOGO_RESUMEN_TTL.
+    """
+    clave = _clave_resumen_categorias(local_id)
+    data = cache.get(clave)
+    if data is not None:
+        return data
+
+    prod = "productos_categoria"
+    filas = (
+        Categoria.objects
+        .filter(local_id=local_id)
+        .annotate(
+            productos=Count(prod),
+            activos=Count(prod, filter=Q(**{f"{prod}__activo": True})),
+            bajo_stock=Count(
+                prod,
+                filter=Q(**{
+                    f"{prod}__activo": True,
+                    f"{prod}__stock_actual__lte": F(f"{prod}__stock_minimo"),
+                }),
+            ),
+            valor_costo=Sum(ExpressionWrapper(
+                F(f"{prod}__stock_actual") * F(f"{prod}__precio_compra_prom"), output_field=_MONTO,
+            )),
+            valor_venta=Sum(ExpressionWrapper(
+                F(f"{prod}__stock_actual") * F(f"{prod}__precio_venta"), output_field=_MONTO,
+            )),
+        )
+        .order_by("nombre")
+        .values("id", "nombre", "productos", "activos", "bajo_stock", "valor_costo", "valor_venta")
+    )
+
+    data = [
+        {
+            **fila,
+            "valor_costo": str((fila["valor_costo"] or Decimal("0")).quantize(CENTAVOS)),
+            "valor_venta": str((fila["valor_venta"] or Decimal("0")).quantize(CENTAVOS)),
+        }
+        for fila in filas
+    ]
+    cache.set(clave, data, getattr(settings, "CATALOGO_RESUMEN_TTL", 300))
+    return data
+
+
+def invalidar_resumen_categorias(local_id):
+    cache.delete(_clave_resumen_categorias(local_id))
+
+
+_CAMPOS_COSTO = (
+    "producto_id", "producto__codigo", "producto__nombre",
+    "proveedor_id", "proveedor__nombre", "costo_unitario", "moneda", "fecha",
+)
+
+
+def ultimos_costos(local_id: int, por_proveedor=False, **filtros):
+    """
+    Último costo de cada producto del local (o de cada par producto/proveedor
+    si por_proveedor=True), en una sola query:
+    - Postgres: DISTINCT ON (producto[, proveedor]) ORDER BY ..., fecha DESC
+    - otras bases: ROW_NUMBER() OVER (PARTITION BY ...) = 1
+    Ambas recorren el índice (producto, proveedor, -fecha).
+    """
+    particion = ["producto_id", "proveedor_id"] if por_proveedor else ["producto_id"]
+    qs = PrecioHistorico.objects.filter(producto__local_id=local_id, **filtros)
+
+    if connections[qs.db].vendor == "postgresql":
+        qs = qs.order_by(*particion, "-fecha", "-id").distinct(*particion)
+    else:
+        qs = (
+            qs.annotate(orden=Window(
+                RowNumber(),
+                partition_by=[F(campo) for campo in particion],
+                order_by=[F("fecha").desc(), F("id").desc()],
+            ))
+            .filter(orden=1)
+            .order_by(*particion)
+        )
+    return list(qs.values(*_CAMPOS_COSTO))
+
+
+def mejores_proveedores(local_id: int, moneda="ARS", **filtros):
+    """
+    Por producto: último costo de cada proveedor en `moneda`, ordenado de más
+    barato a más caro. El primero es el mejor proveedor. Sólo se comparan
+    costos de la misma moneda: 100 USD no es "más barato" que 1000 ARS.
+    """
+    por_producto = {}
+    filas = ultimos_costos(local_id, por_proveedor=True, proveedor__isnull=False, moneda=moneda, **filtros)
+    for fila in filas:
+        por_producto.setdefault(fila["producto_id"], []).append(fila)
+
+    for filas in por_producto.values():
+        filas.sort(key=lambda f: (f["costo_unitario"], f["proveedor_id"]))
+    return por_producto
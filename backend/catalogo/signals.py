@@ -0,0 +1,64 @@
+# catalogo/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Categoria, Producto, ProductoEliminado
+from .lista_precios import programar_reconstruccion
+from .services import invalidar_resumen_categorias
+
+
+@receiver(post_delete, sender=Producto)
+def registrar_producto_eliminado(sender, instance, **kwargs):
+    """
+    Deja un tombstone del producto borrado, así las cajas que
+    sincronizan por delta se enteran de que tienen que sacarlo.
+    """
+    ProductoEliminado.objects.create(
+        local_id=instance.local_id,
+        producto_id=instance.id,
+        codigo=instance.codigo,
+    )
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(pre_delete, sender=Categoria)
+def reenviar_productos_de_la_categoria(sender, instance, **kwargs):
+    """
+    Las cajas guardan el nombre de la categoría en cada producto: si se
+    renombra o se borra (SET_NULL), esos productos tienen que volver a salir
+    en el delta-sync.
+    """
+    if instance.pk is not None and not kwargs.get("created"):  # una nueva no tiene productos
+        Producto.objects.filter(categoria_id=instance.pk).update(updated_at=timezone.now())
+
+
+def _cambia_la_lista_de_precios(instance, created, update_fields):
+    campos = set(Producto.CAMPOS_LISTA_PRECIOS) | {"categoria"}
+    if update_fields is not None and not campos & set(update_fields):
+        return False  # p.ej. el stock que tocan cada venta y cada compra
+    anteriores = getattr(instance, "_valores_lista_precios", None)
+    actuales = instance.valores_lista_precios()
+    instance._valores_lista_precios = actuales
+    # sin foto (instancia que no vino de la base) no sabemos: se regenera
+    return created or anteriores is None or anteriores != actuales
+
+
+@receiver(post_save, sender=Producto)
+def invalidar_caches_del_producto(sender, instance, created, update_fields, **kwargs):
+    # el resumen de categorías incluye stock: se invalida siempre
+    local_id = instance.local_id
+    transaction.on_commit(lambda: invalidar_resumen_categorias(local_id))
+    if _cambia_la_lista_de_precios(instance, created, update_fields):
+        transaction.on_commit(lambda: programar_reconstruccion(local_id))
+
+
+@receiver(post_delete, sender=Producto)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_caches_del_local(sender, instance, **kwargs):
+    # después del commit, para que nadie vuelva a cachear datos viejos
+    local_id = instance.local_id
+    transaction.on_commit(lambda: invalidar_resumen_categorias(local_id))
+    transaction.on_commit(lambda: programar_reconstruccion(local_id))
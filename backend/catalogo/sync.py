@@ -0,0 +1,116 @@
+# catalogo/sync.py
+"""
+Delta-sync del catálogo para las cajas (POS).
+
+La caja guarda el último `cursor` que recibió y en la próxima llamada pide
+sólo lo que cambió después. El cursor es opaco para el cliente: por dentro
+es el par (timestamp, id) del último cambio entregado.
+
+updated_at se fija al guardar, no al commitear: una transacción que tarda en
+commitear aparece con un timestamp anterior a cambios ya entregados. Por eso
+el cursor de la última página nunca pasa de ahora - CATALOGO_SYNC_MARGEN: lo
+de esos segundos se vuelve a mandar en la próxima llamada (la caja hace
+upsert, repetir no rompe nada).
+"""
+import base64
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Producto, ProductoEliminado
+
+
+def encode_cursor(ts: datetime, pk: int) -> str:
+    raw = f"{ts.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Devuelve (timestamp, id). Acepta el cursor opaco o, por comodidad,
+    un timestamp ISO pelado (en ese caso id=0).
+    """
+    if not cursor:
+        return None, 0
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, pk_raw = base64.urlsafe_b64decode(padded).decode().split("|")
+        ts = parse_datetime(ts_raw)
+        if ts is not None:
+            return ts, int(pk_raw)
+    except (ValueError, UnicodeDecodeError):
+        pass
+
+    ts = parse_datetime(cursor)
+    if ts is None:
+        raise ValidationError({"since": "Cursor inválido"})
+    return ts, 0
+
+
+def _despues_de(ts_field, pk_field, ts, pk):
+    # keyset: (ts_field, pk_field) > (ts, pk)
+    if ts is None:
+        return Q()
+    return Q(**{f"{ts_field}__gt": ts}) | Q(**{ts_field: ts, f"{pk_field}__gt": pk})
+
+
+def cambios_desde(local_id: int, cursor: str = None, limit: int = 500):
+    """
+    Devuelve (productos, eliminados, next_cursor, hay_mas).
+
+    - productos: Producto activos creados/modificados después del cursor.
+    - eliminados: tombstones (dict) de productos desactivados o borrados.
+
+    Ambos flujos se leen ordenados por (timestamp, id) con el índice
+    (local, updated_at, id) y se mezclan respetando ese orden.
+    """
+    ts, pk = decode_cursor(cursor)
+
+    productos = list(
+        Producto.objects
+        .select_related("categoria")
+        .filter(local_id=local_id)
+        .filter(_despues_de("updated_at", "id", ts, pk))
+        .order_by("updated_at", "id")[: limit + 1]
+    )
+    borrados = list(
+        ProductoEliminado.objects
+        .filter(local_id=local_id)
+        .filter(_despues_de("eliminado_at", "producto_id", ts, pk))
+        .order_by("eliminado_at", "producto_id")
+        .values("producto_id", "codigo", "eliminado_at")[: limit + 1]
+    )
+
+    eventos = [(p.updated_at, p.id, p) for p in productos]
+    eventos += [(b["eliminado_at"], b["producto_id"], b) for b in borrados]
+    eventos.sort(key=lambda e: (e[0], e[1]))
+
+    hay_mas = len(eventos) > limit
+    eventos = eventos[:limit]
+
+    cambios, eliminados = [], []
+    for _ts, _pk, obj in eventos:
+        if isinstance(obj, dict):
+            eliminados.append({"id": obj["producto_id"], "codigo": obj["codigo"], "motivo": "eliminado"})
+        elif not obj.activo:
+            eliminados.append({"id": obj.id, "codigo": obj.codigo, "motivo": "inactivo"})
+        else:
+            cambios.append(obj)
+
+    # sin cambios la caja se queda con el cursor que mandó (salvo el margen)
+    ult_ts, ult_pk = (eventos[-1][0], eventos[-1][1]) if eventos else (ts, pk)
+    if ult_ts is None:
+        return cambios, eliminados, None, hay_mas
+
+    corte = timezone.now() - timedelta(seconds=settings.CATALOGO_SYNC_MARGEN)
+    if not hay_mas and ult_ts > corte:
+        # con hay_mas no: la caja pediría la misma página otra vez
+        ult_ts, ult_pk = corte, 0
+    next_cursor = encode_cursor(ult_ts, ult_pk)
+
+    return cambios, eliminados, next_cursor, hay_mas
@@ -7,6 +7,7 @@ from .views import (
     ClienteViewSet,
     ProveedorViewSet,
     PrecioHistoricoViewSet,
+    ListaPreciosView,
 )
 
 # Opción recomendada: acepta con y sin slash final
@@ -19,5 +20,6 @@ router.register(r"proveedores", ProveedorViewSet, basename="proveedor")
 router.register(r"precios-historicos", PrecioHistoricoViewSet, basename="preciohistorico")
 
 urlpatterns = [
+    path("lista-precios/", ListaPreciosView.as_view(), name="lista-precios"),
     path("", include(router.urls)),
 ]
@@ -1,7 +1,13 @@
 # catalogo/views.py
 
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+import gzip
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
@@ -10,8 +16,16 @@ from .serializers import (
     CategoriaSerializer, ProductoSerializer, ClienteSerializer,
     ProveedorSerializer, PrecioHistoricoSerializer
 )
+from .sync import cambios_desde
+from .services import mejores_proveedores, resumen_categorias, ultimos_costos
+from .lista_precios import leer_etag, leer_lista_precios
+from .geo import clientes_cercanos
+from core_app.models import Local
 # --- 1. IMPORTAMOS LOS NUEVOS PERMISOS ---
 from core_app.permissions import IsAdminUser, IsAdminOrReadOnly
+from core_app.pagination import ListadoPagination
+from core_app.sparse import SparseFieldsViewMixin
+from core_app.fast_serializers import FastListMixin
 
 # Este Mixin no necesita cambios
 class LocalScopedMixin:
@@ -42,7 +56,7 @@ class LocalScopedMixin:
         serializer.save(local_id=self._local_id())
 
 # ---- CATEGORIA ----
-class CategoriaViewSet(LocalScopedMixin, viewsets.ModelViewSet):
+class CategoriaViewSet(LocalScopedMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Categoria.objects.all().order_by("nombre")
     serializer_class = CategoriaSerializer
     permission_classes = [IsAdminOrReadOnly] # <-- 2. APLICAMOS PERMISO
@@ -50,18 +64,59 @@ class CategoriaViewSet(LocalScopedMixin, viewsets.ModelViewSet):
     search_fields = ["nombre"]
     ordering_fields = ["nombre"]
 
+    @action(detail=False, methods=["get"])
+    def resumen(self, request):
+        """
+        GET /api/catalogo/categorias/resumen/
+
+        Todas las categorías del local con: productos, activos, bajo_stock
+        (activos con stock_actual <= stock_minimo), valor_costo y valor_venta
+        del stock. Sin paginar (son pocas) y cacheado por local.
+        """
+        return Response(resumen_categorias(self._local_id()))
+
 # ---- PRODUCTO ----
-class ProductoViewSet(LocalScopedMixin, viewsets.ModelViewSet):
+class ProductoViewSet(LocalScopedMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Producto.objects.select_related("categoria").all().order_by("-id")
     serializer_class = ProductoSerializer
     permission_classes = [IsAdminOrReadOnly] # <-- 2. APLICAMOS PERMISO
+    pagination_class = ListadoPagination
+    keyset_ordering = ("-id",)
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["activo", "categoria", "marca"]
     search_fields = ["codigo", "nombre", "marca", "categoria__nombre"]
     ordering_fields = ["nombre", "precio_venta", "stock_actual", "updated_at"]
 
+    @action(detail=False, methods=["get"])
+    def cambios(self, request):
+        """
+        GET /api/catalogo/productos/cambios/?since=<cursor>&limit=500
+
+        Delta-sync para las cajas: productos creados/modificados después
+        del cursor + tombstones de los desactivados o borrados.
+        Sin `since` devuelve el catálogo completo desde el principio.
+        Si `hay_mas` es true, volver a llamar con el `cursor` devuelto.
+        """
+        try:
+            limit = int(request.query_params.get("limit", "500"))
+        except ValueError:
+            raise ValidationError({"limit": "Debe ser un entero"})
+        limit = max(1, min(limit, 5000))
+
+        cambios, eliminados, cursor, hay_mas = cambios_desde(
+            self._local_id(),
+            request.query_params.get("since"),
+            limit=limit,
+        )
+        return Response({
+            "cambios": self.get_serializer(cambios, many=True).data,
+            "eliminados": eliminados,
+            "cursor": cursor,
+            "hay_mas": hay_mas,
+        })
+
 # ---- CLIENTE ----
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Cliente.objects.all().order_by("-id")
     serializer_class = ClienteSerializer
     permission_classes = [permissions.IsAuthenticated] # <-- Mantenemos permiso general para autenticados
@@ -69,9 +124,66 @@ class ClienteViewSet(viewsets.ModelViewSet):
     filterset_fields = ["activo"]
     search_fields = ["nombre", "email", "telefono"]
     ordering_fields = ["nombre", "updated_at"]
+    CERCANOS_MAX = 1000
+
+    @action(detail=False, methods=["get"])
+    def cercanos(self, request):
+        """
+        GET /api/catalogo/clientes/cercanos/?radio_km=5
+        GET /api/catalogo/clientes/cercanos/?limit=10&lat=-34.6&lng=-58.4
+
+        Clientes activos ordenados por distancia (con `distancia_km`).
+        Sin lat/lng se usa la ubicación del local del header X-Local-ID.
+        Con radio_km devuelve todos los que están dentro del radio (o sólo
+        los `limit` más cercanos, si se manda); sin radio, los `limit` más
+        cercanos (20 por defecto). Nunca más de CERCANOS_MAX: si el radio
+        tenía más, van los más cercanos y el header `X-Truncado: true`.
+        """
+        params = request.query_params
+        try:
+            radio_km = float(params["radio_km"]) if params.get("radio_km") else None
+            if params.get("limit"):
+                limit = int(params["limit"])
+            else:
+                limit = None if radio_km is not None else 20
+            if params.get("lat") and params.get("lng"):
+                lat, lng = float(params["lat"]), float(params["lng"])
+            else:
+                lat, lng = self._ubicacion_local()
+        except ValueError:
+            raise ValidationError({"detail": "lat, lng, radio_km y limit tienen que ser numéricos"})
+
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValidationError({"detail": "Coordenadas fuera de rango"})
+        if radio_km is not None and radio_km <= 0:
+            raise ValidationError({"radio_km": "Debe ser > 0"})
+        if limit is not None:
+            limit = max(1, min(limit, self.CERCANOS_MAX))
+
+        # radio sin limit: pedimos uno de más para saber si se cortó
+        cercanos = clientes_cercanos(lat, lng, radio_km=radio_km, limit=limit or self.CERCANOS_MAX + 1)
+        truncado = len(cercanos) > self.CERCANOS_MAX
+        cercanos = cercanos[:self.CERCANOS_MAX]
+        clientes = Cliente.objects.in_bulk([cid for cid, _ in cercanos])
+
+        data = []
+        for cid, distancia in cercanos:
+            item = self.get_serializer(clientes[cid]).data
+            item["distancia_km"] = round(distancia, 3)
+            data.append(item)
+        return Response(data, headers={"X-Truncado": "true"} if truncado else None)
+
+    def _ubicacion_local(self):
+        local_id = self.request.headers.get("X-Local-ID")
+        if not local_id:
+            raise ValidationError({"detail": "Indicar lat/lng o el header X-Local-ID"})
+        ubicacion = Local.objects.filter(pk=int(local_id)).values_list("lat", "lng").first()
+        if not ubicacion or None in ubicacion:
+            raise ValidationError({"detail": "El local no tiene ubicación cargada; indicar lat/lng"})
+        return ubicacion
 
 # ---- PROVEEDOR ----
-class ProveedorViewSet(viewsets.ModelViewSet):
+class ProveedorViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Proveedor.objects.all().order_by("nombre")
     serializer_class = ProveedorSerializer
     permission_classes = [IsAdminUser] # <-- 2. APLICAMOS PERMISO (SOLO ADMINS)
@@ -81,11 +193,112 @@ class ProveedorViewSet(viewsets.ModelViewSet):
     ordering_fields = ["nombre", "updated_at"]
 
 # ---- PRECIOS HISTÓRICOS ----
-class PrecioHistoricoViewSet(viewsets.ReadOnlyModelViewSet):
+class PrecioHistoricoViewSet(LocalScopedMixin, SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PrecioHistorico.objects.select_related("producto", "proveedor").order_by("-fecha", "-id")
     serializer_class = PrecioHistoricoSerializer
     permission_classes = [IsAdminUser] # <-- Solo Admins pueden ver el historial de costos
+    scope_field = "producto__local_id"
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["producto", "proveedor", "moneda"]
     search_fields = ["producto__codigo", "proveedor__nombre"]
-    ordering_fields = ["fecha", "costo_unitario"]
\ No newline at end of file
+    ordering_fields = ["fecha", "costo_unitario"]
+
+    def get_queryset(self):
+        # listado y detalle andaban sin X-Local-ID: sin el header siguen viendo
+        # todo (clientes viejos); ultimos/mejor-proveedor sí lo exigen (_local_id)
+        qs = super(LocalScopedMixin, self).get_queryset()
+        if self.request.headers.get(self.local_header):
+            qs = self.filter_by_local(qs)
+        return qs
+
+    def _filtros_costos(self):
+        filtros = {}
+        for param in ("producto", "proveedor"):
+            valor = self.request.query_params.get(param)
+            if valor:
+                if not valor.isdigit():
+                    raise ValidationError({param: "Debe ser un entero"})
+                filtros[f"{param}_id"] = int(valor)
+        return filtros
+
+    @staticmethod
+    def _costo(fila):
+        return {
+            "producto": fila["producto_id"],
+            "producto_codigo": fila["producto__codigo"],
+            "producto_nombre": fila["producto__nombre"],
+            "proveedor": fila["proveedor_id"],
+            "proveedor_nombre": fila["proveedor__nombre"],
+            "costo_unitario": str(fila["costo_unitario"]),
+            "moneda": fila["moneda"],
+            "fecha": fila["fecha"],
+        }
+
+    @action(detail=False, methods=["get"])
+    def ultimos(self, request):
+        """
+        GET /api/catalogo/precios-historicos/ultimos/[?proveedor=ID][&producto=ID]
+
+        Último costo de cada producto del local (X-Local-ID), en una sola query.
+        Con ?proveedor= es el último costo de cada producto en ese proveedor.
+        """
+        local_id = self._local_id()
+        filas = ultimos_costos(local_id, **self._filtros_costos())
+        return Response([self._costo(f) for f in filas])
+
+    @action(detail=False, methods=["get"], url_path="mejor-proveedor")
+    def mejor_proveedor(self, request):
+        """
+        GET /api/catalogo/precios-historicos/mejor-proveedor/[?producto=ID][&moneda=USD]
+
+        Por producto: el proveedor con el último costo más bajo y la
+        comparación con el último costo de cada proveedor, todo en la misma
+        moneda (ARS si no se indica).
+        """
+        local_id = self._local_id()
+        moneda = self.request.query_params.get("moneda", "").strip().upper() or "ARS"
+        por_producto = mejores_proveedores(local_id, moneda=moneda, **self._filtros_costos())
+        data = []
+        for filas in por_producto.values():
+            comparacion = [self._costo(f) for f in filas]
+            data.append({
+                "producto": filas[0]["producto_id"],
+                "producto_codigo": filas[0]["producto__codigo"],
+                "producto_nombre": filas[0]["producto__nombre"],
+                "mejor": comparacion[0],
+                "proveedores": comparacion,
+            })
+        return Response(data)
+
+
+# ---- LISTA DE PRECIOS (arranque de cajas) ----
+class ListaPreciosView(LocalScopedMixin, APIView):
+    """
+    GET /api/catalogo/lista-precios/
+
+    Lista de precios del local (codigo, nombre, precio_venta, categoria) ya
+    serializada y comprimida con gzip. Responde con ETag: si la caja manda
+    If-None-Match con la versión que tiene, vuelve un 304 sin cuerpo.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        local_id = self._local_id()
+
+        etag = leer_etag(local_id)
+        if etag and f'"{etag}"' in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=304)
+        else:
+            etag, contenido = leer_lista_precios(local_id)
+            response = HttpResponse(content_type="application/json")
+            if "gzip" in request.headers.get("Accept-Encoding", ""):
+                response["Content-Encoding"] = "gzip"
+            else:
+                contenido = gzip.decompress(contenido)
+            response.content = contenido
+
+        response["ETag"] = f'"{etag}"'
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ("Accept-Encoding", "X-Local-ID"))
+        return response
+
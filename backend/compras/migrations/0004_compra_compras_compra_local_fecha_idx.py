@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogo', '0007_producto_catalogo_prod_local_id_idx'),
+        ('compras', '0003_alter_compra_local'),
+        ('core_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='compra',
+            index=models.Index(fields=['local', 'fecha', 'id'], name='compras_compra_local_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 23:18
+
+from django.db import migrations, models
+
+from core_app.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('catalogo', '0009_preciohistorico_indices'),
+        ('compras', '0004_compra_compras_compra_local_fecha_idx'),
+        ('core_app', '0002_local_lat_local_lng'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='compra',
+            index=models.Index(fields=['local', 'estado', 'fecha'], name='compras_compra_local_est_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower
+
+
+def estado_en_minusculas(apps, schema_editor):
+    # el historial filtra estado por igualdad (índice local, estado, fecha):
+    # las filas viejas guardadas como "Confirmada" dejarían de aparecer
+    Compra = apps.get_model("compras", "Compra")
+    (
+        Compra.objects.annotate(estado_min=Lower("estado"))
+        .exclude(estado=F("estado_min"))
+        .update(estado=Lower("estado"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compras', '0005_compra_compras_compra_local_est_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(estado_en_minusculas, migrations.RunPython.noop),
+    ]
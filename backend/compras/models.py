@@ -20,6 +20,15 @@ class Compra(models.Model):
     estado = models.CharField(max_length=20, choices=ESTADOS, default="borrador")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # listados/keyset: WHERE local_id = ? ORDER BY fecha DESC, id DESC
+            models.Index(fields=["local", "fecha", "id"], name="compras_compra_local_fecha_idx"),
+            # reportes e historial: WHERE local_id = ? AND estado = ? AND fecha BETWEEN ...
+            models.Index(fields=["local", "estado", "fecha"], name="compras_compra_local_est_idx"),
+        ]
+
     def __str__(self):
         return f"Compra #{self.id or 'N'} - {self.proveedor.nombre} - {self.estado}"
 
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from functools import lru_cache
 from typing import List
 
 from django.apps import apps
@@ -8,9 +9,11 @@ from rest_framework import serializers
 
 from .models import Compra, CompraDetalle
 from catalogo.models import Producto  # Producto vive en 'catalogo'
+from core_app.sparse import SparseFieldsMixin
 
 
 # ----------------------- util: resolver Proveedor -----------------------
+@lru_cache(maxsize=None)
 def _get_proveedor_model():
     """
     Resuelve el modelo Proveedor dinámicamente.
@@ -22,16 +25,21 @@ def _get_proveedor_model():
         ("core_app", "Proveedor"),
     ]
     for app_label, model_name in candidates:
-        model = apps.get_model(app_label, model_name)
-        if model is not None:
-            return model
+        try:
+            return apps.get_model(app_label, model_name)
+        except LookupError:
+            continue
     raise ImportError(
         "No se encontró el modelo 'Proveedor'. "
         "Si está en otra app, agregalo a la lista 'candidates' en _get_proveedor_model()."
     )
 
 
-ProveedorModel = _get_proveedor_model()
+class ProveedorField(serializers.PrimaryKeyRelatedField):
+    """PK de Proveedor; el modelo se resuelve al validar, no al importar el módulo."""
+
+    def get_queryset(self):
+        return _get_proveedor_model().objects.all()
 
 
 # ------------------------------------------------------------------------
@@ -54,7 +62,7 @@ class CompraDetalleReadSerializer(serializers.ModelSerializer):
         )
 
 
-class CompraReadSerializer(serializers.ModelSerializer):
+class CompraReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     proveedor = serializers.PrimaryKeyRelatedField(read_only=True)
 
     # IMPORTANTÍSIMO: en tu modelo CompraDetalle pusiste
@@ -76,6 +84,8 @@ class CompraReadSerializer(serializers.ModelSerializer):
             "total",
             "detalles",
         )
+        # detalles sólo con ?expand=detalles en el listado
+        expandable_fields = ("detalles",)
 
 
 # ------------------------------------------------------------------------
@@ -103,7 +113,7 @@ class CompraDetalleWriteSerializer(serializers.Serializer):
 
 class CompraWriteSerializer(serializers.ModelSerializer):
     # proveedor: PK del proveedor
-    proveedor = serializers.PrimaryKeyRelatedField(queryset=ProveedorModel.objects.all())
+    proveedor = ProveedorField()
     # fecha: opcional, si no viene usamos timezone.now()
     fecha = serializers.DateTimeField(required=False)
     # detalles: viene del frontend como array de renglones
@@ -8,6 +8,11 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core_app.db_router import LecturaEnReplicaMixin
+from core_app.pagination import ListadoPagination
+from core_app.sparse import SparseFieldsViewMixin
+from core_app.fast_serializers import FastListMixin, ValuesSerializer
+
 from .models import Compra, CompraDetalle
 from .serializers import (
     CompraWriteSerializer,
@@ -16,22 +21,38 @@ from .serializers import (
 from catalogo.models import Producto
 
 
-class CompraViewSet(viewsets.ModelViewSet):
+class CompraViewSet(LecturaEnReplicaMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ModelViewSet):
     """
     /api/compras/                -> list / create
     /api/compras/{id}/           -> retrieve
     /api/compras/{id}/confirmar/ -> POST confirmar
     /api/compras/{id}/anular/    -> POST anular
     /api/compras/historial/      -> GET con filtros fecha/estado (para dashboard)
+
+    Lecturas: ?fields=id,fecha,total y ?expand=detalles (ver core_app.sparse).
+    El historial se lee de la réplica si está configurada (core_app.db_router).
     """
+    replica_actions = {"historial"}
     queryset = (
         Compra.objects
         .select_related("local", "proveedor")
-        .prefetch_related("detalles", "detalles__producto")
+        .prefetch_related("detalles")
         .all()
         .order_by("-fecha", "-id")
     )
     permission_classes = [IsAuthenticated]
+    pagination_class = ListadoPagination
+    # CompraDetalleReadSerializer sólo usa producto_id: no hace falta traer el producto
+    expandable = {"detalles": ("detalles",)}
+    keyset_ordering = ("-fecha", "-id")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # si viene X-Local-ID filtramos por local (así el listado usa el índice local/fecha/id)
+        local_id = self.request.headers.get("X-Local-ID", "")
+        if local_id.isdigit():
+            qs = qs.filter(local_id=int(local_id))
+        return qs
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -83,7 +104,7 @@ class CompraViewSet(viewsets.ModelViewSet):
             prod.stock_actual = (
                 Decimal(prod.stock_actual) + Decimal(det.cantidad)
             )
-            prod.save(update_fields=["stock_actual"])
+            prod.save(update_fields=["stock_actual", "updated_at"])
 
         compra.estado = "confirmada"
         compra.save(update_fields=["estado", "updated_at"])
@@ -127,7 +148,7 @@ class CompraViewSet(viewsets.ModelViewSet):
             prod.stock_actual = (
                 Decimal(prod.stock_actual) - Decimal(det.cantidad)
             )
-            prod.save(update_fields=["stock_actual"])
+            prod.save(update_fields=["stock_actual", "updated_at"])
 
         compra.estado = "anulada"
         compra.save(update_fields=["estado", "updated_at"])
@@ -144,8 +165,8 @@ class CompraViewSet(viewsets.ModelViewSet):
         Devuelve compras en ese rango de fechas (inclusive),
         opcionalmente filtrando por estado.
         """
-        desde_str = request.query_params.get("desde")
-        hasta_str = request.query_params.get("hasta")
+        desde_str = request.query_params.get("desde", "")
+        hasta_str = request.query_params.get("hasta", "")
         estado = request.query_params.get("estado", "todos").lower()
 
         hoy = timezone.localdate()
@@ -163,14 +184,14 @@ class CompraViewSet(viewsets.ModelViewSet):
             )
         )
 
-        qs = (
-            self.get_queryset()
-            .filter(fecha__range=(desde_dt, hasta_dt))
-            .prefetch_related("detalles", "detalles__producto")
-        )
+        qs = self.get_queryset().filter(fecha__range=(desde_dt, hasta_dt))
 
         if estado != "todos":
-            qs = qs.filter(estado__iexact=estado)
+            # minúsculas acá y en la base (migración estado_en_minusculas): igualdad
+            # exacta para usar el índice (local, estado, fecha)
+            qs = qs.filter(estado=estado)
 
-        data = CompraReadSerializer(qs, many=True).data
+        # misma salida que CompraReadSerializer(qs, many=True), sin instanciar modelos
+        fast = ValuesSerializer(CompraReadSerializer())
+        data = fast.serialize(fast.values(qs))
         return Response(data, status=status.HTTP_200_OK)
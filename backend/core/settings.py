@@ -65,6 +65,9 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     "x-local-id",
 ]
 
+# headers de respuesta que el front puede leer (p.ej. /clientes/cercanos/)
+CORS_EXPOSE_HEADERS = ["X-Truncado"]
+
 INSTALLED_APPS = [
     "core_app",
     "django.contrib.admin",
@@ -77,6 +80,7 @@ INSTALLED_APPS = [
 
     # Terceros
     "rest_framework",
+    "adrf",  # vistas async de DRF (reportes)
     "rest_framework_simplejwt",
     "drf_spectacular",
     "django_filters",
@@ -98,6 +102,12 @@ if DEBUG:
         pass
 
 MIDDLEWARE = [
+    # primero: Server-Timing y /api/metrics miden el request entero (core_app/metrics.py)
+    "core_app.metrics.MetricasMiddleware",
+
+    # gzip / brotli de las respuestas grandes (core_app/compresion.py)
+    "core_app.compresion.CompresionMiddleware",
+
     "django.middleware.security.SecurityMiddleware",
 
     # WhiteNoise sirve estáticos en producción sin depender de nginx
@@ -138,10 +148,44 @@ WSGI_APPLICATION = "core.wsgi.application"
 # === Base de datos ===
 # Si tenemos DATABASE_URL (Railway/Postgres), la usamos.
 # Si no, usamos SQLite local (dev).
+#
+# Conexiones en Postgres, dos modos:
+# - DB_POOL=1 (default con el worker ASGI): pool de psycopg 3 por proceso. Cada worker
+#   de gunicorn tiene el suyo, así que el total es WEB_CONCURRENCY × DB_POOL_MAX_SIZE:
+#   tiene que entrar en el max_connections de Postgres (ver gunicorn.conf.py).
+# - DB_POOL=0 (default con GUNICORN_WORKER_CLASS=sync): conexión persistente por
+#   worker (DB_CONN_MAX_AGE segundos).
+# Bajo ASGI las vistas sync corren en threads del executor y cada uno se queda con su
+# conexión persistente: se acumulan sin límite. Por eso ahí CONN_MAX_AGE es siempre 0
+# (también en la réplica) y sin el pool cada request abre su conexión.
+# En los dos casos CONN_HEALTH_CHECKS descarta conexiones muertas (restart de la base,
+# corte de red) antes de usarlas en vez de fallar el primer request.
+SERVIDOR_ASGI = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker") != "sync"
+DB_POOL = os.getenv("DB_POOL", "1" if SERVIDOR_ASGI else "0") == "1"
+DB_CONN_MAX_AGE = 0 if SERVIDOR_ASGI else int(os.getenv("DB_CONN_MAX_AGE", "600"))
+
 if os.getenv("DATABASE_URL"):
     DATABASES = {
-        "default": dj_database_url.config(conn_max_age=600, ssl_require=True)
+        "default": dj_database_url.config(
+            # el pool y las conexiones persistentes son excluyentes en Django
+            conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+            conn_health_checks=True,
+            # SSL sólo en Postgres: con DATABASE_URL=sqlite:///... (benchmarks) no aplica
+            ssl_require=os.environ["DATABASE_URL"].startswith("postgres"),
+        )
     }
+    # el pool es de psycopg: con DATABASE_URL=sqlite:///... (benchmarks) no aplica
+    if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+            # segundos esperando una conexión libre antes de dar error
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            # conexiones que pasan cierto tiempo sin usarse se cierran
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            # el health check al sacar una conexión del pool lo pone Django
+            # (conn_health_checks=True): pasarlo acá también rompe el ConnectionPool
+        }
 else:
     DATABASES = {
         "default": {
@@ -150,6 +194,22 @@ else:
         }
     }
 
+# Réplica de sólo lectura para reportes e historiales (core_app/db_router.py).
+# Para probarla en local alcanza con otra base, p.ej.
+# DATABASE_REPLICA_URL=sqlite:///db.sqlite3 (el mismo archivo hace de réplica).
+if os.getenv("DATABASE_REPLICA_URL"):
+    _replica_url = os.environ["DATABASE_REPLICA_URL"]
+    DATABASES["replica"] = dj_database_url.parse(
+        _replica_url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        ssl_require=_replica_url.startswith("postgres"),
+    )
+    # en los tests la "réplica" es la misma base de prueba
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["core_app.db_router.ReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "es-ar"
@@ -165,11 +225,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT sin consulta a auth_user en las lecturas (core_app/authentication.py)
+        "core_app.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        # JSON con orjson que anota el tiempo de render en Server-Timing
+        "core_app.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core_app.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -180,6 +251,41 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 25,
 }
 
+# === Cache ===
+# Con REDIS_URL la cache es compartida entre workers (necesita el paquete `redis`);
+# si no, memoria local de cada proceso (las invalidaciones no cruzan workers,
+# por eso lo cacheado tiene además un TTL corto).
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# segundos que vive en cache el resumen de categorías (/api/catalogo/categorias/resumen/)
+CATALOGO_RESUMEN_TTL = int(os.getenv("CATALOGO_RESUMEN_TTL", "300"))
+
+# segundos que el cursor del delta-sync queda atrás de "ahora" (catalogo/sync.py):
+# cubre transacciones que commitean tarde con un updated_at anterior
+CATALOGO_SYNC_MARGEN = int(os.getenv("CATALOGO_SYNC_MARGEN", "30"))
+
+# Lista de precios pre-serializada por local (catalogo/lista_precios.py). La
+# marca de "lista vieja" vive en CACHES: con varias réplicas tiene que ser Redis
+LISTAS_PRECIOS_DIR = os.getenv("LISTAS_PRECIOS_DIR", str(BASE_DIR / "listas_precios"))
+
+# segundos que vive en cache la lista de locales activos (/api/core/locales/)
+LOCALES_ACTIVOS_TTL = int(os.getenv("LOCALES_ACTIVOS_TTL", "600"))
+
+# fallback de permisos cuando el JWT no trae el claim 'groups' (core_app/permissions.py)
+PERMISOS_GRUPOS_TTL = int(os.getenv("PERMISOS_GRUPOS_TTL", "60"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -189,3 +295,47 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "API – Bebidas",
     "VERSION": "0.1.0",
 }
+
+# respuestas de menos bytes no se comprimen (core_app/compresion.py)
+COMPRESION_MIN_BYTES = int(os.getenv("COMPRESION_MIN_BYTES", "1024"))
+
+# === Logging (core_app/logs.py) ===
+# JSON por línea a stderr, escrito desde otro thread: el request sólo encola
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# fracción de los registros DEBUG que se escriben (p.ej. 0.01 = uno de cada cien)
+LOG_MUESTREO_DEBUG = float(os.getenv("LOG_MUESTREO_DEBUG", "1"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "core_app.logs.JSONFormatter"},
+    },
+    "filters": {
+        "muestreo": {"()": "core_app.logs.Muestreo", "tasa": LOG_MUESTREO_DEBUG},
+    },
+    "handlers": {
+        "cola": {"()": "core_app.logs.ColaHandler", "formatter": "json", "filters": ["muestreo"]},
+    },
+    "root": {"handlers": ["cola"], "level": LOG_LEVEL},
+    "loggers": {
+        # sin esto Django además escribe en su consola propia (con DEBUG=True)
+        "django": {"handlers": ["cola"], "level": "INFO", "propagate": False},
+    },
+}
+
+# === Métricas (core_app/metrics.py) ===
+# header Server-Timing con queries / tiempo de base / render / total
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+# /api/metrics pide "Authorization: Bearer <METRICS_TOKEN>"; vacío = 403 para todos
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# === Queries lentas (core_app/consultas_lentas.py) ===
+# umbral en ms; 0 (por defecto) no instala el wrapper
+CONSULTAS_LENTAS_MS = float(os.getenv("CONSULTAS_LENTAS_MS", "0"))
+# EXPLAIN (sin ANALYZE) de cada huella nueva, sólo en Postgres
+CONSULTAS_LENTAS_EXPLAIN = os.getenv("CONSULTAS_LENTAS_EXPLAIN", "1") == "1"
+# guardar los valores de los parámetros (datos personales, hashes); por defecto
+# sólo el tipo y el largo de cada uno
+CONSULTAS_LENTAS_PARAMS = os.getenv("CONSULTAS_LENTAS_PARAMS", "0") == "1"
+CONSULTAS_LENTAS_ASYNC = True
@@ -11,7 +11,8 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.views import TokenObtainPairView as BaseTokenObtainPairView
 
 # Serializer personalizado
-from core_app.serializers import MyTokenObtainPairSerializer
+from core_app.serializers import MyTokenObtainPairSerializer, MyTokenRefreshSerializer
+from core_app.metrics import metrics
 
 def health(_request):
     return JsonResponse({"status": "ok"})
@@ -24,10 +25,15 @@ class MyTokenObtainPairView(BaseTokenObtainPairView):
     permission_classes = [AllowAny]
     serializer_class = MyTokenObtainPairSerializer
 
+class MyTokenRefreshView(TokenRefreshView):
+    # los grupos se releen en cada renovación (core_app/serializers.py)
+    serializer_class = MyTokenRefreshSerializer
+
 urlpatterns = [
     path("", home),
     path("admin/", admin.site.urls),
     path("api/health", health),  # o /healthz/ si preferís
+    path("api/metrics", metrics, name="metrics"),  # Prometheus (core_app/metrics.py)
 
     # Apps
     path("api/catalogo/", include("catalogo.urls")),
@@ -38,7 +44,7 @@ urlpatterns = [
 
     # Auth
     path("api/auth/token/",   MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/auth/refresh/", TokenRefreshView.as_view(),      name="token_refresh"),
+    path("api/auth/refresh/", MyTokenRefreshView.as_view(),    name="token_refresh"),
 
     # Docs
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 
 class CoreAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core_app'
\ No newline at end of file
+    name = 'core_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,68 @@
+# core_app/authentication.py
+"""
+Autenticación JWT sin ir a la base en las lecturas.
+
+JWTAuthentication de simplejwt hace un SELECT de auth_user en cada request.
+Para lecturas (escaneo de productos, consulta de precios) alcanza con lo que
+ya viaja en el token: user_id, username y groups (MyTokenObtainPairSerializer).
+En GET/HEAD/OPTIONS request.user pasa a ser un UsuarioToken armado con esos
+claims; si una vista necesita el User de verdad (p.ej. para guardarlo en un FK)
+usa usuario_de().
+
+Las escrituras siguen cargando el User (y fallan si está desactivado).
+Ojo: en las lecturas, desactivar un usuario recién se refleja cuando vence su
+access token (SIMPLE_JWT.ACCESS_TOKEN_LIFETIME).
+"""
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UsuarioToken(TokenUser):
+    """Usuario armado con los claims del token; el User real se carga sólo si se pide."""
+
+    @cached_property
+    def usuario(self):
+        return get_user_model().objects.get(pk=self.id)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Lecturas con el usuario del token; escrituras con el User de la base (is_active)."""
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            return self.get_token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_token_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return UsuarioToken(validated_token)
+
+
+def usuario_de(request):
+    """User del request (instancia del modelo), cargándolo recién acá si hace falta."""
+    user = request.user
+    if isinstance(user, UsuarioToken):
+        return user.usuario
+    return user
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """Mismo esquema 'jwtAuth' en el OpenAPI (drf-spectacular) que JWTAuthentication."""
+    target_class = "core_app.authentication.StatelessJWTAuthentication"
@@ -0,0 +1,90 @@
+# core_app/compresion.py
+"""
+Compresión de respuestas según Accept-Encoding: brotli si el cliente lo
+acepta, si no gzip. Sólo cuerpos de texto/JSON de COMPRESION_MIN_BYTES o más
+(en los chicos no se gana nada y se paga la CPU); las respuestas que ya vienen
+comprimidas (lista de precios) o en streaming (estáticos de WhiteNoise) pasan
+tal cual.
+"""
+import gzip
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+TIPOS = ("application/json", "text/", "application/javascript", "application/xml")
+# en orden de preferencia: brotli comprime más a igual tiempo con calidad media
+CODIFICACIONES = {
+    "br": lambda contenido: brotli.compress(contenido, mode=brotli.MODE_TEXT, quality=5),
+    "gzip": lambda contenido: gzip.compress(contenido, compresslevel=6, mtime=0),
+}
+
+
+def elegir_codificacion(accept_encoding):
+    """La primera de CODIFICACIONES que el cliente acepta (respeta q=0), o None."""
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.partition(";")
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        aceptadas[nombre.strip()] = q
+    comodin = aceptadas.get("*", 0.0)
+    for codificacion in CODIFICACIONES:
+        if aceptadas.get(codificacion, comodin) > 0:
+            return codificacion
+    return None
+
+
+class CompresionMiddleware:
+    """Va justo después de MetricasMiddleware: antes que cualquiera que lea el cuerpo."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._comprimir(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._comprimir(request, await self.get_response(request))
+
+    def _comprimir(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESION_MIN_BYTES
+            or not response.get("Content-Type", "").startswith(TIPOS)
+        ):
+            return response
+
+        # comprimible: la respuesta depende de Accept-Encoding, se comprima o no
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codificacion = elegir_codificacion(request.headers.get("Accept-Encoding", ""))
+        if codificacion is None:
+            return response
+
+        comprimido = CODIFICACIONES[codificacion](response.content)
+        if len(comprimido) >= len(response.content):
+            return response
+
+        response.content = comprimido
+        response["Content-Length"] = str(len(comprimido))
+        response["Content-Encoding"] = codificacion
+        # como GZipMiddleware: el cuerpo ya no es byte a byte el del ETag
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
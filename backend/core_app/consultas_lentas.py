@@ -0,0 +1,213 @@
+# core_app/consultas_lentas.py
+"""
+Captura de queries lentas (opt-in con CONSULTAS_LENTAS_MS).
+
+Un execute wrapper en cada conexión mide las queries; las que pasan el umbral
+van a una cola y un thread aparte las loguea, las acumula por huella (el SQL
+normalizado: sin literales ni parámetros, con las listas IN colapsadas) en
+ConsultaLenta y, la primera vez que ve cada huella, guarda el EXPLAIN.
+El request no paga nada de eso: sólo el perf_counter y, si es lenta, un put().
+
+Los parámetros pueden ser hashes de contraseñas, mails o teléfonos: salvo con
+CONSULTAS_LENTAS_PARAMS, del ejemplo sólo quedan el tipo y el largo de cada uno
+y del plan se tapan las constantes entre comillas.
+
+`python manage.py consultas_lentas` muestra las que más tiempo suman.
+"""
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections
+from django.db.models import F
+
+from .metrics import _medicion
+
+logger = logging.getLogger(__name__)
+
+_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_PARAMETROS = re.compile(r"%s|\?")
+_LISTAS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_FILAS = re.compile(r"\bVALUES\s*\([^()]*\)(?:\s*,\s*\([^()]*\))*", re.IGNORECASE)
+_ESPACIOS = re.compile(r"\s+")
+
+_EXPLICABLES = ("select", "with", "insert", "update", "delete")
+
+# en el thread que guarda (y en el modo sync) sus propias queries no se capturan
+_capturando = ContextVar("capturando_consulta_lenta", default=False)
+
+_cola = queue.Queue(maxsize=1000)
+_lock = threading.Lock()
+_thread_pid = None
+# huellas a las que este proceso ya les intentó el EXPLAIN
+_explicadas = set()
+
+
+def normalizar(sql):
+    """El SQL sin valores: `IN (%s, %s, %s)` y `IN (1, 2)` quedan iguales a `IN (...)`."""
+    sql = _CADENAS.sub("?", sql)
+    sql = _NUMEROS.sub("?", sql)
+    sql = _PARAMETROS.sub("?", sql)
+    sql = _LISTAS.sub("IN (...)", sql)
+    sql = _FILAS.sub("VALUES (...)", sql)  # los bulk_create, con cualquier cantidad de filas
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def huella(sql_normalizado):
+    return hashlib.sha1(sql_normalizado.encode()).hexdigest()[:16]
+
+
+def _describir(valor):
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return type(valor).__name__
+    try:
+        return f"{type(valor).__name__}({len(valor)})"
+    except TypeError:
+        return type(valor).__name__
+
+
+def describir_params(params):
+    """Los parámetros sin sus valores: `['secreto', 3]` queda `[str(7), int]`."""
+    if params is None:
+        return "None"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{clave!r}: {_describir(v)}" for clave, v in params.items()) + "}"
+    return "[" + ", ".join(_describir(v) for v in params) + "]"
+
+
+def _vista_actual():
+    medicion = _medicion.get()
+    request = medicion.request if medicion is not None else None
+    match = getattr(request, "resolver_match", None)
+    if match is not None:
+        return match.view_name
+    return "" if request is None else "sin_ruta"
+
+
+def capturar_consulta_lenta(execute, sql, params, many, context):
+    if _capturando.get():
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        ms = (time.perf_counter() - inicio) * 1000
+        if ms >= settings.CONSULTAS_LENTAS_MS:
+            _encolar({
+                "base": context["connection"].alias,
+                "sql": sql,
+                "params": None if many else params,
+                "ms": ms,
+                "vista": _vista_actual(),
+            })
+
+
+def instrumentar_conexion(connection):
+    if settings.CONSULTAS_LENTAS_MS and capturar_consulta_lenta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, capturar_consulta_lenta)
+
+
+def _encolar(consulta):
+    if not settings.CONSULTAS_LENTAS_ASYNC:
+        token = _capturando.set(True)
+        try:
+            _procesar(consulta)
+        except Exception as e:
+            # p.ej. durante el migrate que crea la tabla: sin traceback por cada query
+            logger.warning("No se pudo guardar la query lenta: %s", e)
+        finally:
+            _capturando.reset(token)
+        return
+
+    _asegurar_thread()
+    try:
+        _cola.put_nowait(consulta)
+    except queue.Full:
+        pass  # la base está tan mal que no damos abasto: mejor perder muestras
+
+
+def _asegurar_thread():
+    # uno por proceso: después del fork de gunicorn el thread del master no existe
+    global _thread_pid
+    if _thread_pid == os.getpid():
+        return
+    with _lock:
+        if _thread_pid == os.getpid():
+            return
+        threading.Thread(target=_trabajar, daemon=True, name="consultas-lentas").start()
+        _thread_pid = os.getpid()
+
+
+def _trabajar():
+    _capturando.set(True)
+    while True:
+        consulta = _cola.get()
+        try:
+            _procesar(consulta)
+        except Exception as e:
+            logger.warning("No se pudo guardar la query lenta: %s", e)
+        finally:
+            close_old_connections()
+
+
+def _explain(base, sql, params):
+    if not settings.CONSULTAS_LENTAS_EXPLAIN or params is None:
+        return ""
+    if not sql.lstrip().lower().startswith(_EXPLICABLES):
+        return ""
+    conexion = connections[base]
+    if conexion.vendor != "postgresql":
+        return ""
+    # EXPLAIN sin ANALYZE: planifica pero no ejecuta (tampoco los INSERT/UPDATE)
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute(f"{conexion.ops.explain_query_prefix()} {sql}", params)
+            return "\n".join(str(fila[-1]) for fila in cursor.fetchall())
+    except Exception:
+        logger.warning("No se pudo hacer EXPLAIN de la query lenta", exc_info=True)
+        return ""
+
+
+def _procesar(consulta):
+    from .models import ConsultaLenta
+
+    normalizado = normalizar(consulta["sql"])
+    clave = huella(normalizado)
+    ms = consulta["ms"]
+    logger.warning(
+        "Query lenta (%.0f ms) en %s [%s]: %s", ms, consulta["vista"] or "-", clave, normalizado[:500],
+    )
+
+    # sin get_or_create: su savepoint falla si la query lenta (modo sync) dejó
+    # un cursor abierto. Con F(): varios workers pueden sumar a la misma huella
+    filas = ConsultaLenta.objects.filter(huella=clave)
+    sumar = {"veces": F("veces") + 1, "total_ms": F("total_ms") + ms}
+    if not filas.update(**sumar):
+        try:
+            ConsultaLenta.objects.create(huella=clave, sql=normalizado, base=consulta["base"])
+        except IntegrityError:
+            pass  # la creó otro worker recién
+        filas.update(**sumar)
+    # la más lenta; con CONSULTAS_LENTAS_PARAMS, con los valores para reproducirla
+    params = consulta["params"]
+    params = repr(params) if settings.CONSULTAS_LENTAS_PARAMS else describir_params(params)
+    filas.filter(max_ms__lt=ms).update(
+        max_ms=ms,
+        vista=consulta["vista"][:200],
+        ejemplo=f"{consulta['sql']}\n-- params: {params}",
+    )
+
+    if clave not in _explicadas:
+        _explicadas.add(clave)
+        plan = _explain(consulta["base"], consulta["sql"], consulta["params"])
+        if plan and not settings.CONSULTAS_LENTAS_PARAMS:
+            plan = _CADENAS.sub("'?'", plan)  # el plan trae los valores de los filtros
+        if plan:
+            filas.update(plan=plan)
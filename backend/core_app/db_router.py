@@ -0,0 +1,110 @@
+# core_app/db_router.py
+"""
+Lecturas de reportes/historiales contra una réplica de sólo lectura.
+
+- Si DATABASES no tiene el alias "replica" (dev, tests, un solo Postgres),
+  el router no hace nada: todo va a "default".
+- Sólo se usa la réplica dentro de lecturas_en_replica() (o de una vista con
+  LecturaEnReplicaMixin): el resto del sistema lee siempre del primario.
+- Apenas hay una escritura en ese contexto, o si hay una transacción abierta
+  en el primario, las lecturas siguientes vuelven al primario (la réplica puede
+  venir atrasada y no vería lo recién escrito).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+_leer_de_replica = ContextVar("leer_de_replica", default=False)
+_hubo_escritura = ContextVar("hubo_escritura", default=False)
+
+
+def replica_configurada():
+    return REPLICA_DB_ALIAS in connections
+
+
+def activar_replica():
+    """Empieza un tramo de lecturas en réplica. Devuelve lo que pide desactivar_replica()."""
+    previo = (_leer_de_replica.get(), _hubo_escritura.get())
+    _leer_de_replica.set(True)
+    _hubo_escritura.set(False)
+    return previo
+
+
+def desactivar_replica(previo):
+    # restauramos valores en vez de usar Token.reset(): en vistas async el
+    # initial() corre en otro contexto (sync_to_async) y el token no serviría
+    _leer_de_replica.set(previo[0])
+    _hubo_escritura.set(previo[1])
+
+
+@contextmanager
+def lecturas_en_replica():
+    tokens = activar_replica()
+    try:
+        yield
+    finally:
+        desactivar_replica(tokens)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _leer_de_replica.get()
+            and not _hubo_escritura.get()
+            and replica_configurada()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        if _leer_de_replica.get():
+            _hubo_escritura.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # la réplica tiene los mismos datos: un objeto leído de ahí puede
+        # relacionarse con uno del primario
+        dbs = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # la réplica se migra sola (replicación física)
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+class LecturaEnReplicaMixin:
+    """
+    Opt-in por vista: los GET se atienden desde la réplica.
+
+    - APIView: toda la vista (replica_actions = None)
+    - ViewSet: sólo las actions listadas, p.ej. replica_actions = {"historial"}
+    """
+    replica_actions = None
+
+    def _usa_replica(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if self.replica_actions is None:
+            return True
+        return getattr(self, "action", None) in self.replica_actions
+
+    def initial(self, request, *args, **kwargs):
+        # autenticación y permisos quedan en el primario
+        super().initial(request, *args, **kwargs)
+        if self._usa_replica(request):
+            self._tokens_replica = activar_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        tokens = getattr(self, "_tokens_replica", None)
+        if tokens is not None:
+            desactivar_replica(tokens)
+            self._tokens_replica = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,228 @@
+# core_app/fast_serializers.py
+"""
+Camino rápido de lectura para listados grandes.
+
+En vez de instanciar modelos y pasar cada objeto por el ModelSerializer,
+leemos tuplas con values_list() y las convertimos con mappers que se
+"compilan" una sola vez a partir del serializer existente. La salida tiene
+que ser la misma JSON que la del serializer (tests/test_fast_serializers.py).
+
+Soporta:
+- campos simples y FKs (PK)
+- campos con source de un nivel de relación ("local.nombre")
+- anidados many=True sobre una FK inversa (p.ej. "detalles"), con una
+  sola query extra para todos los padres
+"""
+import decimal
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+_OMITIR = object()
+
+# tipos cuyo to_representation es la identidad para lo que devuelve la base
+_IDENTIDAD = (
+    drf_fields.IntegerField,
+    drf_fields.BooleanField,
+    drf_fields.FloatField,
+    drf_fields.ReadOnlyField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+class CampoNoSoportado(Exception):
+    """El serializer tiene algo que el camino rápido no sabe reproducir."""
+
+
+def _mapper_decimal(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exp = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def mapper(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return f"{value.quantize(exp, rounding=rounding, context=context):f}"
+
+    return mapper
+
+
+def _mapper_datetime(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != drf_fields.ISO_8601 or not settings.USE_TZ:
+        return field.to_representation
+
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+
+    def mapper(value):
+        iso = value.astimezone(tz).isoformat()
+        if iso.endswith("+00:00"):
+            return iso[:-6] + "Z"
+        return iso
+
+    return mapper
+
+
+def _mapper(field):
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is not None:
+        return field.pk_field.to_representation
+    if isinstance(field, _IDENTIDAD):
+        return None
+    if isinstance(field, drf_fields.ChoiceField):
+        choices = field.choice_strings_to_values
+        return lambda value: choices.get(str(value), value)
+    if isinstance(field, drf_fields.CharField):
+        return str
+    if isinstance(field, drf_fields.DecimalField):
+        return _mapper_decimal(field)
+    if isinstance(field, drf_fields.DateTimeField):
+        return _mapper_datetime(field)
+    raise CampoNoSoportado(f"{field.field_name}: {field.__class__.__name__}")
+
+
+def _valor_faltante(field):
+    # mismo criterio que Field.get_attribute cuando la relación es NULL
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null:
+        return None
+    return _OMITIR
+
+
+class ValuesSerializer:
+    """
+    Se arma a partir de una instancia de serializer (ya recortada por
+    ?fields/?expand si corresponde) y serializa filas de values_list().
+
+        fast = ValuesSerializer(CompraReadSerializer())
+        data = fast.serialize(fast.values(queryset))
+    """
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.lookups = []
+        self.plan = []      # (nombre, idx, mapper, idx_fk, faltante)
+        self.anidados = []  # (nombre, ValuesSerializer, fk_name)
+        self.idx_fk_padre = None
+
+        opts = self.model._meta
+        self.idx_pk = self._lookup(opts.pk.name)
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                self._anidado(name, field)
+                continue
+            if isinstance(field, serializers.BaseSerializer) or field.source == "*":
+                raise CampoNoSoportado(name)
+
+            partes = field.source.split(".")
+            mapper = _mapper(field)
+            if len(partes) == 1:
+                self.plan.append((name, self._lookup(partes[0]), mapper, None, None))
+            elif len(partes) == 2:
+                rel = opts.get_field(partes[0])
+                self.plan.append((
+                    name,
+                    self._lookup(f"{partes[0]}__{partes[1]}"),
+                    mapper,
+                    self._lookup(rel.attname),
+                    _valor_faltante(field),
+                ))
+            else:
+                raise CampoNoSoportado(name)
+
+    def _lookup(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return self.lookups.index(lookup)
+
+    def _anidado(self, name, field):
+        rel = self.model._meta.get_field(field.source)
+        if not rel.one_to_many:
+            raise CampoNoSoportado(name)
+        hijo = ValuesSerializer(field.child)
+        if hijo.anidados:
+            raise CampoNoSoportado(name)
+        fk_name = rel.field.attname
+        hijo.idx_fk_padre = hijo._lookup(fk_name)
+        self.anidados.append((name, hijo, fk_name))
+
+    def values(self, queryset):
+        """
+        values_list() con todo lo que hace falta. Las filas son namedtuples
+        así el paginado por cursor puede leer fecha/id como atributos.
+        """
+        for campo in queryset.query.order_by:
+            campo = campo.lstrip("-")
+            if "__" not in campo and campo.isidentifier():
+                self._lookup(campo)
+        return queryset.prefetch_related(None).values_list(*self.lookups, named=True)
+
+    def _fila(self, row):
+        data = {}
+        for nombre, idx, mapper, idx_fk, faltante in self.plan:
+            if idx_fk is not None and row[idx_fk] is None:
+                if faltante is not _OMITIR:
+                    data[nombre] = faltante
+                continue
+            value = row[idx]
+            if value is None or mapper is None:
+                data[nombre] = value
+            else:
+                data[nombre] = mapper(value)
+        return data
+
+    def serialize(self, rows):
+        rows = list(rows)
+        data = [self._fila(row) for row in rows]
+
+        for nombre, hijo, fk_name in self.anidados:
+            ids = [row[self.idx_pk] for row in rows]
+            por_padre = defaultdict(list)
+            if ids:
+                qs = (
+                    hijo.model.objects
+                    .filter(**{f"{fk_name}__in": ids})
+                    .order_by(hijo.model._meta.pk.name)
+                    .values_list(*hijo.lookups)
+                )
+                for row in qs:
+                    por_padre[row[hijo.idx_fk_padre]].append(hijo._fila(row))
+            for item, row in zip(data, rows):
+                item[nombre] = por_padre.get(row[self.idx_pk], [])
+
+        return data
+
+
+class FastListMixin:
+    """
+    Mixin de viewset: el `list` usa ValuesSerializer en vez del serializer.
+    Si el serializer tiene algo no soportado, cae al list de siempre.
+    """
+
+    def list(self, request, *args, **kwargs):
+        try:
+            fast = ValuesSerializer(self.get_serializer())
+        except CampoNoSoportado:
+            return super().list(request, *args, **kwargs)
+
+        rows = fast.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
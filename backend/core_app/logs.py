@@ -0,0 +1,110 @@
+# core_app/logs.py
+"""
+Logging sin bloquear los requests (se configura en LOGGING de core/settings.py).
+
+ColaHandler deja cada registro en una cola y vuelve; un QueueListener en otro
+thread lo formatea como una línea JSON y lo escribe en stderr. Si la cola se
+llena (stderr trabado), se descartan registros antes que frenar un request.
+
+Muestreo deja pasar sólo una fracción de los DEBUG (LOG_MUESTREO_DEBUG), para
+poder prender el debug de algo que se loguea en cada venta.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# los atributos que trae todo LogRecord; el resto vino en extra={...}
+_ATRIBUTOS_BASE = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por registro: ts, nivel, logger, msg, los extra y el traceback."""
+
+    def format(self, record):
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_BASE and not clave.startswith("_"):
+                datos[clave] = valor
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            datos["exc"] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class Muestreo(logging.Filter):
+    """Deja pasar una fracción `tasa` de los registros DEBUG; los demás niveles pasan todos."""
+
+    def __init__(self, tasa=1.0):
+        super().__init__()
+        self.tasa = tasa
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.tasa >= 1 or random.random() < self.tasa
+
+
+class ColaHandler(QueueHandler):
+    def __init__(self, tamano=10_000):
+        super().__init__(queue.Queue(maxsize=tamano))
+        self.tamano = tamano
+        self.descartados = 0
+        self._listener = None
+        self._pid = None
+        self._arranque = threading.Lock()
+
+    def _arrancar(self):
+        # uno por proceso: los threads no sobreviven al fork de gunicorn
+        with self._arranque:
+            if self._pid == os.getpid():
+                return
+            # y tampoco la cola: la del master (preload_app, loguea en when_ready)
+            # llega con sus locks en el estado del fork y con registros que ya
+            # escribe el listener del master
+            self.queue = queue.Queue(maxsize=self.tamano)
+            destino = logging.StreamHandler(sys.stderr)
+            destino.setFormatter(self.formatter or JSONFormatter())
+            self._listener = QueueListener(self.queue, destino)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.detener)
+
+    def detener(self):
+        """Escribe lo que quedó en la cola y para el listener (va en atexit)."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def prepare(self, record):
+        # acá sólo lo que depende del momento (los args pueden cambiar después);
+        # el JSON lo arma el listener
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._arrancar()
+        super().emit(record)
@@ -0,0 +1,52 @@
+# core_app/management/commands/consultas_lentas.py
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from core_app.models import ConsultaLenta
+
+ORDENES = {
+    "total": F("total_ms").desc(),
+    "max": F("max_ms").desc(),
+    "promedio": (F("total_ms") / F("veces")).desc(),
+    "veces": F("veces").desc(),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra las queries lentas capturadas (CONSULTAS_LENTAS_MS), agrupadas por huella "
+        "y ordenadas por tiempo total: `python manage.py consultas_lentas --top 10 --plan`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Cuántas mostrar (default 20).")
+        parser.add_argument("--orden", choices=sorted(ORDENES), default="total")
+        parser.add_argument("--plan", action="store_true", help="Mostrar el ejemplo más lento y su EXPLAIN.")
+        parser.add_argument("--borrar", action="store_true", help="Vaciar lo acumulado y salir.")
+
+    def handle(self, *args, **options):
+        if options["borrar"]:
+            borradas, _ = ConsultaLenta.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"{borradas} huellas borradas."))
+            return
+
+        consultas = ConsultaLenta.objects.filter(veces__gt=0).order_by(ORDENES[options["orden"]])
+        consultas = list(consultas[: options["top"]])
+        if not consultas:
+            self.stdout.write("No hay queries lentas registradas.")
+            return
+
+        self.stdout.write(
+            f"{'total ms':>10} {'veces':>7} {'prom ms':>8} {'max ms':>8}  {'huella':16}  vista"
+        )
+        for c in consultas:
+            self.stdout.write(
+                f"{c.total_ms:>10.0f} {c.veces:>7} {c.total_ms / c.veces:>8.1f} {c.max_ms:>8.1f}  "
+                f"{c.huella:16}  {c.vista or '-'}"
+            )
+            self.stdout.write(f"    {c.sql[:300]}")
+            if options["plan"]:
+                self.stdout.write(f"    -- la más lenta:\n    {c.ejemplo}")
+                if c.plan:
+                    self.stdout.write("    -- plan:\n" + "\n".join(f"    {linea}" for linea in c.plan.splitlines()))
+            self.stdout.write("")
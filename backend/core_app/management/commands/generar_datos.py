@@ -0,0 +1,318 @@
+# core_app/management/commands/generar_datos.py
+"""
+Datos sintéticos a escala de producción, para ver cómo se comportan las
+queries con volumen real (EXPLAIN, benchmarks, reportes):
+
+    python manage.py generar_datos --locales 5 --productos 20000 --ventas 2000000
+
+- popularidad de productos con distribución de Pareto: pocos productos se
+  llevan la mayoría de los renglones (~80/20)
+- estacionalidad: más ventas viernes y sábado, en diciembre, y con picos al
+  mediodía y a la noche; las compras, en horario comercial de lunes a sábado
+- carga en bloques: COPY en Postgres, INSERT con executemany en el resto
+
+Crea locales nuevos ("Sintético N"): no toca los datos que ya hay.
+"""
+import random
+import time
+from bisect import bisect
+from collections import Counter
+from datetime import datetime, time as dtime, timedelta
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from catalogo.lista_precios import construir_lista_precios
+from catalogo.models import Categoria, Producto, Proveedor
+from compras.models import Compra, CompraDetalle
+from core_app.models import Local
+from core_app.services import invalidar_locales_activos
+from ventas.models import Venta, VentaDetalle
+
+# categoría -> rango de precio de venta (ARS)
+CATEGORIAS = {
+    "Cervezas": (900, 4500), "Vinos": (2500, 30000), "Espumantes": (5000, 40000),
+    "Gaseosas": (800, 3500), "Aguas": (500, 1800), "Jugos": (700, 2500),
+    "Aperitivos": (3500, 12000), "Fernet": (7000, 14000), "Whisky": (12000, 90000),
+    "Vodka": (5000, 30000), "Gin": (8000, 45000), "Energizantes": (1200, 3000),
+    "Snacks": (600, 4000), "Hielo": (800, 1500),
+}
+PRESENTACIONES = ("354 ml", "473 ml", "710 ml", "750 ml", "1 L", "1.5 L", "2.25 L", "Pack x6")
+PARETO_ALFA = 1.16  # ~80/20
+
+# lunes..domingo, enero..diciembre, 0..23 h
+PESO_DIA = (0.75, 0.8, 0.85, 0.95, 1.35, 1.6, 1.0)
+PESO_MES = (0.95, 0.85, 0.9, 0.9, 0.95, 0.95, 1.0, 0.95, 0.95, 1.0, 1.1, 1.5)
+PESO_HORA = (
+    0.3, 0.15, 0.05, 0, 0, 0, 0, 0.05, 0.3, 0.6, 0.9, 1.3,
+    1.6, 1.4, 0.9, 0.7, 0.8, 1.1, 1.5, 1.9, 2.1, 1.8, 1.2, 0.6,
+)
+PESO_DIA_COMPRAS = (1, 1, 1, 1, 1, 0.4, 0)
+PESO_HORA_COMPRAS = tuple(1 if 8 <= h < 18 else 0 for h in range(24))
+
+ESTADOS_VENTA = (("confirmada", 94), ("anulada", 3), ("borrador", 3))
+ESTADOS_COMPRA = (("confirmada", 97), ("anulada", 3))
+CANTIDADES_VENTA = ((1, 70), (2, 15), (3, 5), (6, 7), (12, 3))
+
+
+def _elegir(pares):
+    valores, pesos = zip(*pares)
+    acumulados = list(accumulate(pesos))
+    return lambda: valores[bisect(acumulados, random.random() * acumulados[-1])]
+
+
+class Cargador:
+    """Junta filas por modelo y las escribe en bloques, padres antes que hijos."""
+
+    def __init__(self, bloque):
+        self.bloque = bloque
+        self.columnas = {}
+        self.filas = {}
+        self.escritas = Counter()
+        self.copy = connection.vendor == "postgresql"
+
+    def tabla(self, model, columnas):
+        self.columnas[model] = columnas
+        self.filas[model] = []
+
+    def agregar(self, model, fila):
+        filas = self.filas[model]
+        filas.append(fila)
+        if len(filas) >= self.bloque:
+            self.volcar()
+
+    def volcar(self):
+        with transaction.atomic():
+            for model, filas in self.filas.items():
+                if not filas:
+                    continue
+                if self.copy:
+                    self._copy(model, self.columnas[model], filas)
+                else:
+                    self._insert(model, self.columnas[model], filas)
+                self.escritas[model] += len(filas)
+                filas.clear()
+
+    @staticmethod
+    def _sql_columnas(model, columnas):
+        q = connection.ops.quote_name
+        return q(model._meta.db_table), ", ".join(q(model._meta.get_field(c).column) for c in columnas)
+
+    def _copy(self, model, columnas, filas):
+        tabla, cols = self._sql_columnas(model, columnas)
+        with connection.cursor() as cursor:
+            with cursor.cursor.copy(f"COPY {tabla} ({cols}) FROM STDIN") as copy:
+                for fila in filas:
+                    copy.write_row(fila)
+
+    def _insert(self, model, columnas, filas):
+        # executemany directo: bulk_create instancia y prepara cada valor con el ORM
+        # (~10x más lento). Los valores ya son int/str/None; sólo las fechas se adaptan.
+        tabla, cols = self._sql_columnas(model, columnas)
+        fechas = [
+            i for i, c in enumerate(columnas)
+            if model._meta.get_field(c).get_internal_type() == "DateTimeField"
+        ]
+        adaptar = connection.ops.adapt_datetimefield_value
+        if fechas:
+            filas = [list(fila) for fila in filas]
+            for fila in filas:
+                for i in fechas:
+                    fila[i] = adaptar(fila[i])
+        marcas = ", ".join(["%s"] * len(columnas))
+        with connection.cursor() as cursor:
+            cursor.executemany(f"INSERT INTO {tabla} ({cols}) VALUES ({marcas})", filas)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera locales, catálogo, proveedores, compras y ventas sintéticos a escala de "
+        "producción (popularidad Pareto, estacionalidad diaria/horaria)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--locales", type=int, default=5)
+        parser.add_argument("--productos", type=int, default=20000, help="Por local.")
+        parser.add_argument("--proveedores", type=int, default=15, help="Por local.")
+        parser.add_argument("--ventas", type=int, default=2000000, help="En total, repartidas entre los locales.")
+        parser.add_argument("--compras", type=int, help="En total. Por defecto ventas / 100.")
+        parser.add_argument("--dias", type=int, default=365, help="Días de historia hasta hoy.")
+        parser.add_argument("--semilla", type=int, help="Para repetir exactamente los mismos datos.")
+        parser.add_argument("--bloque", type=int, default=20000, help="Filas por COPY / INSERT.")
+
+    def handle(self, *args, **options):
+        if options["locales"] < 1 or options["productos"] < 1 or options["dias"] < 1:
+            raise CommandError("--locales, --productos y --dias tienen que ser >= 1")
+        random.seed(options["semilla"])
+        compras = options["compras"] if options["compras"] is not None else max(1, options["ventas"] // 100)
+
+        t0 = time.perf_counter()
+        hoy = timezone.localdate()
+        dias = [hoy - timedelta(days=d) for d in range(options["dias"] - 1, -1, -1)]
+
+        locales = self._catalogo(options["locales"], options["productos"], options["proveedores"])
+        self.stdout.write(f"Catálogo: {len(locales)} locales × {options['productos']} productos")
+
+        cargador = Cargador(options["bloque"])
+        self._ventas(cargador, locales, dias, options["ventas"])
+        self._compras(cargador, locales, dias, compras)
+        self._terminar(locales)
+
+        resumen = ", ".join(f"{n} {m._meta.verbose_name_plural}" for m, n in cargador.escritas.items())
+        self.stdout.write(self.style.SUCCESS(f"Listo en {time.perf_counter() - t0:.0f} s: {resumen}"))
+
+    # ------------------------------------------------------------------
+    def _catalogo(self, cantidad, productos, proveedores):
+        """Crea locales, categorías, productos y proveedores. Devuelve un dict por local."""
+        desde = Local.objects.aggregate(m=Max("id"))["m"] or 0
+        nuevos = Local.objects.bulk_create(
+            Local(nombre=f"Sintético {desde + i + 1}", lat=-34.6 + random.uniform(-0.2, 0.2),
+                  lng=-58.4 + random.uniform(-0.2, 0.2))
+            for i in range(cantidad)
+        )
+
+        locales = []
+        for local in nuevos:
+            categorias = Categoria.objects.bulk_create(Categoria(local=local, nombre=n) for n in CATEGORIAS)
+            catalogo = []
+            for i in range(productos):
+                categoria = random.choice(categorias)
+                minimo, maximo = CATEGORIAS[categoria.nombre]
+                venta = round(random.uniform(minimo, maximo), -1)
+                catalogo.append(Producto(
+                    local=local, codigo=f"{7790000000000 + i}", categoria=categoria,
+                    nombre=f"{categoria.nombre} {i % 400:03d} {random.choice(PRESENTACIONES)}",
+                    marca=f"Marca {random.randrange(120):03d}", unidad="un",
+                    precio_venta=venta, precio_compra_prom=round(venta / random.uniform(1.25, 1.6)),
+                    stock_actual=random.randrange(500), stock_minimo=random.randrange(5, 30),
+                    activo=random.random() > 0.03,
+                ))
+            catalogo = Producto.objects.bulk_create(catalogo, batch_size=2000)
+            provs = Proveedor.objects.bulk_create(
+                Proveedor(local=local, nombre=f"Distribuidora {i + 1:02d}", cuit=f"30{random.randrange(10**8, 10**9)}")
+                for i in range(proveedores)
+            )
+
+            # popularidad Pareto, en orden al azar (no correlacionada con el id)
+            popularidad = [min(random.paretovariate(PARETO_ALFA), 1e4) for _ in catalogo]
+            locales.append({
+                "id": local.id,
+                "peso": random.uniform(0.6, 1.4),  # locales más grandes y más chicos
+                "productos": [(p.id, int(p.precio_venta), int(p.precio_compra_prom)) for p in catalogo],
+                "acumulado": list(accumulate(popularidad)),
+                "proveedores": [p.id for p in provs],
+            })
+        return locales
+
+    @staticmethod
+    def _muestra(local, k):
+        """k productos distintos del local, según su popularidad."""
+        productos, acumulado = local["productos"], local["acumulado"]
+        total, elegidos = acumulado[-1], {}
+        for _ in range(k):
+            p = productos[bisect(acumulado, random.random() * total)]
+            elegidos[p[0]] = p
+        return elegidos.values()
+
+    @staticmethod
+    def _por_dia(dias, total, peso_dia, peso_mes=None):
+        """Reparte `total` entre los días según día de semana (y mes)."""
+        pesos = [peso_dia[d.weekday()] * (peso_mes[d.month - 1] if peso_mes else 1) for d in dias]
+        return Counter(random.choices(range(len(dias)), weights=pesos, k=total))
+
+    def _horarios(self, dia, k, peso_hora, ahora):
+        tz = timezone.get_current_timezone()
+        horas = random.choices(range(24), weights=peso_hora, k=k)
+        horarios = []
+        for h in horas:
+            fecha = datetime.combine(dia, dtime(h, random.randrange(60), random.randrange(60)), tzinfo=tz)
+            horarios.append(min(fecha, ahora - timedelta(seconds=random.randrange(1, 3600))))
+        return sorted(horarios)
+
+    def _progreso(self, nombre, hechas, total, t0):
+        if total and hechas * 20 // total != (hechas - 1) * 20 // total:
+            self.stdout.write(f"  {nombre}: {hechas}/{total} ({hechas / (time.perf_counter() - t0):,.0f}/s)")
+
+    # ------------------------------------------------------------------
+    def _ventas(self, cargador, locales, dias, total):
+        cargador.tabla(Venta, ("id", "local_id", "fecha", "subtotal", "impuestos", "bonificaciones",
+                               "total", "estado", "created_at", "updated_at", "usuario_id"))
+        cargador.tabla(VentaDetalle, ("venta_id", "renglon", "producto_id", "cantidad", "precio_unitario",
+                                      "bonif", "impuestos", "total_renglon"))
+        estado, cantidad = _elegir(ESTADOS_VENTA), _elegir(CANTIDADES_VENTA)
+        pesos = [l["peso"] for l in locales]
+        por_dia = self._por_dia(dias, total, PESO_DIA, PESO_MES)
+
+        # ids explícitos: los detalles los referencian sin esperar un RETURNING
+        venta_id = (Venta.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+        ahora, hechas, t0 = timezone.now(), 0, time.perf_counter()
+        for i, dia in enumerate(dias):
+            k = por_dia[i]
+            del_dia = zip(self._horarios(dia, k, PESO_HORA, ahora), random.choices(locales, weights=pesos, k=k))
+            for fecha, local in del_dia:
+                detalles, subtotal, bonificaciones = [], 0, 0
+                items = min(15, 1 + int(random.expovariate(1 / 1.6)))
+                for renglon, (producto_id, precio, _) in enumerate(self._muestra(local, items), start=1):
+                    cant = cantidad()
+                    bruto = cant * precio
+                    bonif = round(bruto * random.choice((0.05, 0.1, 0.15))) if random.random() < 0.1 else 0
+                    detalles.append((venta_id, renglon, producto_id, cant, precio, bonif, 0, bruto - bonif))
+                    subtotal += bruto
+                    bonificaciones += bonif
+                # la venta antes que sus renglones: un volcado en el medio no deja huérfanos
+                cargador.agregar(Venta, (venta_id, local["id"], fecha, subtotal, 0, bonificaciones,
+                                         subtotal - bonificaciones, estado(), fecha, fecha, None))
+                for detalle in detalles:
+                    cargador.agregar(VentaDetalle, detalle)
+                venta_id += 1
+                hechas += 1
+                self._progreso("ventas", hechas, total, t0)
+        cargador.volcar()
+
+    def _compras(self, cargador, locales, dias, total):
+        cargador.tabla(Compra, ("id", "local_id", "fecha", "proveedor_id", "subtotal", "impuestos",
+                                "bonificaciones", "total", "estado", "created_at", "updated_at"))
+        cargador.tabla(CompraDetalle, ("compra_id", "renglon", "producto_id", "cantidad", "costo_unitario",
+                                       "bonif", "impuestos", "total_renglon"))
+        estado = _elegir(ESTADOS_COMPRA)
+        pesos = [l["peso"] for l in locales]
+        por_dia = self._por_dia(dias, total, PESO_DIA_COMPRAS)
+
+        compra_id = (Compra.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+        ahora, hechas, t0 = timezone.now(), 0, time.perf_counter()
+        for i, dia in enumerate(dias):
+            k = por_dia[i]
+            del_dia = zip(self._horarios(dia, k, PESO_HORA_COMPRAS, ahora), random.choices(locales, weights=pesos, k=k))
+            for fecha, local in del_dia:
+                detalles, subtotal = [], 0
+                for renglon, (producto_id, _, costo) in enumerate(self._muestra(local, random.randint(5, 40)), start=1):
+                    cant = random.choice((6, 12, 24, 48, 120))
+                    detalles.append((compra_id, renglon, producto_id, cant, costo, 0, 0, cant * costo))
+                    subtotal += cant * costo
+                cargador.agregar(Compra, (compra_id, local["id"], fecha, random.choice(local["proveedores"]),
+                                          subtotal, 0, 0, subtotal, estado(), fecha, fecha))
+                for detalle in detalles:
+                    cargador.agregar(CompraDetalle, detalle)
+                compra_id += 1
+                hechas += 1
+                self._progreso("compras", hechas, total, t0)
+        cargador.volcar()
+
+    def _terminar(self, locales):
+        with connection.cursor() as cursor:
+            # las secuencias de id tienen que seguir después de los ids explícitos
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Venta, Compra]):
+                cursor.execute(sql)
+            if connection.vendor == "postgresql":
+                # estadísticas frescas para el planner después de la carga masiva
+                for model in (Producto, Venta, VentaDetalle, Compra, CompraDetalle):
+                    cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+        # bulk_create no dispara señales: caches y listas de precios a mano
+        invalidar_locales_activos()
+        for local in locales:
+            construir_lista_precios(local["id"])
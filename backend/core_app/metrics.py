@@ -0,0 +1,197 @@
+# core_app/metrics.py
+"""
+Métricas de performance por request.
+
+MetricasMiddleware mide cada request: cantidad de queries, tiempo en la base,
+tiempo de render (JSON) y tiempo total. Lo devuelve en el header Server-Timing
+(se ve en la pestaña Network del navegador) y lo acumula en histogramas
+Prometheus por vista y local, que se leen en /api/metrics.
+
+Con varios workers de gunicorn cada proceso escribe sus valores en archivos de
+PROMETHEUS_MULTIPROC_DIR (lo define gunicorn.conf.py) y /api/metrics suma los
+de todos; sin esa variable (runserver, tests) se usa el registro del proceso.
+"""
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+ETIQUETAS = ("view", "local", "method", "status")
+METODOS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+DURACION = Histogram(
+    "api_request_duration_seconds", "Tiempo total del request", ETIQUETAS,
+)
+DURACION_DB = Histogram(
+    "api_request_db_seconds", "Tiempo en la base por request", ETIQUETAS,
+)
+QUERIES = Histogram(
+    "api_request_db_queries", "Queries por request", ETIQUETAS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+DURACION_RENDER = Histogram(
+    "api_request_render_seconds", "Tiempo de render de la respuesta por request", ETIQUETAS,
+)
+
+
+class Medicion:
+    __slots__ = ("request", "queries", "db", "render")
+
+    def __init__(self, request=None):
+        self.request = request
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+
+
+# la medición del request en curso; sync_to_async copia el contexto, así que
+# también la ven las queries de las vistas async (corren en otro thread)
+_medicion = ContextVar("medicion_request", default=None)
+
+
+def medir_query(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.queries += 1
+        medicion.db += time.perf_counter() - inicio
+
+
+def instrumentar_conexion(connection):
+    # al principio de la lista: connection.execute_wrapper() hace pop() del último
+    if medir_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, medir_query)
+
+
+@contextmanager
+def medir_render():
+    medicion = _medicion.get()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if medicion is not None:
+            medicion.render += time.perf_counter() - inicio
+
+
+# ids de los locales activos, por proceso: el middleware no va a la base ni a la
+# cache en cada request. Un local nuevo aparece a lo sumo LOCALES_ACTIVOS_TTL después
+_locales = {"ids": frozenset(), "vence": 0.0}
+
+
+def locales_validos():
+    """Ids (str) de los locales que pueden ir en la etiqueta `local`; lo precalienta warmup."""
+    ahora = time.monotonic()
+    if ahora >= _locales["vence"]:
+        from .services import locales_activos
+
+        _locales["ids"] = frozenset(str(local["id"]) for local in locales_activos())
+        _locales["vence"] = ahora + settings.LOCALES_ACTIVOS_TTL
+    return _locales["ids"]
+
+
+def _local(request, match):
+    """El X-Local-ID sólo si el usuario se autenticó, la vista existe y el local
+    está activo: si no, cualquiera inflaría las series con ids inventados."""
+    local = request.headers.get("X-Local-ID", "")
+    if not local or match is None:
+        return ""
+    user = getattr(request, "user", None)  # DRF lo deja en el HttpRequest al autenticar
+    if not (user and user.is_authenticated):
+        return ""
+    return local if local in locales_validos() else ""
+
+
+def _etiquetas(request, response):
+    match = request.resolver_match
+    local = _local(request, match)
+    return (
+        match.view_name if match else "sin_ruta",
+        local,
+        request.method if request.method in METODOS else "OTRO",
+        str(response.status_code),
+    )
+
+
+class MetricasMiddleware:
+    """Va primero en MIDDLEWARE: el total incluye al resto de los middlewares."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        medicion = Medicion(request)
+        token = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self._registrar(request, response, medicion, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        medicion = Medicion(request)
+        token = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self._registrar(request, response, medicion, time.perf_counter() - inicio)
+
+    def _registrar(self, request, response, medicion, total):
+        etiquetas = _etiquetas(request, response)
+        DURACION.labels(*etiquetas).observe(total)
+        DURACION_DB.labels(*etiquetas).observe(medicion.db)
+        QUERIES.labels(*etiquetas).observe(medicion.queries)
+        DURACION_RENDER.labels(*etiquetas).observe(medicion.render)
+
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={medicion.db * 1000:.1f};desc="{medicion.queries} queries", '
+                f"render;dur={medicion.render * 1000:.1f}, "
+                f"total;dur={total * 1000:.1f}"
+            )
+        return response
+
+
+def metrics(request):
+    """Formato texto de Prometheus. Pide `Authorization: Bearer <METRICS_TOKEN>`;
+    sin METRICS_TOKEN configurado no se sirve a nadie."""
+    token = settings.METRICS_TOKEN
+    if not token or not secrets.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
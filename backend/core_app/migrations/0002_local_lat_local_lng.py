@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='local',
+            name='lat',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='local',
+            name='lng',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
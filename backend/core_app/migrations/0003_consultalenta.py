@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0002_local_lat_local_lng'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultaLenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('huella', models.CharField(max_length=16, unique=True)),
+                ('sql', models.TextField()),
+                ('base', models.CharField(max_length=50)),
+                ('veces', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('vista', models.CharField(blank=True, max_length=200)),
+                ('ejemplo', models.TextField(blank=True)),
+                ('plan', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Query lenta',
+                'verbose_name_plural': 'Queries lentas',
+            },
+        ),
+    ]
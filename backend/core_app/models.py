@@ -5,9 +5,39 @@ class Local(models.Model):
     nombre = models.CharField(max_length=255, unique=True)
     cuit = models.CharField(max_length=20, blank=True, null=True)
     direccion = models.CharField(max_length=255, blank=True, null=True)
+    # ubicación del local (para buscar clientes cercanos / reparto)
+    lat = models.FloatField(blank=True, null=True)
+    lng = models.FloatField(blank=True, null=True)
     activo = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nombre
+
+
+class ConsultaLenta(models.Model):
+    """
+    Queries lentas acumuladas por huella (el SQL normalizado).
+    Las escribe core_app/consultas_lentas.py; se leen con `manage.py consultas_lentas`.
+    """
+    huella = models.CharField(max_length=16, unique=True)
+    sql = models.TextField()
+    base = models.CharField(max_length=50)
+    veces = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    # de la ejecución más lenta: qué vista la hizo y el SQL con sus parámetros
+    # (sólo tipo y largo, salvo CONSULTAS_LENTAS_PARAMS)
+    vista = models.CharField(max_length=200, blank=True)
+    ejemplo = models.TextField(blank=True)
+    plan = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Query lenta"
+        verbose_name_plural = "Queries lentas"
+
+    def __str__(self):
+        return f"{self.huella} ({self.veces} veces, {self.total_ms:.0f} ms)"
@@ -0,0 +1,80 @@
+# core_app/operations.py
+"""
+Operaciones de migración propias.
+
+AddIndexConcurrently de django.contrib.postgres sólo anda en Postgres (y
+obliga a tener psycopg instalado para importarlo). Los tests y el desarrollo
+local corren en SQLite, así que usamos esta variante: en Postgres crea el
+índice con CREATE INDEX CONCURRENTLY (sin bloquear escrituras sobre tablas
+grandes) y en el resto de las bases hace un AddIndex común.
+
+RemoveFieldIndexConcurrently hace lo mismo para sacar el índice propio de un
+campo (FK que pasa a db_index=False): DROP INDEX CONCURRENTLY en Postgres.
+
+La migración que las use tiene que declarar `atomic = False`.
+"""
+from django.db import migrations
+from django.db.models import Index
+
+
+def _concurrente(schema_editor):
+    return schema_editor.connection.vendor == "postgresql"
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """AddIndex que en Postgres usa CREATE/DROP INDEX CONCURRENTLY."""
+
+    def describe(self):
+        return "Concurrently create index %s on model %s" % (self.index.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not _concurrente(schema_editor):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not _concurrente(schema_editor):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class RemoveFieldIndexConcurrently(migrations.AlterField):
+    """
+    AlterField que sólo pasa un campo a db_index=False. En Postgres borra el
+    índice con DROP INDEX CONCURRENTLY (y lo recrea igual al volver atrás); el
+    AlterField común lo haría con un DROP INDEX que bloquea la tabla.
+    """
+
+    def describe(self):
+        return "Concurrently remove index of field %s on %s" % (self.name, self.model_name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not _concurrente(schema_editor):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        campo = model._meta.get_field(self.name)
+        # como BaseDatabaseSchemaEditor._alter_field: el índice btree del campo,
+        # no los de Meta.indexes
+        nombres = schema_editor._constraint_names(
+            model,
+            [campo.column],
+            index=True,
+            type_=Index.suffix,
+            exclude={index.name for index in model._meta.indexes},
+        )
+        for nombre in nombres:
+            schema_editor.execute(schema_editor._delete_index_sql(model, nombre, concurrently=True))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not _concurrente(schema_editor):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            campo = model._meta.get_field(self.name)
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[campo], concurrently=True))
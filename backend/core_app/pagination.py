@@ -0,0 +1,182 @@
+# core_app/pagination.py
+import binascii
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan, TupleLessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+VALORES_SI = ("1", "true", "si", "sí")
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginación keyset sobre el orden `keyset_ordering` de la view, p.ej.
+    ("-fecha", "-id"). El cursor lleva los valores de la última fila y la página
+    siguiente es `WHERE (fecha, id) < (%s, %s) ORDER BY fecha DESC, id DESC LIMIT n`:
+    con un índice en ese orden no hay COUNT(*) ni OFFSET, y la página 10.000
+    cuesta lo mismo que la primera aunque muchas filas compartan la fecha.
+
+    El orden tiene que terminar en un campo único (id), ir todo en el mismo
+    sentido y no tener NULLs: la comparación de filas no los admite.
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        # ignoramos ?ordering= a propósito: el keyset tiene que ir por el índice
+        ordering = tuple(getattr(view, "keyset_ordering", None) or ("-id",))
+        descendente = ordering[0].startswith("-")
+        assert all(campo.startswith("-") == descendente for campo in ordering), (
+            "keyset_ordering tiene que ir todo en el mismo sentido"
+        )
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.campos = [campo.lstrip("-") for campo in self.ordering]
+        self.cursor = self.decode_cursor(request)
+        hacia_atras = self.cursor is not None and self.cursor.reverse
+
+        descendente = self.ordering[0].startswith("-")
+        if hacia_atras:
+            descendente = not descendente
+        queryset = queryset.order_by(*(f"-{c}" if descendente else c for c in self.campos))
+        if self.cursor is not None:
+            fila = Tuple(*(F(campo) for campo in self.campos))
+            valores = self._valores(queryset.model, self.cursor.position)
+            comparacion = TupleLessThan if descendente else TupleGreaterThan
+            queryset = queryset.filter(comparacion(fila, valores))
+
+        # una fila de más para saber si hay otra página en esa dirección
+        filas = list(queryset[:self.page_size + 1])
+        hay_mas = len(filas) > self.page_size
+        self.page = filas[:self.page_size]
+        if hacia_atras:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, hay_mas
+        else:
+            self.has_next, self.has_previous = hay_mas, self.cursor is not None
+        return self.page
+
+    def _valores(self, model, crudos):
+        try:
+            return [model._meta.get_field(campo).to_python(valor) for campo, valor in zip(self.campos, crudos)]
+        except (FieldDoesNotExist, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _posicion(self, fila):
+        if isinstance(fila, dict):
+            return [str(fila[campo]) for campo in self.campos]
+        return [str(getattr(fila, campo)) for campo in self.campos]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        posicion = self._posicion(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=posicion))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        posicion = self._posicion(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=posicion))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:  # ?cursor= vacío: primera página, como en CursorPagination
+            return None
+        try:
+            datos = json.loads(b64decode(encoded.encode("ascii"), validate=True))
+            posicion = [str(valor) for valor in datos["p"]]
+            reverse = bool(datos.get("r"))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if len(posicion) != len(self.campos):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=posicion)
+
+    def encode_cursor(self, cursor):
+        datos = {"p": cursor.position}
+        if cursor.reverse:
+            datos["r"] = 1
+        encoded = b64encode(json.dumps(datos, separators=(",", ":")).encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class HistorialPagination(KeysetPagination):
+    """Keyset de los historiales: páginas más largas; el front pide el `next` con «Ver más»."""
+    page_size = 100
+
+
+class ListadoPagination(PageNumberPagination):
+    """
+    Paginación de los listados grandes (ventas, compras, productos).
+
+    - por defecto: page/count como siempre (el frontend usa `count`)
+    - ?sin_count=1: paginado por página pero sin el COUNT(*)
+    - ?paginacion=cursor (o ?cursor=...): keyset, ver KeysetPagination
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        self.sin_count = False
+
+        params = request.query_params
+        if params.get("paginacion") == "cursor" or "cursor" in params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if params.get("sin_count", "").lower() in VALORES_SI:
+            return self._paginate_sin_count(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def _paginate_sin_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        try:
+            numero = max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except ValueError:
+            numero = 1
+
+        # pedimos una fila de más para saber si hay página siguiente
+        offset = (numero - 1) * page_size
+        filas = list(queryset[offset:offset + page_size + 1])
+
+        self.sin_count = True
+        self.request = request
+        self.numero = numero
+        self.hay_siguiente = len(filas) > page_size
+        return filas[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.sin_count:
+            return Response({
+                "next": self._link_sin_count(self.numero + 1) if self.hay_siguiente else None,
+                "previous": self._link_sin_count(self.numero - 1) if self.numero > 1 else None,
+                "results": data,
+            })
+        return super().get_paginated_response(data)
+
+    def _link_sin_count(self, numero):
+        url = self.request.build_absolute_uri()
+        if numero == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, numero)
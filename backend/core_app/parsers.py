@@ -0,0 +1,20 @@
+# core_app/parsers.py
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+
+class JSONParser(parsers.JSONParser):
+    """JSONParser de DRF con orjson (como el de DRF en modo estricto: sin NaN ni Infinity)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            contenido = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                contenido = contenido.decode(encoding)
+            return orjson.loads(contenido)
+        except ValueError as exc:  # orjson.JSONDecodeError y UnicodeDecodeError
+            raise ParseError(f"JSON parse error - {exc}")
@@ -1,21 +1,61 @@
 # core_app/permissions.py
 
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework import permissions
 
+
+def _cache_key_grupos(user_id):
+    return f"core_app:grupos:{user_id}"
+
+
+def invalidar_grupos_cache(user_id):
+    cache.delete(_cache_key_grupos(user_id))
+
+
+def grupos_del_usuario(request):
+    """
+    Grupos del usuario autenticado, sin ir a la base en cada request.
+
+    1. claim 'groups' del JWT ya validado (lo pone MyTokenObtainPairSerializer).
+       Un cambio de grupos se refleja en la próxima renovación del access
+       (MyTokenRefreshSerializer relee los grupos): como mucho
+       ACCESS_TOKEN_LIFETIME (60 min).
+    2. si el token no lo trae (tokens viejos, force_authenticate en tests, otra
+       autenticación): cache por usuario con TTL corto (PERMISOS_GRUPOS_TTL).
+    """
+    user = request.user
+    if not (user and user.is_authenticated):
+        return frozenset()
+
+    token = request.auth
+    if token is not None and hasattr(token, "get"):
+        grupos = token.get("groups")
+        if grupos is not None:
+            return frozenset(grupos)
+
+    key = _cache_key_grupos(user.pk)
+    grupos = cache.get(key)
+    if grupos is None:
+        grupos = list(user.groups.values_list("name", flat=True))
+        cache.set(key, grupos, settings.PERMISOS_GRUPOS_TTL)
+    return frozenset(grupos)
+
+
 class IsAdminUser(permissions.BasePermission):
     """
     Permiso personalizado para permitir el acceso solo a usuarios del grupo 'Admin'.
     """
     def has_permission(self, request, view):
         # El usuario debe estar autenticado y pertenecer al grupo 'Admin'.
-        return request.user and request.user.is_authenticated and request.user.groups.filter(name='Admin').exists()
+        return "Admin" in grupos_del_usuario(request)
 
 class IsCajeroUser(permissions.BasePermission):
     """
     Permiso personalizado para permitir el acceso solo a usuarios del grupo 'Cajero'.
     """
     def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated and request.user.groups.filter(name='Cajero').exists()
+        return "Cajero" in grupos_del_usuario(request)
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
@@ -25,7 +65,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         # Si el método es seguro (lectura), se permite a cualquier usuario autenticado.
         if request.method in permissions.SAFE_METHODS:
-            return request.user and request.user.is_authenticated
-        
+            return bool(request.user and request.user.is_authenticated)
+
         # Si el método no es seguro (escritura), solo se permite si es Admin.
-        return request.user and request.user.is_authenticated and request.user.groups.filter(name='Admin').exists()
\ No newline at end of file
+        return "Admin" in grupos_del_usuario(request)
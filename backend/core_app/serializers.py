@@ -1,5 +1,8 @@
-from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.contrib.auth import get_user_model
+from rest_framework import exceptions, serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from .models import Local
 
 
@@ -40,3 +43,26 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['groups'] = [group.name for group in self.user.groups.all()]
 
         return data
+
+
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Renovación del access token con los grupos releídos de la base.
+    simplejwt copia los claims del refresh (vale un día); así un cambio de
+    grupos se aplica en la próxima renovación y no cuando vence el refresh.
+    """
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        access = AccessToken(data['access'])
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed("Usuario inexistente.", code="no_active_account")
+
+        access['username'] = user.username
+        access['groups'] = [group.name for group in user.groups.all()]
+        data['access'] = str(access)
+
+        return data
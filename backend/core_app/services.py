@@ -0,0 +1,26 @@
+# core_app/services.py
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Local
+from .serializers import LocalSerializer
+
+CLAVE_LOCALES_ACTIVOS = "core_app:locales_activos"
+
+
+def locales_activos():
+    """
+    Locales activos tal como los devuelve /api/core/locales/ (combo del login).
+    Cacheados: se invalidan al guardar/borrar un Local (core_app/signals.py).
+    """
+    data = cache.get(CLAVE_LOCALES_ACTIVOS)
+    if data is None:
+        data = LocalSerializer(
+            Local.objects.filter(activo=True).order_by("nombre"), many=True
+        ).data
+        cache.set(CLAVE_LOCALES_ACTIVOS, data, settings.LOCALES_ACTIVOS_TTL)
+    return data
+
+
+def invalidar_locales_activos():
+    cache.delete(CLAVE_LOCALES_ACTIVOS)
@@ -0,0 +1,40 @@
+# core_app/signals.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import consultas_lentas, metrics
+from .models import Local
+from .permissions import invalidar_grupos_cache
+from .services import invalidar_locales_activos
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidar_grupos_del_usuario(sender, instance, action, reverse, pk_set, **kwargs):
+    """Cambio de grupos: el fallback cacheado de permisos no puede quedar viejo."""
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidar_grupos_cache(instance.pk)
+    else:
+        # group.user_set.add(...): instance es el Group
+        ids = pk_set if pk_set is not None else instance.user_set.values_list("pk", flat=True)
+        for user_id in ids:
+            invalidar_grupos_cache(user_id)
+
+
+@receiver([post_save, post_delete], sender=Local)
+def invalidar_cache_locales(sender, instance, **kwargs):
+    transaction.on_commit(invalidar_locales_activos)
+
+
+@receiver(connection_created)
+def medir_queries_de_la_conexion(sender, connection, **kwargs):
+    """
+    Cada conexión nueva cuenta sus queries en la medición del request (Server-Timing)
+    y, con CONSULTAS_LENTAS_MS, captura las que pasan el umbral.
+    """
+    metrics.instrumentar_conexion(connection)
+    consultas_lentas.instrumentar_conexion(connection)
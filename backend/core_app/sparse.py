@@ -0,0 +1,116 @@
+# core_app/sparse.py
+"""
+Sparse fieldsets y expansión opcional para la API.
+
+    ?fields=id,fecha,total   -> sólo esos campos
+    ?expand=detalles         -> incluye los anidados listados en Meta.expandable_fields
+
+En los listados los anidados vienen sólo si se piden (?expand= o en ?fields=);
+en el detalle (retrieve) vienen por defecto, como antes.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer
+
+
+def _csv(value):
+    return {x.strip() for x in (value or "").split(",") if x.strip()}
+
+
+class SparseFieldsMixin:
+    """Mixin de serializer: recorta campos según context["fields"] / context["expand"]."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        fields = self.context.get("fields")
+        expand = self.context.get("expand")
+
+        # sin expand en el context (p.ej. respuestas de confirmar/anular) -> todo
+        if expand is not None:
+            for name in getattr(self.Meta, "expandable_fields", ()):
+                if name not in expand:
+                    self.fields.pop(name, None)
+
+        if fields:
+            for name in list(self.fields):
+                if name not in fields and name not in (expand or ()):
+                    self.fields.pop(name)
+
+
+class SparseFieldsViewMixin:
+    """
+    Mixin de viewset: pasa ?fields / ?expand al serializer y arma el queryset
+    en consecuencia (only() con los campos pedidos, prefetch sólo si se expande).
+
+    `expandable` mapea cada campo expandible a sus prefetch_related.
+    """
+    expandable = {}
+
+    def _sparse_params(self):
+        params = self.request.query_params
+        fields = _csv(params.get("fields"))
+        expand = _csv(params.get("expand")) & set(self.expandable)
+        if fields:
+            # pedir un anidado en ?fields= también lo expande
+            expand |= fields & set(self.expandable)
+        elif self.action == "retrieve":
+            expand |= set(self.expandable)
+        return fields, expand
+
+    def _es_lectura(self):
+        return getattr(self, "request", None) is not None and self.request.method in SAFE_METHODS
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self._es_lectura():
+            context["fields"], context["expand"] = self._sparse_params()
+        return context
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if not self._es_lectura():
+            return qs
+
+        fields, expand = self._sparse_params()
+
+        qs = qs.prefetch_related(None)
+        for name in expand:
+            qs = qs.prefetch_related(*self.expandable[name])
+
+        if fields:
+            only, related = self._only_para(qs.model)
+            if only is not None:
+                qs = qs.select_related(None).select_related(*related).only(*only)
+        return qs
+
+    def _only_para(self, model):
+        """
+        Traduce los campos que quedaron en el serializer a columnas para only().
+        Si algún campo no se puede mapear (source='*', properties, etc.)
+        devolvemos None y no recortamos nada.
+        """
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        only, related = {model._meta.pk.name}, set()
+
+        for field in serializer.fields.values():
+            if field.write_only or isinstance(field, BaseSerializer):
+                continue  # los anidados van por prefetch
+            if field.source == "*":
+                return None, None
+
+            partes = field.source.split(".")
+            try:
+                model_field = model._meta.get_field(partes[0])
+            except FieldDoesNotExist:
+                return None, None
+
+            if len(partes) == 1 and not (model_field.one_to_many or model_field.many_to_many):
+                only.add(partes[0])
+            elif len(partes) == 2 and (model_field.many_to_one or model_field.one_to_one):
+                related.add(partes[0])
+                only.add(f"{partes[0]}__{partes[1]}")
+            else:
+                return None, None
+
+        return only, related
@@ -1,6 +1,8 @@
 from rest_framework import viewsets, permissions
+from rest_framework.response import Response
 from .models import Local
 from .serializers import LocalSerializer
+from .services import locales_activos
 
 
 class LocalViewSet(viewsets.ReadOnlyModelViewSet):
@@ -17,3 +19,7 @@ class LocalViewSet(viewsets.ReadOnlyModelViewSet):
         # mostrame sólo locales activos ordenados por nombre
         # Ajustá el campo 'activo' si tu modelo lo llama distinto.
         return Local.objects.filter(activo=True).order_by('nombre')
+
+    def list(self, request, *args, **kwargs):
+        # se pide en cada pantalla de login: sale de cache (core_app/services.py)
+        return Response(locales_activos())
@@ -0,0 +1,91 @@
+# core_app/warmup.py
+"""
+Precalentamiento para gunicorn (ver gunicorn.conf.py).
+
+- precalentar_proceso(): en el master, antes de forkear (when_ready). Importa
+  los módulos pesados y arma los resolvers de URLs una sola vez: con
+  preload_app los workers lo heredan ya hecho. Al terminar cierra también los
+  pools de conexiones (DB_POOL=1): sus sockets y sus threads no sobreviven al fork.
+- precalentar_caches(): en cada worker recién forkeado (post_fork), así también
+  los workers que se reciclan por max_requests arrancan con las caches llenas.
+
+Si algo falla se loguea y el server arranca igual: es sólo una optimización.
+"""
+import importlib
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# sólo lo que se usa al atender requests: reportlab/qrcode (ticket PDF) siguen
+# siendo imports perezosos hasta que el ticket deje de ser un stub
+MODULOS_PESADOS = (
+    "rest_framework.serializers",
+    "drf_spectacular.openapi",
+    "numpy",
+)
+
+
+def _preparar_django():
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        import django
+        django.setup()
+
+
+def precalentar_proceso():
+    t0 = time.perf_counter()
+    try:
+        _preparar_django()
+        for modulo in MODULOS_PESADOS:
+            importlib.import_module(modulo)
+
+        from django.urls import get_resolver
+        # fuerza el import de todas las vistas y compila los patrones
+        get_resolver()._populate()
+
+        # la lista de precios vive en disco: la publicamos si no existe
+        from catalogo.lista_precios import leer_etag, construir_lista_precios
+        from core_app.models import Local
+        for local_id in Local.objects.filter(activo=True).values_list("id", flat=True):
+            if leer_etag(local_id) is None:
+                construir_lista_precios(local_id)
+    except Exception:
+        logger.exception("Falló el precalentamiento del proceso")
+    finally:
+        _cerrar_conexiones(pools=True)
+    logger.info("Proceso precalentado en %.0f ms", (time.perf_counter() - t0) * 1000)
+
+
+def precalentar_caches():
+    t0 = time.perf_counter()
+    try:
+        _preparar_django()
+        from catalogo.lista_precios import leer_lista_precios
+        from catalogo.services import resumen_categorias
+        from core_app.metrics import locales_validos
+        from core_app.services import locales_activos
+
+        locales_validos()  # la etiqueta `local` de las métricas
+        for local in locales_activos():
+            resumen_categorias(local["id"])
+            leer_lista_precios(local["id"])  # deja el archivo en el page cache
+    except Exception:
+        logger.exception("Falló el precalentamiento de caches")
+    finally:
+        _cerrar_conexiones()
+    logger.info("Caches precalentadas en %.0f ms", (time.perf_counter() - t0) * 1000)
+
+
+def _cerrar_conexiones(pools=False):
+    # las conexiones abiertas acá no se pueden compartir entre procesos (fork)
+    # ni sirven a los threads que atienden requests. Con pool, close() sólo
+    # devuelve la conexión: antes de forkear hay que cerrar el pool entero
+    from django.db import connections
+    for conexion in connections.all(initialized_only=True):
+        conexion.close()
+        if pools and hasattr(conexion, "close_pool"):
+            conexion.close_pool()
@@ -1,11 +1,57 @@
 # backend/gunicorn.conf.py
 import os
+import shutil
 
 bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 workers = int(os.getenv("WEB_CONCURRENCY", "3"))
+# ASGI (core.asgi:application): las vistas sync corren en threads del executor.
+# Con "sync" vuelve a ser WSGI (y hay que arrancar core.wsgi:application).
+# core/settings.py lee esta misma variable: bajo ASGI el default es DB_POOL=1 y nunca
+# hay conexiones persistentes (con threads se acumularían una por thread).
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+# con DB_POOL=1 cada worker abre su propio pool (core/settings.py):
+# workers × DB_POOL_MAX_SIZE conexiones como máximo contra Postgres
 timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
 keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
 
 accesslog = "-"
 errorlog = "-"
 loglevel = os.getenv("LOG_LEVEL", "info")
+
+# Cargamos Django una sola vez en el master y los workers lo heredan al forkear
+# (menos memoria y arranque más rápido). GUNICORN_PRELOAD=0 para desactivarlo,
+# p.ej. si se quiere recargar código con HUP.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# reciclado de workers (fugas de memoria); el jitter evita que se reinicien todos juntos
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+# métricas Prometheus compartidas entre workers (core_app/metrics.py): cada proceso
+# escribe en este directorio y /api/metrics suma todos. Tiene que existir antes de
+# cargar la app (con preload_app se carga acá, en el master) y arrancar vacío.
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def when_ready(server):
+    # master, antes de forkear: imports pesados, resolvers de URLs, listas de precios
+    from core_app.warmup import precalentar_proceso
+
+    server.log.info("Precalentando proceso...")
+    precalentar_proceso()
+
+
+def post_fork(server, worker):
+    # cada worker nuevo (también los reciclados): caches calientes antes de atender
+    from core_app.warmup import precalentar_caches
+
+    precalentar_caches()
+
+
+def child_exit(server, worker):
+    # worker que murió o se recicló (max_requests): sus archivos dejan de contar como vivos
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
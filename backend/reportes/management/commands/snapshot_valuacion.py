@@ -0,0 +1,39 @@
+# reportes/management/commands/snapshot_valuacion.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core_app.models import Local
+from reportes.services import guardar_snapshot_valuacion
+
+
+class Command(BaseCommand):
+    help = (
+        "Guarda la valuación del inventario (stock × costo promedio) por categoría y marca. "
+        "Pensado para correr por cron a fin de mes: "
+        "`python manage.py snapshot_valuacion`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fecha", help="Fecha de la foto (YYYY-MM-DD). Por defecto hoy.")
+        parser.add_argument(
+            "--local", type=int, action="append", dest="locales",
+            help="ID de local (repetible). Por defecto todos los activos.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            fecha = date.fromisoformat(options["fecha"]) if options["fecha"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--fecha tiene que ser YYYY-MM-DD")
+
+        locales = options["locales"] or list(
+            Local.objects.filter(activo=True).values_list("id", flat=True)
+        )
+
+        for local_id in locales:
+            filas = guardar_snapshot_valuacion(local_id, fecha)
+            self.stdout.write(f"Local {local_id}: {filas} filas de valuación al {fecha}")
+
+        self.stdout.write(self.style.SUCCESS("Snapshot de valuación listo."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core_app', '0002_local_lat_local_lng'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValuacionInventario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('categoria_id', models.BigIntegerField(blank=True, null=True)),
+                ('categoria_nombre', models.CharField(blank=True, max_length=100, null=True)),
+                ('marca', models.CharField(blank=True, max_length=100, null=True)),
+                ('productos', models.PositiveIntegerField(default=0)),
+                ('unidades', models.DecimalField(decimal_places=4, default=0, max_digits=18)),
+                ('valor', models.DecimalField(decimal_places=4, default=0, max_digits=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('local', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='valuaciones_inventario', to='core_app.local')),
+            ],
+            options={
+                'verbose_name': 'Valuación de inventario',
+                'verbose_name_plural': 'Valuaciones de inventario',
+                'indexes': [models.Index(fields=['local', 'fecha'], name='reportes_valuacion_local_idx')],
+            },
+        ),
+    ]
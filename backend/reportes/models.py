@@ -0,0 +1,31 @@
+# reportes/models.py
+from django.db import models
+from core_app.models import Local
+
+
+class ValuacionInventario(models.Model):
+    """
+    Foto de la valuación del inventario (stock_actual × precio_compra_prom)
+    de un local en una fecha, agrupada por categoría y marca.
+    La escribe `manage.py snapshot_valuacion` (p.ej. por cron a fin de mes).
+    """
+    local = models.ForeignKey(Local, on_delete=models.CASCADE, related_name="valuaciones_inventario")
+    fecha = models.DateField()
+    # guardamos el nombre: la categoría puede renombrarse o borrarse después
+    categoria_id = models.BigIntegerField(null=True, blank=True)
+    categoria_nombre = models.CharField(max_length=100, blank=True, null=True)
+    marca = models.CharField(max_length=100, blank=True, null=True)
+    productos = models.PositiveIntegerField(default=0)
+    unidades = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+    valor = models.DecimalField(max_digits=20, decimal_places=4, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Valuación de inventario"
+        verbose_name_plural = "Valuaciones de inventario"
+        indexes = [
+            models.Index(fields=["local", "fecha"], name="reportes_valuacion_local_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.local_id} {self.fecha} {self.categoria_nombre or '-'} / {self.marca or '-'}: {self.valor}"
@@ -0,0 +1,78 @@
+# reportes/services.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+from catalogo.models import Producto
+from .models import ValuacionInventario
+
+CENTAVOS = Decimal("0.01")
+
+
+def valuacion_actual(local_id: int):
+    """
+    Valuación del stock actual del local agrupada por categoría y marca,
+    calculada en la base (una sola query agrupada).
+    Devuelve filas dict: categoria_id, categoria_nombre, marca, productos, unidades, valor.
+    """
+    filas = (
+        Producto.objects
+        .filter(local_id=local_id)
+        .values("categoria_id", "categoria__nombre", "marca")
+        .annotate(
+            productos=Count("id"),
+            unidades=Sum("stock_actual"),
+            valor=Sum(ExpressionWrapper(
+                F("stock_actual") * F("precio_compra_prom"),
+                output_field=DecimalField(max_digits=28, decimal_places=8),
+            )),
+        )
+        .order_by("categoria__nombre", "marca")
+    )
+    return [
+        {
+            "categoria_id": f["categoria_id"],
+            "categoria_nombre": f["categoria__nombre"],
+            "marca": f["marca"],
+            "productos": f["productos"],
+            "unidades": f["unidades"] or Decimal("0"),
+            "valor": f["valor"] or Decimal("0"),
+        }
+        for f in filas
+    ]
+
+
+@transaction.atomic
+def guardar_snapshot_valuacion(local_id: int, fecha):
+    """
+    Guarda (o pisa) la foto de la valuación del local para `fecha`.
+    Devuelve la cantidad de filas escritas.
+    """
+    filas = valuacion_actual(local_id)
+    ValuacionInventario.objects.filter(local_id=local_id, fecha=fecha).delete()
+    ValuacionInventario.objects.bulk_create(
+        ValuacionInventario(local_id=local_id, fecha=fecha, **fila) for fila in filas
+    )
+    return len(filas)
+
+
+def snapshot_valuacion(local_id: int, fecha):
+    """Última foto del local con fecha <= `fecha` (o None si no hay)."""
+    ultima = (
+        ValuacionInventario.objects
+        .filter(local_id=local_id, fecha__lte=fecha)
+        .order_by("-fecha")
+        .values_list("fecha", flat=True)
+        .first()
+    )
+    if ultima is None:
+        return None, []
+
+    filas = (
+        ValuacionInventario.objects
+        .filter(local_id=local_id, fecha=ultima)
+        .order_by("categoria_nombre", "marca")
+        .values("categoria_id", "categoria_nombre", "marca", "productos", "unidades", "valor")
+    )
+    return ultima, list(filas)
@@ -1,8 +1,9 @@
 # reportes/urls.py
 from django.urls import path
-from .views import ResumenFinancieroView, TopProductosView
+from .views import ResumenFinancieroView, TopProductosView, ValuacionInventarioView
 
 urlpatterns = [
     path("financieros/", ResumenFinancieroView.as_view(), name="resumen-financiero"),
     path("top-productos/", TopProductosView.as_view(), name="top-productos"),
+    path("valuacion-inventario/", ValuacionInventarioView.as_view(), name="valuacion-inventario"),
 ]
@@ -1,7 +1,12 @@
 # reportes/views.py
+import asyncio
 from datetime import datetime
 from decimal import Decimal
-from django.db.models import Sum, F
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Count, Sum, F
+from django.utils import timezone
 from django.utils.timezone import make_aware
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -10,6 +15,9 @@ from rest_framework.permissions import IsAuthenticated
 from ventas.models import Venta, VentaDetalle
 from compras.models import Compra
 from catalogo.models import Producto
+from core_app.db_router import LecturaEnReplicaMixin
+from core_app.permissions import IsAdminUser
+from .services import CENTAVOS, snapshot_valuacion, valuacion_actual
 
 
 def _parse_date(param_name, request, default=None, end_of_day=False):
@@ -34,10 +42,47 @@ def _parse_date(param_name, request, default=None, end_of_day=False):
         dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
 
     # importante: hacer aware para comparar con DateTimeField
+    # (el default de "desde" es "hasta", que ya viene aware)
+    if timezone.is_aware(dt):
+        return dt
     return make_aware(dt)
 
 
-class ResumenFinancieroView(APIView):
+def _total_y_cantidad(qs):
+    r = qs.aggregate(total=Sum("total"), cantidad=Count("id"))
+    return r["total"] or Decimal("0"), r["cantidad"]
+
+
+def _total_y_cantidad_en_su_conexion(qs):
+    # corre en un thread del executor: Django le abre una conexión propia que el
+    # request_finished no ve, así que se cierra (o vuelve al pool) acá
+    try:
+        return _total_y_cantidad(qs)
+    finally:
+        for conexion in connections.all(initialized_only=True):
+            conexion.close()
+
+
+def _hay_transaccion():
+    return any(conexion.in_atomic_block for conexion in connections.all(initialized_only=True))
+
+
+async def _totales_y_cantidades(*querysets):
+    """
+    (total, cantidad) de cada queryset, en paralelo: cada uno en su thread y con su
+    conexión. El ORM async (aaggregate) los haría de a uno, en el thread del request.
+    Con una transacción abierta (tests, ATOMIC_REQUESTS) otra conexión no vería lo
+    escrito en ella: ahí van en serie por la del request.
+    """
+    if await sync_to_async(_hay_transaccion)():
+        return [await sync_to_async(_total_y_cantidad)(qs) for qs in querysets]
+    return await asyncio.gather(*(
+        sync_to_async(_total_y_cantidad_en_su_conexion, thread_sensitive=False)(qs)
+        for qs in querysets
+    ))
+
+
+class ResumenFinancieroView(LecturaEnReplicaMixin, AsyncAPIView):
     """
     GET /api/reportes/financieros/?desde=YYYY-MM-DD&hasta=YYYY-MM-DD
 
@@ -51,12 +96,14 @@ class ResumenFinancieroView(APIView):
       "cantidad_ventas": 12,
       "cantidad_compras": 4
     }
+
+    Vista async (adrf): los agregados de ventas y compras van en paralelo, cada
+    uno por su conexión (_totales_y_cantidades), y el worker ASGI sigue
+    atendiendo otros requests mientras la base responde.
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = request.user
-
+    async def get(self, request):
         # por ahora usamos local_id fijo 1 como en el resto del sistema
         local_id = request.headers.get("X-Local-ID", "1")
 
@@ -64,25 +111,21 @@ class ResumenFinancieroView(APIView):
         hasta_dt = _parse_date("hasta", request, default=datetime.utcnow(), end_of_day=True)
         desde_dt = _parse_date("desde", request, default=hasta_dt, end_of_day=False)
 
-        # --- Ventas confirmadas en rango ---
+        # --- Ventas y compras confirmadas en rango: total y cantidad en una query cada una ---
         ventas_qs = Venta.objects.filter(
             local_id=local_id,
             estado="confirmada",
             fecha__range=[desde_dt, hasta_dt],
         )
-
-        ventas_total = ventas_qs.aggregate(s=Sum("total"))["s"] or Decimal("0")
-        ventas_count = ventas_qs.count()
-
-        # --- Compras confirmadas en rango ---
         compras_qs = Compra.objects.filter(
             local_id=local_id,
             estado="confirmada",
             fecha__range=[desde_dt, hasta_dt],
         )
 
-        compras_total = compras_qs.aggregate(s=Sum("total"))["s"] or Decimal("0")
-        compras_count = compras_qs.count()
+        (ventas_total, ventas_count), (compras_total, compras_count) = await _totales_y_cantidades(
+            ventas_qs, compras_qs,
+        )
 
         margen = ventas_total - compras_total
 
@@ -98,7 +141,7 @@ class ResumenFinancieroView(APIView):
         return Response(data)
 
 
-class TopProductosView(APIView):
+class TopProductosView(LecturaEnReplicaMixin, AsyncAPIView):
     """
     GET /api/reportes/top-productos/?desde=YYYY-MM-DD&hasta=YYYY-MM-DD&limit=5
 
@@ -115,8 +158,7 @@ class TopProductosView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = request.user
+    async def get(self, request):
         local_id = request.headers.get("X-Local-ID", "1")
 
         hasta_dt = _parse_date("hasta", request, default=datetime.utcnow(), end_of_day=True)
@@ -144,7 +186,7 @@ class TopProductosView(APIView):
         )
 
         data = []
-        for row in detalles_qs:
+        async for row in detalles_qs:
             data.append({
                 "producto_id": row["producto_id"],
                 "producto_nombre": row["producto__nombre"],
@@ -153,3 +195,70 @@ class TopProductosView(APIView):
             })
 
         return Response(data)
+
+
+class ValuacionInventarioView(LecturaEnReplicaMixin, APIView):
+    """
+    GET /api/reportes/valuacion-inventario/
+        -> valuación del stock actual (calculada en la base)
+    GET /api/reportes/valuacion-inventario/?fecha=YYYY-MM-DD
+        -> última foto guardada con fecha <= la pedida (manage.py snapshot_valuacion)
+
+    Devuelve:
+    {
+      "fecha": "2025-10-31",
+      "origen": "snapshot" | "actual",
+      "total": "...",
+      "por_categoria": [{"categoria": "Vinos", "valor": "..."}],
+      "items": [{"categoria": "Vinos", "marca": "Trapiche", "productos": 4,
+                 "unidades": "...", "valor": "..."}]
+    }
+    """
+    permission_classes = [IsAdminUser]  # muestra costos
+
+    def get(self, request):
+        local_id = request.headers.get("X-Local-ID", "1")
+        fecha_str = request.query_params.get("fecha")
+
+        if fecha_str:
+            try:
+                fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
+            except ValueError:
+                return Response({"fecha": "Formato YYYY-MM-DD"}, status=400)
+            fecha, filas = snapshot_valuacion(local_id, fecha)
+            if fecha is None:
+                return Response(
+                    {"detail": f"No hay valuación guardada al {fecha_str} o antes."},
+                    status=404,
+                )
+            origen = "snapshot"
+        else:
+            fecha = timezone.localdate()
+            filas = valuacion_actual(local_id)
+            origen = "actual"
+
+        total = Decimal("0")
+        por_categoria = {}
+        items = []
+        for f in filas:
+            categoria = f["categoria_nombre"] or "Sin categoría"
+            total += f["valor"]
+            por_categoria[categoria] = por_categoria.get(categoria, Decimal("0")) + f["valor"]
+            items.append({
+                "categoria": categoria,
+                "marca": f["marca"] or "",
+                "productos": f["productos"],
+                "unidades": str(f["unidades"]),
+                "valor": str(f["valor"].quantize(CENTAVOS)),
+            })
+
+        return Response({
+            "fecha": fecha.isoformat(),
+            "origen": origen,
+            "total": str(total.quantize(CENTAVOS)),
+            "por_categoria": [
+                {"categoria": c, "valor": str(v.quantize(CENTAVOS))}
+                for c, v in por_categoria.items()
+            ],
+            "items": items,
+        })
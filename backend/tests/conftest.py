@@ -1,8 +1,10 @@
 # tests/conftest.py
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from model_bakery import baker
+from core_app.metrics import locales_validos
 from core_app.models import Local
 
 
@@ -12,6 +14,22 @@ def ensure_locales(django_db_setup, django_db_blocker):
     with django_db_blocker.unblock():
         Local.objects.get_or_create(id=1, defaults={"nombre": "Local 1"})
         Local.objects.get_or_create(id=2, defaults={"nombre": "Local 2"})
+        # como el warmup de gunicorn: la etiqueta `local` de las métricas no suma queries
+        locales_validos()
+
+
+@pytest.fixture(autouse=True)
+def limpiar_cache():
+    """La cache es en memoria y sobrevive entre tests: la vaciamos en cada uno."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def listas_precios_tmp(settings, tmp_path):
+    """Las listas de precios se publican en un dir temporal."""
+    settings.LISTAS_PRECIOS_DIR = str(tmp_path / "listas_precios")
 
 
 @pytest.fixture
@@ -33,3 +51,17 @@ def auth_client(db):
     client.force_authenticate(user=user)
     client.credentials(HTTP_X_LOCAL_ID="1")
     return client
+
+
+@pytest.fixture
+def admin_client(db):
+    """Cliente autenticado con un usuario del grupo 'Admin'."""
+    from django.contrib.auth.models import Group
+
+    User = get_user_model()
+    user, _ = User.objects.get_or_create(username="admin_tester")
+    user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.credentials(HTTP_X_LOCAL_ID="1")
+    return client
@@ -0,0 +1,51 @@
+# tests/test_autenticacion_stateless.py
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalogo.models import Producto
+from core_app.serializers import MyTokenObtainPairSerializer
+from ventas.models import Venta
+
+pytestmark = pytest.mark.django_db
+
+
+def _jwt_client(token):
+    c = APIClient()
+    c.credentials(HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_X_LOCAL_ID="1")
+    return c
+
+
+@pytest.fixture
+def cajero():
+    return get_user_model().objects.create_user(username="cajero_jwt", password="x")
+
+
+def test_lectura_no_consulta_auth_user(cajero, django_assert_num_queries):
+    baker.make(Producto, local_id=1)
+    client = _jwt_client(MyTokenObtainPairSerializer.get_token(cajero).access_token)
+    with django_assert_num_queries(2) as ctx:  # count + página
+        r = client.get("/api/catalogo/productos/")
+    assert r.status_code == 200
+    assert not any("auth_user" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_crear_venta_carga_el_usuario_real(cajero):
+    p = baker.make(Producto, local_id=1, stock_actual=Decimal("10"))
+    client = _jwt_client(MyTokenObtainPairSerializer.get_token(cajero).access_token)
+
+    r = client.post(
+        "/api/ventas/",
+        {"detalles": [{"producto": p.id, "cantidad": "1", "precio_unitario": "100"}]},
+        format="json",
+    )
+    assert r.status_code == 201, r.content
+    assert Venta.objects.get(pk=r.json()["id"]).usuario_id == cajero.id
+
+
+def test_token_sin_user_id_es_401():
+    token = AccessToken()
+    assert _jwt_client(token).get("/api/catalogo/productos/").status_code == 401
@@ -0,0 +1,119 @@
+# tests/test_catalogo_sync_api.py
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from model_bakery import baker
+
+from catalogo.models import Categoria, Producto
+from catalogo.sync import decode_cursor
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/catalogo/productos/cambios/"
+
+
+@pytest.fixture(autouse=True)
+def sin_margen(settings):
+    """Los tests de paginado miden el cursor exacto; el margen se prueba aparte."""
+    settings.CATALOGO_SYNC_MARGEN = 0
+
+
+def _producto(**kwargs):
+    defaults = dict(local_id=1, precio_venta=Decimal("100"), stock_actual=Decimal("5"), activo=True)
+    defaults.update(kwargs)
+    return baker.make(Producto, **defaults)
+
+
+def test_cambios_sin_cursor_devuelve_todo_el_local(auth_client):
+    p1 = _producto(codigo="A1")
+    p2 = _producto(codigo="A2")
+    _producto(codigo="OTRO", local_id=2)
+
+    r = auth_client.get(URL)
+    assert r.status_code == 200, r.content
+    data = r.json()
+    assert [p["id"] for p in data["cambios"]] == [p1.id, p2.id]
+    assert data["eliminados"] == []
+    assert data["cursor"]
+    assert data["hay_mas"] is False
+
+
+def test_cambios_desde_cursor_trae_solo_lo_nuevo_y_tombstones(auth_client):
+    p1 = _producto(codigo="A1")
+    p2 = _producto(codigo="A2")
+    p3 = _producto(codigo="A3")
+    cursor = auth_client.get(URL).json()["cursor"]
+
+    # sin cambios: la respuesta viene vacía y con el mismo cursor
+    r = auth_client.get(URL, {"since": cursor})
+    assert r.json()["cambios"] == [] and r.json()["cursor"] == cursor
+
+    p1.precio_venta = Decimal("150")
+    p1.save()
+    p2.activo = False
+    p2.save()
+    p3_id = p3.id
+    p3.delete()
+
+    data = auth_client.get(URL, {"since": cursor}).json()
+    assert [p["id"] for p in data["cambios"]] == [p1.id]
+    assert {(e["id"], e["motivo"]) for e in data["eliminados"]} == {
+        (p2.id, "inactivo"),
+        (p3_id, "eliminado"),
+    }
+
+
+def test_cambios_pagina_con_limit(auth_client):
+    ids = [_producto(codigo=f"P{i}").id for i in range(5)]
+
+    vistos, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["since"] = cursor
+        data = auth_client.get(URL, params).json()
+        vistos += [p["id"] for p in data["cambios"]]
+        cursor = data["cursor"]
+        if not data["hay_mas"]:
+            break
+
+    assert vistos == ids
+
+
+def test_cambios_cursor_invalido_400(auth_client):
+    r = auth_client.get(URL, {"since": "no-es-un-cursor"})
+    assert r.status_code == 400
+
+
+def test_cursor_queda_atras_por_el_margen(auth_client, settings):
+    settings.CATALOGO_SYNC_MARGEN = 30
+    p1 = _producto(codigo="A1")
+    cursor = auth_client.get(URL).json()["cursor"]
+    ts, _ = decode_cursor(cursor)
+    assert ts <= timezone.now() - timedelta(seconds=29)
+
+    # una transacción que commiteó tarde, con updated_at anterior al último entregado
+    tarde = _producto(codigo="TARDE")
+    Producto.objects.filter(pk=tarde.pk).update(updated_at=p1.updated_at - timedelta(seconds=1))
+
+    data = auth_client.get(URL, {"since": cursor}).json()
+    assert tarde.id in {p["id"] for p in data["cambios"]}
+
+
+def test_renombrar_categoria_reenvia_sus_productos(auth_client):
+    categoria = baker.make(Categoria, local_id=1, nombre="Gaseosas")
+    p1 = _producto(codigo="A1", categoria=categoria)
+    _producto(codigo="A2")
+    cursor = auth_client.get(URL).json()["cursor"]
+
+    categoria.nombre = "Bebidas sin alcohol"
+    categoria.save()
+    data = auth_client.get(URL, {"since": cursor}).json()
+    assert [(p["id"], p["categoria_nombre"]) for p in data["cambios"]] == [(p1.id, "Bebidas sin alcohol")]
+
+    cursor = data["cursor"]
+    categoria.delete()
+    data = auth_client.get(URL, {"since": cursor}).json()
+    assert [(p["id"], p["categoria_nombre"]) for p in data["cambios"]] == [(p1.id, None)]
@@ -0,0 +1,51 @@
+# tests/test_categorias_resumen_api.py
+import pytest
+from decimal import Decimal
+from model_bakery import baker
+from catalogo.models import Categoria, Producto
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/catalogo/categorias/resumen/"
+
+
+def _producto(cat, **kwargs):
+    defaults = dict(local_id=1, categoria=cat, activo=True, stock_minimo=Decimal("2"))
+    defaults.update(kwargs)
+    return baker.make(Producto, **defaults)
+
+
+def test_resumen_agrega_por_categoria(auth_client, django_assert_num_queries):
+    vinos = baker.make(Categoria, local_id=1, nombre="Vinos")
+    baker.make(Categoria, local_id=1, nombre="Aguas")
+    baker.make(Categoria, local_id=2, nombre="Otro local")
+    _producto(vinos, stock_actual=Decimal("10"), precio_compra_prom=Decimal("100"), precio_venta=Decimal("150"))
+    _producto(vinos, stock_actual=Decimal("1"), precio_compra_prom=Decimal("50"), precio_venta=Decimal("80"))
+    _producto(vinos, stock_actual=Decimal("0"), activo=False)
+
+    with django_assert_num_queries(1):
+        r = auth_client.get(URL)
+    assert r.status_code == 200, r.content
+    data = {c["nombre"]: c for c in r.json()}
+
+    assert set(data) == {"Vinos", "Aguas"}
+    assert data["Vinos"]["productos"] == 3
+    assert data["Vinos"]["activos"] == 2
+    assert data["Vinos"]["bajo_stock"] == 1
+    assert data["Vinos"]["valor_costo"] == "1050.00"
+    assert data["Vinos"]["valor_venta"] == "1580.00"
+    assert data["Aguas"]["productos"] == 0 and data["Aguas"]["valor_costo"] == "0.00"
+
+    # segunda llamada: sale de cache
+    with django_assert_num_queries(0):
+        auth_client.get(URL)
+
+
+def test_resumen_se_invalida_al_cambiar_productos(auth_client, django_capture_on_commit_callbacks):
+    cat = baker.make(Categoria, local_id=1, nombre="Cervezas")
+    assert auth_client.get(URL).json()[0]["productos"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _producto(cat, stock_actual=Decimal("5"))
+
+    assert auth_client.get(URL).json()[0]["productos"] == 1
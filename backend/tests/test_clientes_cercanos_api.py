@@ -0,0 +1,77 @@
+# tests/test_clientes_cercanos_api.py
+import pytest
+from model_bakery import baker
+from catalogo.geo import haversine_km
+from catalogo.models import Cliente
+from core_app.models import Local
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/catalogo/clientes/cercanos/"
+
+# Obelisco (CABA)
+LAT, LNG = -34.6037, -58.3816
+
+
+def _cliente(nombre, lat, lng):
+    return baker.make(Cliente, nombre=nombre, lat=lat, lng=lng, activo=True)
+
+
+def test_haversine_conocida():
+    # Obelisco -> Plaza de Mayo ~ 1 km
+    d = haversine_km(LAT, LNG, [-34.6083], [-58.3712])
+    assert d[0] == pytest.approx(1.06, abs=0.05)
+
+
+def test_cercanos_por_radio_ordenados(auth_client):
+    cerca = _cliente("Cerca", -34.6040, -58.3820)
+    medio = _cliente("Medio", -34.6200, -58.3816)
+    _cliente("Lejos", -31.4201, -64.1888)  # Córdoba
+    baker.make(Cliente, nombre="Inactivo", lat=-34.6038, lng=-58.3817, activo=False)
+    baker.make(Cliente, nombre="Sin ubicación", lat=None, lng=None)
+
+    r = auth_client.get(URL, {"lat": LAT, "lng": LNG, "radio_km": 5})
+    assert r.status_code == 200, r.content
+    data = r.json()
+    assert [c["id"] for c in data] == [cerca.id, medio.id]
+    assert data[0]["distancia_km"] < data[1]["distancia_km"] < 5
+
+
+def test_n_mas_cercanos_desde_el_local(auth_client):
+    Local.objects.filter(id=1).update(lat=LAT, lng=LNG)
+    ids = [_cliente(f"C{i}", LAT + i * 0.05, LNG).id for i in range(6)]
+
+    r = auth_client.get(URL, {"limit": 3})
+    assert r.status_code == 200, r.content
+    assert [c["id"] for c in r.json()] == ids[:3]
+
+
+def test_local_sin_ubicacion_400(auth_client):
+    Local.objects.filter(id=1).update(lat=None, lng=None)
+    r = auth_client.get(URL, {"limit": 3})
+    assert r.status_code == 400
+
+
+def test_radio_sin_limit_devuelve_todos(auth_client):
+    # 25 en el radio: más que el limit por defecto del modo "n más cercanos"
+    ids = [_cliente(f"C{i}", LAT + i * 0.001, LNG).id for i in range(25)]
+
+    r = auth_client.get(URL, {"lat": LAT, "lng": LNG, "radio_km": 5})
+    assert [c["id"] for c in r.json()] == ids
+
+    r = auth_client.get(URL, {"lat": LAT, "lng": LNG, "radio_km": 5, "limit": 4})
+    assert [c["id"] for c in r.json()] == ids[:4]
+
+
+def test_radio_sin_limit_se_corta_en_el_maximo(auth_client, monkeypatch):
+    from catalogo.views import ClienteViewSet
+    monkeypatch.setattr(ClienteViewSet, "CERCANOS_MAX", 3)
+    ids = [_cliente(f"C{i}", LAT + i * 0.001, LNG).id for i in range(5)]
+
+    r = auth_client.get(URL, {"lat": LAT, "lng": LNG, "radio_km": 5})
+    assert [c["id"] for c in r.json()] == ids[:3]
+    assert r["X-Truncado"] == "true"
+
+    r = auth_client.get(URL, {"lat": LAT, "lng": LNG, "radio_km": 0.2})
+    assert [c["id"] for c in r.json()] == ids[:2]
+    assert "X-Truncado" not in r
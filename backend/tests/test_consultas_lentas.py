@@ -0,0 +1,115 @@
+# tests/test_consultas_lentas.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from model_bakery import baker
+
+from catalogo.models import Producto
+from core_app.consultas_lentas import (
+    capturar_consulta_lenta,
+    describir_params,
+    huella,
+    instrumentar_conexion,
+    normalizar,
+)
+from core_app.models import ConsultaLenta
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def capturar(settings):
+    """Todas las queries cuentan como lentas y se guardan en el momento."""
+    settings.CONSULTAS_LENTAS_MS = 0.000001
+    settings.CONSULTAS_LENTAS_ASYNC = False
+    with connection.execute_wrapper(capturar_consulta_lenta):
+        yield
+
+
+def test_normalizar_saca_valores_y_colapsa_listas():
+    a = normalizar('SELECT "p"."id" FROM "p" WHERE "p"."id" IN (%s, %s, %s) AND "p"."nombre" = \'x\'  LIMIT 21')
+    b = normalizar('SELECT "p"."id" FROM "p"\nWHERE "p"."id" IN (7) AND "p"."nombre" = \'it\'\'s\' LIMIT 5')
+    assert a == b == 'SELECT "p"."id" FROM "p" WHERE "p"."id" IN (...) AND "p"."nombre" = ? LIMIT ?'
+    assert huella(a) == huella(b)
+
+    filas = normalizar('INSERT INTO "t" ("a", "b1") VALUES (%s, %s), (%s, %s), (%s, %s)')
+    assert filas == 'INSERT INTO "t" ("a", "b1") VALUES (...)'
+
+
+def test_agrupa_por_huella(capturar):
+    list(Producto.objects.filter(id__in=[1, 2, 3]))
+    list(Producto.objects.filter(id__in=[4]))
+
+    fila = ConsultaLenta.objects.get(sql__contains='FROM "catalogo_producto"')
+    assert fila.veces == 2
+    assert "IN (...)" in fila.sql
+    assert fila.total_ms >= fila.max_ms > 0
+    assert "-- params:" in fila.ejemplo
+    assert fila.vista == ""  # fuera de un request
+    assert fila.plan == ""  # EXPLAIN sólo en Postgres
+
+
+def test_ejemplo_sin_valores_de_los_parametros(capturar):
+    list(Producto.objects.filter(nombre="Fernet secreto", id__in=[7]))
+
+    fila = ConsultaLenta.objects.get(sql__contains='FROM "catalogo_producto"')
+    assert "secreto" not in fila.ejemplo
+    assert "-- params: [int, str(14)]" in fila.ejemplo
+
+
+def test_ejemplo_con_valores_si_se_pide(capturar, settings):
+    settings.CONSULTAS_LENTAS_PARAMS = True
+    list(Producto.objects.filter(nombre="Fernet secreto"))
+
+    fila = ConsultaLenta.objects.get(sql__contains='FROM "catalogo_producto"')
+    assert "'Fernet secreto'" in fila.ejemplo
+
+
+def test_describir_params():
+    assert describir_params(("abc", 3, None, 1.5, b"xy")) == "[str(3), int, NoneType, float, bytes(2)]"
+    assert describir_params({"mail": "a@b.c"}) == "{'mail': str(5)}"
+    assert describir_params(None) == "None"
+
+
+def test_registra_la_vista_del_request(capturar, auth_client):
+    baker.make(Producto, local_id=1, _quantity=2)
+    ConsultaLenta.objects.all().delete()
+
+    assert auth_client.get("/api/catalogo/productos/").status_code == 200
+    productos = ConsultaLenta.objects.filter(sql__contains='FROM "catalogo_producto"')
+    vistas = set(productos.values_list("vista", flat=True))
+    assert vistas == {"producto-list"}
+
+
+def test_debajo_del_umbral_no_registra(capturar, settings):
+    settings.CONSULTAS_LENTAS_MS = 60_000
+    list(Producto.objects.all())
+    assert not ConsultaLenta.objects.exists()
+
+
+def test_sin_umbral_no_se_instala(settings):
+    settings.CONSULTAS_LENTAS_MS = 0
+    with connection.execute_wrapper(lambda *a: a[0](*a[1:])):
+        antes = list(connection.execute_wrappers)
+        instrumentar_conexion(connection)
+        assert connection.execute_wrappers == antes
+
+
+def test_comando_ordena_por_tiempo_total():
+    baker.make(ConsultaLenta, huella="a" * 16, sql="SELECT lenta", veces=2, total_ms=900, max_ms=500)
+    baker.make(ConsultaLenta, huella="b" * 16, sql="SELECT frecuente", veces=100, total_ms=3000, max_ms=40,
+               plan="Seq Scan on p")
+    out = StringIO()
+    call_command("consultas_lentas", plan=True, stdout=out)
+    texto = out.getvalue()
+    assert texto.index("SELECT frecuente") < texto.index("SELECT lenta")
+    assert "Seq Scan on p" in texto
+
+    out = StringIO()
+    call_command("consultas_lentas", orden="max", top=1, stdout=out)
+    assert "SELECT lenta" in out.getvalue() and "SELECT frecuente" not in out.getvalue()
+
+    call_command("consultas_lentas", borrar=True, stdout=StringIO())
+    assert not ConsultaLenta.objects.exists()
@@ -0,0 +1,67 @@
+# tests/test_fast_serializers.py
+import json
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from rest_framework.utils.encoders import JSONEncoder
+
+from catalogo.models import Categoria, Producto
+from catalogo.serializers import ProductoSerializer
+from compras.models import Compra, CompraDetalle
+from compras.serializers import CompraReadSerializer
+from core_app.fast_serializers import ValuesSerializer
+from ventas.models import Venta, VentaDetalle
+from ventas.serializers import VentaReadSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+def _json(data):
+    return json.dumps(data, cls=JSONEncoder, sort_keys=True)
+
+
+def _comparar(serializer_class, qs):
+    esperado = serializer_class(qs, many=True).data
+    fast = ValuesSerializer(serializer_class())
+    assert _json(fast.serialize(fast.values(qs))) == _json(esperado)
+
+
+def test_productos_igual_que_el_serializer():
+    cat = baker.make(Categoria, local_id=1, nombre="Cervezas")
+    baker.make(Producto, local_id=1, categoria=cat, precio_venta=Decimal("1234.5"), stock_actual=Decimal("3.14159"))
+    baker.make(Producto, local_id=1, categoria=None, marca=None)
+
+    _comparar(ProductoSerializer, Producto.objects.select_related("categoria").order_by("id"))
+
+
+def test_ventas_con_detalles_igual_que_el_serializer():
+    user = get_user_model().objects.create_user(username="cajero", password="x")
+    prod = baker.make(Producto, local_id=1, nombre="Fernet")
+    v1 = baker.make(Venta, local_id=1, usuario=user, total=Decimal("99.999"))
+    baker.make(Venta, local_id=1, usuario=None)
+    baker.make(VentaDetalle, venta=v1, producto=prod, cantidad=2, precio_unitario=Decimal("10.5"), _quantity=2)
+
+    _comparar(VentaReadSerializer, Venta.objects.order_by("id"))
+
+
+def test_compras_con_detalles_igual_que_el_serializer():
+    prov = baker.make("catalogo.Proveedor", local_id=1)
+    c = baker.make(Compra, local_id=1, proveedor=prov)
+    baker.make(CompraDetalle, compra=c, producto=baker.make(Producto, local_id=1), cantidad=1, costo_unitario=7)
+
+    _comparar(CompraReadSerializer, Compra.objects.order_by("-fecha", "-id"))
+
+
+def test_historial_compras_usa_una_query_por_nivel(auth_client, django_assert_num_queries):
+    prov = baker.make("catalogo.Proveedor", local_id=1)
+    prod = baker.make(Producto, local_id=1)
+    for _ in range(5):
+        c = baker.make(Compra, local_id=1, proveedor=prov)
+        baker.make(CompraDetalle, compra=c, producto=prod, cantidad=1, costo_unitario=1)
+
+    with django_assert_num_queries(2):
+        r = auth_client.get("/api/compras/historial/")
+    assert r.status_code == 200
+    assert len(r.json()) == 5
+    assert all(len(c["detalles"]) == 1 for c in r.json())
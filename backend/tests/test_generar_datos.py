@@ -0,0 +1,68 @@
+# tests/test_generar_datos.py
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from catalogo.lista_precios import leer_etag
+from catalogo.models import Producto
+from compras.models import Compra, CompraDetalle
+from core_app.models import Local
+from ventas.models import Venta, VentaDetalle
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def generados():
+    antes = set(Local.objects.values_list("id", flat=True))
+    call_command(
+        "generar_datos", locales=2, productos=200, proveedores=3, ventas=3000, compras=40,
+        dias=60, semilla=7, bloque=500, stdout=StringIO(),
+    )
+    return Local.objects.exclude(id__in=antes)
+
+
+def test_crea_los_volumenes_pedidos(generados):
+    assert generados.count() == 2
+    assert Producto.objects.filter(local__in=generados).count() == 400
+    assert Venta.objects.filter(local__in=generados).count() == 3000
+    assert Compra.objects.filter(local__in=generados).count() == 40
+    assert all(leer_etag(local.id) for local in generados)
+
+    # los totales cierran con los renglones
+    ventas = Venta.objects.annotate(suma=Sum("detalles__total_renglon"), renglones=Count("detalles"))
+    assert not ventas.filter(renglones=0).exists()
+    assert not ventas.exclude(total=F("suma")).exists()
+    compras = Compra.objects.annotate(suma=Sum("detalles__total_renglon"))
+    assert not compras.exclude(total=F("suma")).exists()
+    assert CompraDetalle.objects.filter(compra__in=Compra.objects.all()).exists()
+
+
+def test_fechas_dentro_del_rango_y_con_estacionalidad(generados):
+    ahora = timezone.now()
+    fechas = list(Venta.objects.values_list("fecha", flat=True))
+    assert min(fechas) >= ahora - timedelta(days=61)
+    assert max(fechas) <= ahora
+
+    horas = Counter(timezone.localtime(f).hour for f in fechas)
+    assert horas[20] > 5 * horas[4]  # de noche se vende, de madrugada casi nada
+    dias = Counter(timezone.localtime(f).weekday() for f in fechas)
+    assert dias[5] > dias[0]  # sábado > lunes
+
+
+def test_popularidad_pareto(generados):
+    renglones = Counter(VentaDetalle.objects.values_list("producto_id", flat=True))
+    ordenados = sorted(renglones.values(), reverse=True)
+    top = ordenados[: len(ordenados) // 5]
+    assert sum(top) > 0.5 * sum(ordenados)  # el 20% más vendido se lleva más de la mitad
+
+
+def test_las_secuencias_siguen_despues_de_los_ids_generados(generados):
+    ultima = Venta.objects.order_by("-id").first().id
+    nueva = Venta.objects.create(local=generados.first())
+    assert nueva.id > ultima
@@ -0,0 +1,65 @@
+# tests/test_historial_ventas.py
+from decimal import Decimal
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from ventas.models import Venta
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/ventas/historial/"
+
+
+@pytest.fixture
+def ventas():
+    ahora = timezone.now()
+    hechas = []
+    for i in range(7):
+        estado = "anulada" if i == 6 else "confirmada"
+        hechas.append(baker.make(Venta, local_id=1, estado=estado, total=Decimal("10.50"),
+                                 fecha=ahora - timedelta(minutes=i)))
+    baker.make(Venta, local_id=1, estado="confirmada", total=Decimal("99"), fecha=ahora - timedelta(days=3))
+    return hechas
+
+
+def test_sin_fechas_es_hoy_y_trae_totales(auth_client, ventas, django_assert_num_queries):
+    with django_assert_num_queries(1):  # filas + pie en la misma query
+        r = auth_client.get(URL)
+    assert r.status_code == 200, r.content
+    data = r.json()
+
+    assert [v["id"] for v in data["results"]] == [v.id for v in ventas]
+    assert set(data["results"][0]) == {"id", "fecha", "estado", "total"}
+    assert data["results"][0]["total"] == "10.5000"
+    assert data["totales"] == {
+        "cantidad": 7,
+        "total": "73.5000",
+        "por_estado": {
+            "borrador": {"cantidad": 0, "total": "0.0000"},
+            "confirmada": {"cantidad": 6, "total": "63.0000"},
+            "anulada": {"cantidad": 1, "total": "10.5000"},
+        },
+    }
+
+
+def test_keyset_recorre_todo_y_el_pie_es_del_rango(auth_client, ventas):
+    r = auth_client.get(URL, {"estado": "confirmada", "page_size": 4})
+    data = r.json()
+    assert len(data["results"]) == 4
+    assert data["totales"]["cantidad"] == 6  # del rango entero, no de la página
+
+    ids = [v["id"] for v in data["results"]]
+    while data["next"]:
+        data = auth_client.get(data["next"]).json()
+        assert "totales" not in data
+        ids += [v["id"] for v in data["results"]]
+    assert ids == [v.id for v in ventas if v.estado == "confirmada"]
+
+
+def test_rango_vacio(auth_client):
+    data = auth_client.get(URL, {"desde": "2001-01-01", "hasta": "2001-01-31"}).json()
+    assert data["results"] == []
+    assert data["totales"]["cantidad"] == 0 and data["totales"]["total"] == "0.0000"
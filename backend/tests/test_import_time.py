@@ -0,0 +1,66 @@
+# tests/test_import_time.py
+"""
+Presupuesto de tiempo de import: django.setup() + carga de todas las URLs,
+medido con `python -X importtime` en un proceso limpio.
+
+Es lo que paga cada management command y cada worker al arrancar. Las
+dependencias pesadas (PDF, QR, imágenes, NumPy) se importan adentro de las
+funciones que las usan, nunca a nivel módulo.
+
+IMPORT_TIME_BUDGET_MS permite ajustar el presupuesto en máquinas lentas.
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# el autouse ensure_locales de conftest necesita la base de prueba
+pytestmark = pytest.mark.django_db
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PRESUPUESTO_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+PESADOS = ("reportlab", "qrcode", "PIL", "numpy")
+
+CODIGO = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver()._populate()"
+)
+LINEA = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@pytest.fixture(scope="module")
+def importtime():
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"}
+    env.setdefault("DJANGO_SECRET_KEY", "importtime")
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CODIGO],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+
+    total_us, modulos = 0, set()
+    for linea in salida.splitlines():
+        m = LINEA.match(linea)
+        if not m:
+            continue
+        acumulado, sangria, modulo = m.groups()
+        modulos.add(modulo)
+        if not sangria:  # sólo los imports de primer nivel: el resto ya está sumado
+            total_us += int(acumulado)
+    return total_us / 1000, modulos
+
+
+def test_arranque_no_importa_dependencias_pesadas(importtime):
+    _, modulos = importtime
+    cargados = sorted({m.split(".")[0] for m in modulos} & set(PESADOS))
+    assert not cargados, f"se importan al arrancar: {cargados}"
+
+
+def test_arranque_dentro_del_presupuesto(importtime):
+    total_ms, _ = importtime
+    assert total_ms <= PRESUPUESTO_MS, (
+        f"django.setup() + URLs tarda {total_ms:.0f} ms en imports "
+        f"(presupuesto {PRESUPUESTO_MS} ms)"
+    )
@@ -0,0 +1,114 @@
+# tests/test_indices_explain.py
+"""
+Verifica con EXPLAIN que las consultas de reportes e historial usan los
+índices compuestos (local, estado, fecha) / (venta, producto).
+"""
+import importlib
+
+import pytest
+from datetime import datetime, timedelta
+from django.db import connection
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from model_bakery import baker
+
+from compras.models import Compra
+from ventas.models import Venta, VentaDetalle
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def rango():
+    hasta = timezone.make_aware(datetime(2025, 10, 31, 23, 59))
+    return hasta - timedelta(days=30), hasta
+
+
+def test_reporte_financiero_usa_indice_local_estado_fecha(rango):
+    ventas = Venta.objects.filter(local_id=1, estado="confirmada", fecha__range=rango)
+    compras = Compra.objects.filter(local_id=1, estado="confirmada", fecha__range=rango)
+
+    assert "ventas_venta_local_est_idx" in ventas.explain()
+    assert "compras_compra_local_est_idx" in compras.explain()
+
+
+def test_historial_con_estado_usa_indice_local_estado_fecha(rango):
+    # mismo filtro que /api/ventas/historial/?estado=confirmada
+    qs = Venta.objects.filter(local_id=1, fecha__range=rango).filter(estado="confirmada")
+    assert "ventas_venta_local_est_idx" in qs.explain()
+
+
+def test_historial_sin_estado_usa_indice_local_fecha(rango):
+    qs = Venta.objects.filter(local_id=1, fecha__range=rango).order_by("-fecha", "-id")
+    assert "ventas_venta_local_fecha_idx" in qs.explain()
+
+
+def test_top_productos_usa_indices_de_venta_y_detalle(rango):
+    qs = (
+        VentaDetalle.objects
+        .filter(venta__local_id=1, venta__estado="confirmada", venta__fecha__range=rango)
+        .values("producto_id")
+        .annotate(cantidad_vendida=Sum("cantidad"), facturacion=Sum(F("cantidad") * F("precio_unitario")))
+    )
+    plan = qs.explain()
+    assert "ventas_venta_local_est_idx" in plan
+    assert "ventas_det_venta_prod_idx" in plan
+
+
+def test_migraciones_crean_indices_concurrently():
+    from core_app.operations import AddIndexConcurrently
+    from django.db.migrations.loader import MigrationLoader
+
+    loader = MigrationLoader(connection)
+    for app, nombre in [
+        ("ventas", "0005_venta_ventas_venta_local_est_idx_and_more"),
+        ("compras", "0005_compra_compras_compra_local_est_idx"),
+    ]:
+        migracion = loader.get_migration(app, nombre)
+        assert migracion.atomic is False
+        assert all(isinstance(op, AddIndexConcurrently) for op in migracion.operations)
+
+
+def test_migracion_pasa_estado_a_minusculas():
+    # el historial filtra por igualdad: las filas viejas en mayúsculas no aparecerían
+    from django.apps import apps
+
+    migracion_ventas = importlib.import_module("ventas.migrations.0007_estado_en_minusculas")
+    migracion_compras = importlib.import_module("compras.migrations.0006_estado_en_minusculas")
+    baker.make(Venta, local_id=1, estado="Confirmada")
+    baker.make(Compra, local_id=1, estado="ANULADA")
+
+    migracion_ventas.estado_en_minusculas(apps, None)
+    migracion_compras.estado_en_minusculas(apps, None)
+
+    assert Venta.objects.filter(estado="confirmada").count() == 1
+    assert Compra.objects.filter(estado="anulada").count() == 1
+
+
+def test_sacar_indice_de_fk_es_concurrente_en_postgres(monkeypatch):
+    # sin Postgres en los tests: se junta el SQL que correría la migración
+    pytest.importorskip("psycopg")
+    from django.db.migrations.loader import MigrationLoader
+    from django.db.utils import ConnectionHandler
+
+    conexion = ConnectionHandler({"default": {
+        "ENGINE": "django.db.backends.postgresql", "NAME": "bebidas", "HOST": "db.example.com",
+    }})["default"]
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    clave = ("ventas", "0006_alter_ventadetalle_producto_alter_ventadetalle_venta")
+    antes = loader.project_state(("ventas", "0005_venta_ventas_venta_local_est_idx_and_more"))
+    despues = loader.project_state(clave)
+    operacion = loader.get_migration(*clave).operations[0]
+    assert loader.get_migration(*clave).atomic is False
+
+    with conexion.schema_editor(collect_sql=True, atomic=False) as editor:
+        monkeypatch.setattr(editor, "_constraint_names", lambda *a, **k: ["ventas_ventadetalle_producto_id_idx"])
+        # el execute de Postgres arma el SQL final con la conexión: acá sólo el texto
+        monkeypatch.setattr(editor, "execute", lambda sql, params=(): editor.collected_sql.append(str(sql)))
+        operacion.database_forwards("ventas", editor, antes, despues)
+        operacion.database_backwards("ventas", editor, despues, antes)
+
+    ida, vuelta = editor.collected_sql
+    assert ida.startswith('DROP INDEX CONCURRENTLY IF EXISTS "ventas_ventadetalle_producto_id_idx"')
+    assert vuelta.startswith("CREATE INDEX CONCURRENTLY")
@@ -0,0 +1,100 @@
+# tests/test_json_y_compresion.py
+import gzip
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import brotli
+import pytest
+from django.utils.translation import gettext_lazy
+from model_bakery import baker
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from catalogo.models import Producto
+from core_app.compresion import elegir_codificacion
+from core_app.parsers import JSONParser
+from core_app.renderers import JSONRenderer
+
+pytestmark = pytest.mark.django_db
+
+DATOS = {
+    "total": Decimal("1234.5600"),
+    "fecha": datetime(2025, 10, 26, 13, 5, 7, 120000, tzinfo=dt_timezone.utc),
+    "local": datetime(2025, 10, 26, 10, 5, tzinfo=ZoneInfo("America/Argentina/Buenos_Aires")),
+    "dia": date(2025, 10, 26),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "duracion": timedelta(minutes=1, seconds=30),
+    "texto": gettext_lazy("Ñandú con salto"),
+    "por_estado": {1: "uno", "dos": (2, 2.5, None, True)},
+    "detalle": ReturnDict({"x": [Decimal("0.10")]}, serializer=None),
+    "grande": 2**70,
+}
+
+
+@pytest.mark.parametrize("media_type", [None, "application/json; indent=4"])
+def test_misma_salida_que_drf(media_type):
+    drf = renderers.JSONRenderer().render(DATOS, media_type)
+    assert JSONRenderer().render(DATOS, media_type) == drf
+
+    sin_grande = {k: v for k, v in DATOS.items() if k != "grande"}  # el camino rápido
+    assert JSONRenderer().render(sin_grande, media_type) == renderers.JSONRenderer().render(sin_grande, media_type)
+    assert JSONRenderer().render(None) == b""
+
+
+def test_parser():
+    parser = JSONParser()
+    assert parser.parse(io.BytesIO('{"a": [1, 2.5, "ñ"]}'.encode())) == {"a": [1, 2.5, "ñ"]}
+    latin1 = io.BytesIO('{"a": "ñ"}'.encode("latin-1"))
+    assert parser.parse(latin1, parser_context={"encoding": "latin-1"}) == {"a": "ñ"}
+    for malo in (b"{", b'{"a": NaN}', b"\xff"):
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(malo))
+
+
+@pytest.mark.parametrize("accept,esperada", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip;q=0.5", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_elegir_codificacion(accept, esperada):
+    assert elegir_codificacion(accept) == esperada
+
+
+@pytest.mark.parametrize("accept,descomprimir", [
+    ("br, gzip", brotli.decompress),
+    ("gzip", gzip.decompress),
+    ("", lambda contenido: contenido),
+])
+def test_listado_comprimido(auth_client, accept, descomprimir):
+    baker.make(Producto, local_id=1, precio_venta=Decimal("10.50"), _quantity=30)
+    r = auth_client.get("/api/catalogo/productos/", HTTP_ACCEPT_ENCODING=accept)
+    assert r.status_code == 200
+    assert r.get("Content-Encoding", "") == accept.split(",")[0]
+    assert "Accept-Encoding" in r["Vary"]
+
+    cuerpo = descomprimir(r.content)
+    assert len(json.loads(cuerpo)["results"]) == 25
+    if accept:
+        assert int(r["Content-Length"]) == len(r.content) < len(cuerpo)
+
+
+def test_respuesta_chica_va_sin_comprimir(auth_client, settings):
+    settings.COMPRESION_MIN_BYTES = 100_000
+    baker.make(Producto, local_id=1, _quantity=3)
+    r = auth_client.get("/api/catalogo/productos/", HTTP_ACCEPT_ENCODING="br, gzip")
+    assert not r.has_header("Content-Encoding")
+
+
+def test_lista_de_precios_no_se_comprime_dos_veces(auth_client):
+    baker.make(Producto, local_id=1, activo=True, _quantity=50)
+    r = auth_client.get("/api/catalogo/lista-precios/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert r["Content-Encoding"] == "gzip"
+    assert isinstance(json.loads(gzip.decompress(r.content)), (dict, list))
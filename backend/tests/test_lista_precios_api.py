@@ -0,0 +1,119 @@
+# tests/test_lista_precios_api.py
+import gzip
+import json
+
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+from model_bakery import baker
+from catalogo.lista_precios import programar_reconstruccion
+from catalogo.models import Categoria, Producto
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/catalogo/lista-precios/"
+
+
+def _producto(**kwargs):
+    defaults = dict(local_id=1, activo=True, precio_venta=Decimal("100.00"))
+    defaults.update(kwargs)
+    return baker.make(Producto, **defaults)
+
+
+def test_lista_precios_gzip_y_etag(auth_client, django_assert_num_queries):
+    cat = baker.make(Categoria, local_id=1, nombre="Vinos")
+    _producto(codigo="B1", nombre="Malbec", categoria=cat, precio_venta=Decimal("1500.50"))
+    _producto(codigo="A1", nombre="Agua")
+    _producto(codigo="X1", activo=False)
+    _producto(codigo="O1", local_id=2)
+    call_command("publicar_listas_precios", "--local", "1", "--local", "2")
+
+    with django_assert_num_queries(0):
+        r = auth_client.get(URL, HTTP_ACCEPT_ENCODING="gzip")
+    assert r.status_code == 200
+    assert r["Content-Encoding"] == "gzip"
+    etag = r["ETag"]
+
+    data = json.loads(gzip.decompress(r.content))
+    assert data["local"] == 1 and f'"{data["version"]}"' == etag
+    assert data["productos"] == [
+        {"codigo": "A1", "nombre": "Agua", "precio_venta": "100.0000", "categoria": None},
+        {"codigo": "B1", "nombre": "Malbec", "precio_venta": "1500.5000", "categoria": "Vinos"},
+    ]
+
+    # la caja ya tiene esta versión: 304 sin cuerpo
+    r = auth_client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304 and r.content == b""
+
+    # sin Accept-Encoding gzip se manda el JSON plano
+    r = auth_client.get(URL)
+    assert "Content-Encoding" not in r
+    assert json.loads(r.content)["version"] == data["version"]
+
+
+def test_lista_precios_se_construye_si_no_existe(auth_client):
+    _producto(codigo="A1")
+    r = auth_client.get(URL)
+    assert r.status_code == 200
+    assert [p["codigo"] for p in json.loads(r.content)["productos"]] == ["A1"]
+
+
+def test_lista_precios_se_reconstruye_al_cambiar_precios(auth_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        p = _producto(codigo="A1")
+    etag = auth_client.get(URL)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        p.precio_venta = Decimal("120.00")
+        p.save()
+
+    r = auth_client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert r["ETag"] != etag
+    assert json.loads(r.content)["productos"][0]["precio_venta"] == "120.0000"
+
+
+def test_lista_precios_vieja_se_reconstruye_al_leer(auth_client, django_assert_num_queries):
+    # el cambio lo hizo otro worker/réplica: acá sólo llega la marca de la cache
+    p = _producto(codigo="A1")
+    call_command("publicar_listas_precios", "--local", "1")
+    etag = auth_client.get(URL)["ETag"]
+
+    Producto.objects.filter(pk=p.pk).update(precio_venta=Decimal("130.00"))
+    programar_reconstruccion(1)
+
+    r = auth_client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200 and r["ETag"] != etag
+    assert json.loads(r.content)["productos"][0]["precio_venta"] == "130.0000"
+
+    # ya al día: vuelve a servirse sin queries
+    with django_assert_num_queries(0):
+        assert auth_client.get(URL, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 304
+
+
+def test_lista_precios_requiere_header_local(auth_client):
+    auth_client.credentials()
+    assert auth_client.get(URL).status_code == 400
+
+
+def test_lista_precios_no_se_reconstruye_por_stock(django_capture_on_commit_callbacks, monkeypatch):
+    reconstrucciones = []
+    monkeypatch.setattr("catalogo.signals.programar_reconstruccion", reconstrucciones.append)
+    cat = baker.make(Categoria, local_id=1, nombre="Vinos")
+    p = _producto(codigo="A1")
+    reconstrucciones.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        # como confirmar/anular una venta o compra
+        p.stock_actual = Decimal("3")
+        p.save(update_fields=["stock_actual", "updated_at"])
+        # un save completo que sólo cambia stock tampoco
+        cargado = Producto.objects.get(pk=p.pk)
+        cargado.stock_actual = Decimal("2")
+        cargado.save()
+    assert reconstrucciones == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cargado.categoria = cat
+        cargado.save()
+    assert reconstrucciones == [1]
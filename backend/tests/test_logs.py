@@ -0,0 +1,94 @@
+# tests/test_logs.py
+import json
+import logging
+import sys
+from decimal import Decimal
+
+import pytest
+from model_bakery import baker
+
+from catalogo.models import Producto
+from core_app.logs import ColaHandler, JSONFormatter, Muestreo
+
+# el autouse ensure_locales de conftest necesita la base de prueba
+pytestmark = pytest.mark.django_db
+
+
+def _registro(nivel=logging.INFO, msg="hola %s", args=("mundo",), **extra):
+    registro = logging.LogRecord("ventas.views", nivel, __file__, 1, msg, args, None)
+    registro.__dict__.update(extra)
+    return registro
+
+
+def test_json_con_extras_y_traceback():
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        registro = logging.LogRecord("x", logging.ERROR, __file__, 1, "falló", (), sys.exc_info())
+    datos = json.loads(JSONFormatter().format(registro))
+    assert datos["nivel"] == "ERROR" and datos["msg"] == "falló"
+    assert "ZeroDivisionError" in datos["exc"]
+
+    datos = json.loads(JSONFormatter().format(_registro(venta_id=7, total=Decimal("1.50"))))
+    assert datos["msg"] == "hola mundo"
+    assert datos["venta_id"] == 7 and datos["total"] == "1.50"
+
+
+def test_muestreo_solo_recorta_debug():
+    nada = Muestreo(tasa=0)
+    assert not nada.filter(_registro(logging.DEBUG))
+    assert nada.filter(_registro(logging.INFO))
+    assert Muestreo(tasa=1).filter(_registro(logging.DEBUG))
+
+    algunos = Muestreo(tasa=0.1)
+    pasaron = sum(algunos.filter(_registro(logging.DEBUG)) for _ in range(2000))
+    assert 100 < pasaron < 300
+
+
+def test_cola_escribe_desde_otro_thread(capsys):
+    handler = ColaHandler()
+    handler.setFormatter(JSONFormatter())
+    handler.handle(_registro(venta_id=3))
+    handler.detener()  # espera a que se vacíe la cola
+
+    lineas = capsys.readouterr().err.strip().splitlines()
+    assert [json.loads(linea)["venta_id"] for linea in lineas] == [3]
+
+
+def test_cola_nueva_en_cada_proceso(capsys):
+    handler = ColaHandler()
+    handler.handle(_registro(venta_id=1))
+    cola_del_master, listener_del_master = handler.queue, handler._listener
+
+    handler._pid = -1  # como un worker recién forkeado: el pid ya no coincide
+    handler.handle(_registro(venta_id=2))
+    assert handler.queue is not cola_del_master
+    listener_del_master.stop()
+    handler.detener()
+
+    lineas = capsys.readouterr().err.strip().splitlines()
+    assert sorted(json.loads(linea)["venta_id"] for linea in lineas) == [1, 2]  # sin duplicados
+
+
+def test_cola_llena_descarta_sin_bloquear():
+    handler = ColaHandler(tamano=1)  # sin listener: nadie vacía la cola
+    handler.enqueue(_registro())
+    handler.enqueue(_registro())
+    assert handler.descartados == 1
+
+
+def test_crear_venta_loguea_sin_payload(auth_client, caplog, capsys):
+    p = baker.make(Producto, local_id=1, precio_venta=Decimal("100"))
+    with caplog.at_level(logging.DEBUG, logger="ventas.views"):
+        r = auth_client.post(
+            "/api/ventas/",
+            {"detalles": [{"producto": p.id, "cantidad": "2", "precio_unitario": "100"}]},
+            format="json",
+        )
+    assert r.status_code == 201, r.content
+
+    creada = next(rec for rec in caplog.records if rec.getMessage() == "Venta borrador creada")
+    assert creada.venta_id == r.json()["id"]
+    assert next(rec for rec in caplog.records if rec.getMessage() == "Creando venta").renglones == 1
+    assert "precio_unitario" not in caplog.text
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,112 @@
+# tests/test_metrics.py
+import re
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from catalogo.models import Producto
+from ventas.models import Venta
+
+pytestmark = pytest.mark.django_db
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _server_timing(response):
+    return {
+        nombre: (float(dur), desc)
+        for nombre, dur, desc in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response["Server-Timing"]
+        )
+    }
+
+
+def test_server_timing_cuenta_las_queries_del_request(auth_client, django_assert_num_queries):
+    baker.make(Producto, local_id=1, _quantity=3)
+
+    with django_assert_num_queries(2) as ctx:  # COUNT del paginado + SELECT
+        r = auth_client.get("/api/catalogo/productos/")
+    assert r.status_code == 200
+
+    timing = _server_timing(r)
+    assert timing["db"][1] == f"{len(ctx.captured_queries)} queries"
+    assert "render" in timing  # con orjson 3 productos pueden redondear a 0.0 ms
+    assert timing["total"][0] >= timing["db"][0] + timing["render"][0]
+
+
+def test_server_timing_en_vista_async(auth_client):
+    # las queries de las vistas async corren en otro thread (sync_to_async)
+    baker.make(Venta, local_id=1, estado="confirmada", total=Decimal("10"), fecha=timezone.now())
+    hoy = timezone.localdate()
+
+    r = auth_client.get(f"/api/reportes/financieros/?desde={hoy}&hasta={hoy}")
+    assert r.status_code == 200
+    assert _server_timing(r)["db"][1] == "2 queries"
+
+
+@pytest.fixture
+def con_token(settings):
+    settings.METRICS_TOKEN = "secreto"
+    return {"HTTP_AUTHORIZATION": "Bearer secreto"}
+
+
+def test_metrics_por_vista_y_local(auth_client, anon_client, con_token):
+    auth_client.get("/api/catalogo/productos/")
+
+    r = anon_client.get("/api/metrics", **con_token)
+    assert r.status_code == 200
+    assert r["Content-Type"].startswith("text/plain")
+    texto = r.content.decode()
+    assert re.search(
+        r'api_request_db_queries_count\{local="1",method="GET",status="200",view="producto-list"\} [1-9]',
+        texto,
+    )
+    assert "api_request_duration_seconds_bucket{" in texto
+    assert "api_request_render_seconds_sum{" in texto
+
+
+def test_metrics_con_token(anon_client, con_token):
+    assert anon_client.get("/api/metrics").status_code == 403
+    assert anon_client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer otro").status_code == 403
+    assert anon_client.get("/api/metrics", **con_token).status_code == 200
+
+
+def test_metrics_sin_token_configurado_no_se_sirve(anon_client, settings):
+    settings.METRICS_TOKEN = ""
+    assert anon_client.get("/api/metrics").status_code == 403
+    assert anon_client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer ").status_code == 403
+
+
+def test_local_solo_de_requests_autenticados_y_locales_activos(auth_client, anon_client, con_token):
+    anon_client.get("/api/catalogo/productos/", HTTP_X_LOCAL_ID="424242")
+    auth_client.get("/api/catalogo/productos/", HTTP_X_LOCAL_ID="535353")
+    auth_client.get("/api/no-existe/", HTTP_X_LOCAL_ID="1")
+
+    texto = anon_client.get("/api/metrics", **con_token).content.decode()
+    assert 'local="424242"' not in texto
+    assert 'local="535353"' not in texto
+    assert re.search(r'api_request_db_queries_count\{local="",method="GET",status="401",view="producto-list"\}', texto)
+    assert re.search(r'api_request_db_queries_count\{local="",method="GET",status="404",view="sin_ruta"\}', texto)
+
+
+def test_metrics_suma_los_procesos_de_gunicorn(anon_client, con_token, monkeypatch, tmp_path):
+    # otro proceso (un worker) registra un request en el directorio compartido
+    codigo = (
+        "from prometheus_client import Histogram; "
+        "h = Histogram('api_request_duration_seconds', 'x', ('view', 'local', 'method', 'status')); "
+        "h.labels('venta-list', '2', 'GET', '200').observe(0.25)"
+    )
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PATH": ""}
+    subprocess.run([sys.executable, "-c", codigo], cwd=BACKEND_DIR, env=env, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    texto = anon_client.get("/api/metrics", **con_token).content.decode()
+    assert (
+        'api_request_duration_seconds_sum{local="2",method="GET",status="200",view="venta-list"} 0.25'
+        in texto
+    )
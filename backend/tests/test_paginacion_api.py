@@ -0,0 +1,89 @@
+# tests/test_paginacion_api.py
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from model_bakery import baker
+from ventas.models import Venta
+from catalogo.models import Producto
+
+pytestmark = pytest.mark.django_db
+
+VENTAS = "/api/ventas/"
+PRODUCTOS = "/api/catalogo/productos/"
+
+
+def _recorrer(client, url, params):
+    ids, data = [], client.get(url, params).json()
+    while True:
+        ids += [item["id"] for item in data["results"]]
+        if not data["next"]:
+            return ids
+        data = client.get(data["next"]).json()
+
+
+def test_ventas_keyset_recorre_todo_en_orden(auth_client):
+    ahora = timezone.now()
+    ventas = [
+        baker.make(Venta, local_id=1, fecha=ahora - timedelta(minutes=i))
+        for i in range(7)
+    ]
+    baker.make(Venta, local_id=2, fecha=ahora)
+
+    r = auth_client.get(VENTAS, {"paginacion": "cursor", "page_size": 3})
+    assert r.status_code == 200, r.content
+    assert "count" not in r.json()
+    assert len(r.json()["results"]) == 3
+
+    ids = _recorrer(auth_client, VENTAS, {"paginacion": "cursor", "page_size": 3})
+    assert ids == [v.id for v in ventas]
+
+
+def test_productos_sin_count(auth_client):
+    prods = [baker.make(Producto, local_id=1, codigo=f"P{i}") for i in range(30)]
+
+    r = auth_client.get(PRODUCTOS, {"sin_count": 1})
+    assert r.status_code == 200, r.content
+    data = r.json()
+    assert "count" not in data
+    assert len(data["results"]) == 25
+    assert data["next"] and data["previous"] is None
+
+    data2 = auth_client.get(data["next"]).json()
+    assert len(data2["results"]) == 5
+    assert data2["next"] is None
+
+    ids = [p["id"] for p in data["results"] + data2["results"]]
+    assert ids == sorted((p.id for p in prods), reverse=True)
+
+
+def test_productos_paginado_clasico_sigue_con_count(auth_client):
+    baker.make(Producto, local_id=1, _quantity=3)
+    data = auth_client.get(PRODUCTOS).json()
+    assert data["count"] == 3
+
+
+def test_keyset_compara_fecha_e_id_juntos(auth_client, django_assert_max_num_queries):
+    # muchas ventas en el mismo instante: el desempate por id va en el WHERE
+    ahora = timezone.now()
+    ventas = baker.make(Venta, local_id=1, fecha=ahora, _quantity=5)
+    esperados = sorted((v.id for v in ventas), reverse=True)
+
+    assert _recorrer(auth_client, VENTAS, {"paginacion": "cursor", "page_size": 2}) == esperados
+
+    primera = auth_client.get(VENTAS, {"paginacion": "cursor", "page_size": 2}).json()
+    with django_assert_max_num_queries(3) as ctx:
+        segunda = auth_client.get(primera["next"]).json()
+    sql = next(q["sql"] for q in ctx.captured_queries if "ventas_venta" in q["sql"] and "LIMIT" in q["sql"])
+    assert 'OFFSET' not in sql
+    # Postgres: (fecha, id) < (%s, %s); SQLite lo expande a fecha < %s OR (fecha = %s AND id < %s)
+    assert '"ventas_venta"."id") <' in sql or '"ventas_venta"."id" <' in sql
+    assert [v["id"] for v in segunda["results"]] == esperados[2:4]
+
+    # y para atrás vuelve a la primera página
+    anterior = auth_client.get(segunda["previous"]).json()
+    assert [v["id"] for v in anterior["results"]] == esperados[:2]
+    assert anterior["previous"] is None
+
+
+def test_keyset_cursor_invalido_es_404(auth_client):
+    assert auth_client.get(VENTAS, {"cursor": "no-es-un-cursor"}).status_code == 404
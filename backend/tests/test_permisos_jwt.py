@@ -0,0 +1,87 @@
+# tests/test_permisos_jwt.py
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from catalogo.models import Categoria
+from core_app.serializers import MyTokenObtainPairSerializer
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/catalogo/categorias/"
+
+
+def _jwt_client(user):
+    token = MyTokenObtainPairSerializer.get_token(user).access_token
+    c = APIClient()
+    c.credentials(HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_X_LOCAL_ID="1")
+    return c
+
+
+@pytest.fixture
+def admin():
+    user = get_user_model().objects.create_user(username="jwt_admin", password="x")
+    user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+    return user
+
+
+def test_permiso_sale_del_claim_sin_consultar_grupos(admin, django_assert_num_queries):
+    client = _jwt_client(admin)
+    baker.make(Categoria, local_id=1, nombre="Vinos")
+
+    # count + página: ni auth_user (core_app.authentication) ni auth_group
+    with django_assert_num_queries(2) as ctx:
+        r = client.get(URL)
+    assert r.status_code == 200
+    assert not any("auth_" in q["sql"] for q in ctx.captured_queries)
+
+    # la escritura sí carga el User (para rechazar desactivados), pero no los grupos
+    with django_assert_num_queries(2) as ctx:
+        r = client.post(URL, {"nombre": "Aguas"}, format="json")
+    assert r.status_code == 201, r.content
+    assert not any("auth_group" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_usuario_desactivado_no_puede_escribir(admin):
+    client = _jwt_client(admin)
+    admin.is_active = False
+    admin.save(update_fields=["is_active"])
+
+    assert client.post(URL, {"nombre": "Aguas"}, format="json").status_code == 401
+
+
+def test_claim_sin_admin_no_puede_escribir(db):
+    user = get_user_model().objects.create_user(username="jwt_cajero", password="x")
+    r = _jwt_client(user).post(URL, {"nombre": "Aguas"}, format="json")
+    assert r.status_code == 403
+
+
+def test_fallback_cachea_grupos_y_se_invalida(admin, django_assert_num_queries):
+    client = APIClient()
+    client.force_authenticate(user=admin)  # sin token: no hay claims
+    client.credentials(HTTP_X_LOCAL_ID="1")
+
+    assert client.post(URL, {"nombre": "Aguas"}, format="json").status_code == 201
+    # segunda escritura: grupos desde la cache
+    with django_assert_num_queries(1):
+        assert client.post(URL, {"nombre": "Vinos"}, format="json").status_code == 201
+
+    # sacarlo del grupo invalida la cache
+    admin.groups.clear()
+    assert client.post(URL, {"nombre": "Gaseosas"}, format="json").status_code == 403
+
+
+def test_refresh_relee_los_grupos(admin):
+    login = APIClient().post("/api/auth/token/", {"username": "jwt_admin", "password": "x"}, format="json")
+    assert login.status_code == 200
+    assert "Admin" in login.data["groups"]
+
+    admin.groups.clear()
+    r = APIClient().post("/api/auth/refresh/", {"refresh": login.data["refresh"]}, format="json")
+    assert r.status_code == 200, r.content
+
+    c = APIClient()
+    c.credentials(HTTP_AUTHORIZATION=f"Bearer {r.data['access']}", HTTP_X_LOCAL_ID="1")
+    assert c.post(URL, {"nombre": "Aguas"}, format="json").status_code == 403
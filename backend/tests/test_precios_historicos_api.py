@@ -0,0 +1,85 @@
+# tests/test_precios_historicos_api.py
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from model_bakery import baker
+from catalogo.models import PrecioHistorico, Producto, Proveedor
+
+pytestmark = pytest.mark.django_db
+
+BASE = "/api/catalogo/precios-historicos/"
+
+
+def _costo(producto, proveedor, costo, dias_atras, moneda="ARS"):
+    ph = baker.make(PrecioHistorico, producto=producto, proveedor=proveedor, costo_unitario=Decimal(costo),
+                    moneda=moneda)
+    # fecha es auto_now_add: la movemos a mano
+    PrecioHistorico.objects.filter(pk=ph.pk).update(fecha=timezone.now() - timedelta(days=dias_atras))
+    return ph
+
+
+@pytest.fixture
+def historial():
+    p1 = baker.make(Producto, local_id=1, codigo="P1")
+    p2 = baker.make(Producto, local_id=1, codigo="P2")
+    otro = baker.make(Producto, local_id=2, codigo="X")
+    prov_a = baker.make(Proveedor, local_id=1, nombre="A")
+    prov_b = baker.make(Proveedor, local_id=1, nombre="B")
+
+    _costo(p1, prov_a, "100", 10)
+    _costo(p1, prov_a, "120", 1)   # último de A para p1
+    _costo(p1, prov_b, "90", 5)    # último de B para p1 (y el más barato)
+    _costo(p2, prov_b, "50", 3)
+    _costo(otro, prov_a, "1", 0)
+    return p1, p2, prov_a, prov_b
+
+
+def test_ultimo_costo_por_producto_en_una_query(admin_client, historial, django_assert_num_queries):
+    p1, p2, prov_a, _ = historial
+
+    with django_assert_num_queries(2):  # chequeo de grupo Admin + la query de costos
+        r = admin_client.get(f"{BASE}ultimos/")
+    assert r.status_code == 200, r.content
+    data = {f["producto"]: f for f in r.json()}
+    assert set(data) == {p1.id, p2.id}
+    assert data[p1.id]["costo_unitario"] == "120.0000"
+    assert data[p1.id]["proveedor"] == prov_a.id
+
+    data = admin_client.get(f"{BASE}ultimos/", {"proveedor": historial[3].id}).json()
+    assert {f["producto"]: f["costo_unitario"] for f in data} == {p1.id: "90.0000", p2.id: "50.0000"}
+
+
+def test_mejor_proveedor(admin_client, historial):
+    p1, _, prov_a, prov_b = historial
+
+    r = admin_client.get(f"{BASE}mejor-proveedor/", {"producto": p1.id})
+    assert r.status_code == 200, r.content
+    [fila] = r.json()
+    assert fila["mejor"]["proveedor"] == prov_b.id
+    assert [c["proveedor"] for c in fila["proveedores"]] == [prov_b.id, prov_a.id]
+
+
+def test_mejor_proveedor_compara_en_la_misma_moneda(admin_client, historial):
+    p1, _, prov_a, prov_b = historial
+    prov_usd = baker.make(Proveedor, local_id=1, nombre="Importador")
+    _costo(p1, prov_usd, "1", 0, moneda="USD")  # "1" en dólares no es el más barato
+
+    [fila] = admin_client.get(f"{BASE}mejor-proveedor/", {"producto": p1.id}).json()
+    assert [c["proveedor"] for c in fila["proveedores"]] == [prov_b.id, prov_a.id]
+
+    [fila] = admin_client.get(f"{BASE}mejor-proveedor/", {"producto": p1.id, "moneda": "usd"}).json()
+    assert fila["mejor"]["proveedor"] == prov_usd.id and fila["mejor"]["moneda"] == "USD"
+
+
+def test_listado_sin_x_local_id_sigue_andando(admin_client, historial):
+    r = admin_client.get(BASE)
+    assert r.status_code == 200, r.content
+    assert r.json()["count"] == 4  # solo el local 1
+
+    admin_client.credentials()  # cliente viejo, sin header
+    r = admin_client.get(BASE)
+    assert r.status_code == 200, r.content
+    assert r.json()["count"] == 5
+
+    assert admin_client.get(f"{BASE}ultimos/").status_code == 400
@@ -0,0 +1,190 @@
+# tests/test_query_counts.py
+"""
+Regresión de N+1: cada endpoint de lectura tiene que hacer la misma cantidad
+de queries con 1, 10 o 100 filas. Se mide siempre en frío (cache y listas de
+precios vacías) para que lo cacheado no tape nada.
+
+Para sumar un endpoint: un caso en CASOS con la URL y la función que siembra
+n filas más. Los datos compartidos (la venta de un detalle, etc.) van en ctx.
+"""
+import shutil
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from catalogo.models import Categoria, Cliente, PrecioHistorico, Producto, ProductoEliminado, Proveedor
+from compras.models import Compra, CompraDetalle
+from core_app.models import Local
+from ventas.models import Venta, VentaDetalle
+
+pytestmark = pytest.mark.django_db
+
+FILAS = (1, 10, 100)
+HOY = timezone.localdate()
+RANGO = f"desde={HOY}&hasta={HOY}"
+
+
+def _una(ctx, clave, crear):
+    if clave not in ctx:
+        ctx[clave] = crear()
+    return ctx[clave]
+
+
+def _productos(n, ctx):
+    # cada producto con su categoría: si el listado no hace el join, crece
+    return [
+        baker.make(Producto, local_id=1, categoria=baker.make(Categoria, local_id=1),
+                   precio_venta=Decimal("10"), stock_actual=Decimal("5"), precio_compra_prom=Decimal("4"))
+        for _ in range(n)
+    ]
+
+
+def _proveedor(ctx):
+    return _una(ctx, "proveedor", lambda: baker.make(Proveedor, local_id=1))
+
+
+def _precios(n, ctx):
+    for producto in _productos(n, ctx):
+        baker.make(PrecioHistorico, producto=producto, proveedor=baker.make(Proveedor, local_id=1),
+                   costo_unitario=Decimal("3"))
+
+
+def _ventas(n, ctx, detalles=2):
+    for _ in range(n):
+        venta = baker.make(Venta, local_id=1, estado="confirmada", total=Decimal("20"), fecha=timezone.now(),
+                           usuario=ctx["usuario"])
+        for producto in _productos(detalles, ctx):
+            baker.make(VentaDetalle, venta=venta, producto=producto,
+                       cantidad=Decimal("1"), precio_unitario=Decimal("10"))
+
+
+def _detalles_de_venta(n, ctx):
+    venta = _una(ctx, "venta", lambda: baker.make(Venta, local_id=1, usuario=ctx["usuario"]))
+    for producto in _productos(n, ctx):
+        baker.make(VentaDetalle, venta=venta, producto=producto,
+                   cantidad=Decimal("1"), precio_unitario=Decimal("10"))
+
+
+def _compras(n, ctx, detalles=2):
+    for _ in range(n):
+        compra = baker.make(Compra, local_id=1, proveedor=_proveedor(ctx), estado="confirmada",
+                            total=Decimal("8"), fecha=timezone.now())
+        for producto in _productos(detalles, ctx):
+            baker.make(CompraDetalle, compra=compra, producto=producto,
+                       cantidad=Decimal("1"), costo_unitario=Decimal("4"))
+
+
+def _detalles_de_compra(n, ctx):
+    compra = _una(ctx, "compra", lambda: baker.make(Compra, local_id=1, proveedor=_proveedor(ctx)))
+    for producto in _productos(n, ctx):
+        baker.make(CompraDetalle, compra=compra, producto=producto,
+                   cantidad=Decimal("1"), costo_unitario=Decimal("4"))
+
+
+def _clientes(n, ctx):
+    baker.make(Cliente, activo=True, lat=-34.6, lng=-58.4, _quantity=n)
+
+
+def _eliminados(n, ctx):
+    _productos(n, ctx)
+    baker.make(ProductoEliminado, local_id=1, _quantity=n)
+
+
+def _locales(n, ctx):
+    baker.make(Local, activo=True, _quantity=n)
+
+
+def _categorias_con_productos(n, ctx):
+    _productos(n, ctx)
+
+
+# (id, cliente, url, sembrar)
+CASOS = [
+    # catalogo
+    ("categorias", "auth", "/api/catalogo/categorias/", _categorias_con_productos),
+    ("categoria", "auth", "/api/catalogo/categorias/{categoria}/", _categorias_con_productos),
+    ("categorias-resumen", "auth", "/api/catalogo/categorias/resumen/", _categorias_con_productos),
+    ("productos", "auth", "/api/catalogo/productos/", _productos),
+    ("productos-cursor", "auth", "/api/catalogo/productos/?cursor=", _productos),
+    ("producto", "auth", "/api/catalogo/productos/{producto}/", _productos),
+    ("productos-cambios", "auth", "/api/catalogo/productos/cambios/?limit=5000", _eliminados),
+    ("lista-precios", "auth", "/api/catalogo/lista-precios/", _productos),
+    ("clientes", "auth", "/api/catalogo/clientes/", _clientes),
+    ("cliente", "auth", "/api/catalogo/clientes/{cliente}/", _clientes),
+    ("clientes-cercanos", "auth", "/api/catalogo/clientes/cercanos/?lat=-34.6&lng=-58.4&limit=1000", _clientes),
+    ("proveedores", "admin", "/api/catalogo/proveedores/", _precios),
+    ("proveedor", "admin", "/api/catalogo/proveedores/{proveedor}/", _precios),
+    ("precios-historicos", "admin", "/api/catalogo/precios-historicos/", _precios),
+    ("precio-historico", "admin", "/api/catalogo/precios-historicos/{preciohistorico}/", _precios),
+    ("precios-ultimos", "admin", "/api/catalogo/precios-historicos/ultimos/", _precios),
+    ("precios-mejor-proveedor", "admin", "/api/catalogo/precios-historicos/mejor-proveedor/", _precios),
+    # ventas
+    ("ventas", "auth", "/api/ventas/", _ventas),
+    ("ventas-expand", "auth", "/api/ventas/?expand=detalles", _ventas),
+    ("ventas-cursor", "auth", "/api/ventas/?cursor=&expand=detalles", _ventas),
+    ("venta", "auth", "/api/ventas/{venta}/", _detalles_de_venta),
+    ("venta-ticket", "auth", "/api/ventas/{venta}/ticket/", _detalles_de_venta),
+    ("ventas-historial", "auth", f"/api/ventas/historial/?{RANGO}", _ventas),
+    # compras
+    ("compras", "auth", "/api/compras/", _compras),
+    ("compras-expand", "auth", "/api/compras/?expand=detalles", _compras),
+    ("compra", "auth", "/api/compras/{compra}/", _detalles_de_compra),
+    ("compras-historial", "auth", f"/api/compras/historial/?{RANGO}", _compras),
+    # reportes
+    ("reporte-financiero", "auth", f"/api/reportes/financieros/?{RANGO}", _ventas),
+    ("reporte-top-productos", "auth", f"/api/reportes/top-productos/?{RANGO}&limit=1000", _ventas),
+    ("reporte-valuacion", "admin", "/api/reportes/valuacion-inventario/", _compras),
+    # core_app
+    ("locales", "anon", "/api/core/locales/", _locales),
+    ("local", "anon", "/api/core/locales/{local}/", _locales),
+]
+
+# para las URLs de detalle: la fila de ctx si el sembrado la guardó, si no la primera
+DETALLES = {
+    "categoria": Categoria, "producto": Producto, "cliente": Cliente, "proveedor": Proveedor,
+    "preciohistorico": PrecioHistorico, "local": Local, "venta": Venta, "compra": Compra,
+}
+
+
+def _get(client, url, settings):
+    # en frío: nada de lo cacheado entre una medición y la otra
+    cache.clear()
+    shutil.rmtree(settings.LISTAS_PRECIOS_DIR, ignore_errors=True)
+    r = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert r.status_code == 200, r.content[:500]
+    return r
+
+
+@pytest.mark.parametrize("cliente,url,sembrar", [pytest.param(*c[1:], id=c[0]) for c in CASOS])
+def test_queries_no_crecen_con_las_filas(
+    cliente, url, sembrar, request, settings, django_assert_num_queries, django_user_model
+):
+    client = request.getfixturevalue(f"{cliente}_client")
+    ctx = {"usuario": django_user_model.objects.get_or_create(username="vendedor")[0]}
+
+    sembrados = 0
+    esperadas = None
+    for filas in FILAS:
+        sembrar(filas - sembrados, ctx)
+        sembrados = filas
+
+        detalle = {
+            clave: (ctx[clave].pk if clave in ctx else modelo.objects.order_by("pk").first().pk)
+            for clave, modelo in DETALLES.items()
+            if f"{{{clave}}}" in url
+        }
+        destino = url.format(**detalle)
+
+        if esperadas is None:
+            _get(client, destino, settings)  # primer request del proceso (imports, contenttypes...)
+            with CaptureQueriesContext(connection) as capturadas:
+                _get(client, destino, settings)
+            esperadas = len(capturadas)
+        else:
+            with django_assert_num_queries(esperadas):
+                _get(client, destino, settings)
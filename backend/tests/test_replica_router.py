@@ -0,0 +1,106 @@
+# tests/test_replica_router.py
+"""
+La "réplica" de los tests es una segunda conexión (alias "replica") contra la
+misma base de prueba. Se usa transaction=True para que los datos estén
+commiteados y la segunda conexión los vea.
+
+El fixture es de módulo para que el alias exista antes de que pytest-django
+arme el test case (que valida la lista `databases`).
+"""
+import threading
+from decimal import Decimal
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from catalogo.models import Categoria
+from core_app.db_router import REPLICA_DB_ALIAS, lecturas_en_replica
+from core_app.models import Local
+from reportes import views as reportes_views
+from ventas.models import Venta
+
+
+def _crear_locales():
+    Local.objects.get_or_create(id=1, defaults={"nombre": "Local 1"})
+    Local.objects.get_or_create(id=2, defaults={"nombre": "Local 2"})
+
+
+@pytest.fixture(scope="module")
+def replica(django_db_setup, django_db_blocker):
+    connections.settings[REPLICA_DB_ALIAS] = {
+        **connections.settings["default"],
+        "NAME": connections["default"].settings_dict["NAME"],
+    }
+    yield connections[REPLICA_DB_ALIAS]
+    connections[REPLICA_DB_ALIAS].close()
+    del connections[REPLICA_DB_ALIAS]
+    del connections.settings[REPLICA_DB_ALIAS]
+    # los tests transaccionales vacían las tablas: dejamos los locales para el resto
+    with django_db_blocker.unblock():
+        _crear_locales()
+
+
+@pytest.fixture(autouse=True)
+def locales(request):
+    if "replica" in request.fixturenames:
+        _crear_locales()
+
+
+RANGO = f"desde={timezone.localdate()}&hasta={timezone.localdate()}"
+
+
+def _queries(fn):
+    with CaptureQueriesContext(connections["default"]) as primario:
+        with CaptureQueriesContext(connections[REPLICA_DB_ALIAS]) as replica:
+            resultado = fn()
+    return resultado, len(primario), len(replica)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", REPLICA_DB_ALIAS])
+def test_reporte_e_historial_leen_de_la_replica(replica, auth_client, monkeypatch):
+    baker.make(Venta, local_id=1, estado="confirmada", total=Decimal("100"), fecha=timezone.now())
+
+    # sin transacción abierta los agregados del reporte van en paralelo, cada uno
+    # en su thread: sus conexiones no son las que mira CaptureQueriesContext
+    agregados = []
+    original = reportes_views._total_y_cantidad
+    juntos = threading.Barrier(2, timeout=5)  # si fueran en serie, el primero no pasa
+
+    def registrar(qs):
+        agregados.append(qs.db)
+        juntos.wait()
+        return original(qs)
+
+    monkeypatch.setattr(reportes_views, "_total_y_cantidad", registrar)
+    r, en_primario, _ = _queries(lambda: auth_client.get(f"/api/reportes/financieros/?{RANGO}"))
+    assert r.status_code == 200 and r.json()["cantidad_ventas"] == 1
+    assert en_primario == 0
+    assert agregados == [REPLICA_DB_ALIAS, REPLICA_DB_ALIAS]
+
+    r, en_primario, en_replica = _queries(lambda: auth_client.get(f"/api/ventas/historial/?{RANGO}"))
+    assert r.status_code == 200 and len(r.json()["results"]) == 1
+    assert en_primario == 0 and en_replica > 0
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", REPLICA_DB_ALIAS])
+def test_resto_de_las_vistas_siguen_en_el_primario(replica, auth_client):
+    r, en_primario, en_replica = _queries(lambda: auth_client.get("/api/ventas/"))
+    assert r.status_code == 200
+    assert en_primario > 0 and en_replica == 0
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", REPLICA_DB_ALIAS])
+def test_despues_de_escribir_se_lee_del_primario(replica):
+    def leer_escribir_leer():
+        with lecturas_en_replica():
+            Categoria.objects.filter(local_id=1).count()
+            Categoria.objects.create(local_id=1, nombre="Nueva")
+            return Categoria.objects.filter(local_id=1).count()
+
+    total, en_primario, en_replica = _queries(leer_escribir_leer)
+    assert total == 1
+    assert en_replica == 1  # sólo la primera lectura
+    assert en_primario >= 2  # INSERT (+ signals) + lectura posterior
@@ -0,0 +1,62 @@
+# tests/test_reportes_api.py
+import pytest
+from decimal import Decimal
+from django.utils import timezone
+from model_bakery import baker
+
+from catalogo.models import Producto
+from compras.models import Compra
+from reportes.views import ResumenFinancieroView, TopProductosView
+from ventas.models import Venta, VentaDetalle
+
+pytestmark = pytest.mark.django_db
+
+HOY = timezone.localdate()
+RANGO = f"desde={HOY}&hasta={HOY}"
+
+
+def _venta(total, estado="confirmada", **kwargs):
+    return baker.make(Venta, local_id=1, estado=estado, total=Decimal(total), fecha=timezone.now(), **kwargs)
+
+
+def test_vistas_de_reportes_son_async():
+    assert ResumenFinancieroView.view_is_async
+    assert TopProductosView.view_is_async
+
+
+def test_resumen_financiero(auth_client, django_assert_num_queries):
+    _venta("100")
+    _venta("50.5")
+    _venta("999", estado="anulada")
+    baker.make(Compra, local_id=1, estado="confirmada", total=Decimal("30"), fecha=timezone.now())
+
+    # total + cantidad en una sola query por tabla
+    with django_assert_num_queries(2):
+        r = auth_client.get(f"/api/reportes/financieros/?{RANGO}")
+    assert r.status_code == 200, r.content
+    data = r.json()
+    assert data["cantidad_ventas"] == 2 and data["cantidad_compras"] == 1
+    assert Decimal(data["total_ventas"]) == Decimal("150.5")
+    assert Decimal(data["margen_bruto"]) == Decimal("120.5")
+
+
+def test_resumen_financiero_sin_fechas_usa_hoy(auth_client):
+    _venta("10")
+    r = auth_client.get("/api/reportes/financieros/")
+    assert r.status_code == 200
+    assert r.json()["hasta"] == r.json()["desde"]
+
+
+def test_top_productos(auth_client):
+    agua, vino = baker.make(Producto, local_id=1, nombre="Agua"), baker.make(Producto, local_id=1, nombre="Vino")
+    v = _venta("0")
+    baker.make(VentaDetalle, venta=v, producto=agua, cantidad=Decimal("5"), precio_unitario=Decimal("10"))
+    baker.make(VentaDetalle, venta=v, producto=vino, cantidad=Decimal("2"), precio_unitario=Decimal("100"))
+
+    r = auth_client.get(f"/api/reportes/top-productos/?{RANGO}&limit=1")
+    assert r.status_code == 200
+    assert [(p["producto_nombre"], Decimal(p["facturacion"])) for p in r.json()] == [("Agua", Decimal("50"))]
+
+
+def test_reportes_requieren_autenticacion(anon_client):
+    assert anon_client.get("/api/reportes/financieros/").status_code == 401
@@ -0,0 +1,108 @@
+# tests/test_settings_db.py
+"""Configuración de conexiones de core/settings.py según el entorno."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# el autouse ensure_locales de conftest necesita la base de prueba
+pytestmark = pytest.mark.django_db
+
+SETTINGS = Path(__file__).resolve().parent.parent / "core" / "settings.py"
+URL = "postgres://u:p@db.example.com:5432/bebidas"
+
+
+def _cargar_settings():
+    spec = importlib.util.spec_from_file_location("settings_prueba", SETTINGS)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo.DATABASES["default"]
+
+
+def test_conexion_persistente_con_health_checks(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", URL)
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "sync")
+    monkeypatch.delenv("DB_POOL", raising=False)
+    db = _cargar_settings()
+    assert db["CONN_MAX_AGE"] == 600
+    assert db["CONN_HEALTH_CHECKS"] is True
+    assert "pool" not in db.get("OPTIONS", {})
+
+
+def test_pool_desactiva_conexiones_persistentes(monkeypatch):
+    pytest.importorskip("psycopg_pool")
+    monkeypatch.setenv("DATABASE_URL", URL)
+    monkeypatch.setenv("DB_POOL", "1")
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "8")
+    db = _cargar_settings()
+    assert db["CONN_MAX_AGE"] == 0
+    assert db["CONN_HEALTH_CHECKS"] is True
+    assert db["OPTIONS"]["pool"]["max_size"] == 8
+
+
+def test_el_pool_se_puede_construir(monkeypatch):
+    # el dict de settings solo no alcanza: Django le agrega sus propios argumentos
+    # al ConnectionPool (check=, configure=) y no pueden chocar con los nuestros
+    psycopg_pool = pytest.importorskip("psycopg_pool")
+    from django.db.utils import ConnectionHandler
+
+    monkeypatch.setenv("DATABASE_URL", URL)
+    monkeypatch.setenv("DB_POOL", "1")
+    conexion = ConnectionHandler({"default": _cargar_settings()})["default"]
+    try:
+        pool = conexion.pool  # open=False: no se conecta a la base
+        assert isinstance(pool, psycopg_pool.ConnectionPool)
+        assert pool.max_size == 4
+    finally:
+        conexion.close_pool()
+
+
+def test_worker_asgi_usa_pool_y_nunca_conexiones_persistentes(monkeypatch):
+    pytest.importorskip("psycopg_pool")
+    monkeypatch.setenv("DATABASE_URL", URL)
+    monkeypatch.delenv("GUNICORN_WORKER_CLASS", raising=False)
+    monkeypatch.delenv("DB_POOL", raising=False)
+    db = _cargar_settings()
+    assert db["CONN_MAX_AGE"] == 0
+    assert "pool" in db["OPTIONS"]
+    # el default de producción: el primer acceso a la base arma el pool
+    from django.db.utils import ConnectionHandler
+
+    conexion = ConnectionHandler({"default": db})["default"]
+    try:
+        assert conexion.pool is not None
+    finally:
+        conexion.close_pool()
+
+    # aun apagando el pool: una conexión persistente por thread se acumularía
+    monkeypatch.setenv("DB_POOL", "0")
+    db = _cargar_settings()
+    assert db["CONN_MAX_AGE"] == 0
+    assert "pool" not in db.get("OPTIONS", {})
+
+
+def test_sqlite_nunca_lleva_pool(monkeypatch, tmp_path):
+    # bench_carga corre por defecto con DATABASE_URL=sqlite:///... y el worker ASGI
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'bench.sqlite3'}")
+    monkeypatch.delenv("GUNICORN_WORKER_CLASS", raising=False)
+    monkeypatch.setenv("DB_POOL", "1")
+    db = _cargar_settings()
+    assert "pool" not in db.get("OPTIONS", {})
+
+    from django.db.utils import ConnectionHandler
+
+    conexion = ConnectionHandler({"default": db})["default"]
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchone() == (1,)
+    finally:
+        conexion.close()
+
+
+def test_sin_replica_configurada_todo_va_al_primario():
+    from core_app.db_router import ReplicaRouter, lecturas_en_replica
+    from ventas.models import Venta
+
+    with lecturas_en_replica():
+        assert ReplicaRouter().db_for_read(Venta) is None
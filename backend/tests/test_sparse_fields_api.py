@@ -0,0 +1,50 @@
+# tests/test_sparse_fields_api.py
+import pytest
+from decimal import Decimal
+from model_bakery import baker
+from catalogo.models import Categoria, Producto
+from ventas.models import Venta, VentaDetalle
+from compras.models import Compra, CompraDetalle
+
+pytestmark = pytest.mark.django_db
+
+
+def test_productos_fields_recorta_payload(auth_client):
+    cat = baker.make(Categoria, local_id=1, nombre="Vinos")
+    baker.make(Producto, local_id=1, categoria=cat, precio_venta=Decimal("10"))
+
+    r = auth_client.get("/api/catalogo/productos/", {"fields": "id,nombre,categoria_nombre"})
+    assert r.status_code == 200, r.content
+    item = r.json()["results"][0]
+    assert set(item) == {"id", "nombre", "categoria_nombre"}
+    assert item["categoria_nombre"] == "Vinos"
+
+
+def test_ventas_listado_expande_detalles_sólo_si_se_pide(auth_client, django_assert_num_queries):
+    prod = baker.make(Producto, local_id=1, nombre="Fernet")
+    for _ in range(3):
+        v = baker.make(Venta, local_id=1)
+        baker.make(VentaDetalle, venta=v, producto=prod, cantidad=1, precio_unitario=1)
+
+    # count + page, sin prefetch de detalles
+    with django_assert_num_queries(2):
+        r = auth_client.get("/api/ventas/", {"fields": "id,fecha,estado,total"})
+    assert all(set(item) == {"id", "fecha", "estado", "total"} for item in r.json()["results"])
+
+    r = auth_client.get("/api/ventas/", {"expand": "detalles"})
+    items = r.json()["results"]
+    assert all(item["detalles"][0]["producto_nombre"] == "Fernet" for item in items)
+
+    assert "detalles" not in auth_client.get("/api/ventas/").json()["results"][0]
+
+
+def test_compra_detalle_trae_detalles_por_defecto(auth_client):
+    prov = baker.make("catalogo.Proveedor", local_id=1)
+    c = baker.make(Compra, local_id=1, proveedor=prov)
+    baker.make(CompraDetalle, compra=c, producto=baker.make(Producto, local_id=1), cantidad=1, costo_unitario=1)
+
+    data = auth_client.get(f"/api/compras/{c.id}/").json()
+    assert len(data["detalles"]) == 1
+
+    data = auth_client.get(f"/api/compras/{c.id}/", {"fields": "id,total"}).json()
+    assert set(data) == {"id", "total"}
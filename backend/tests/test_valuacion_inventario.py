@@ -0,0 +1,56 @@
+# tests/test_valuacion_inventario.py
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.core.management import call_command
+from model_bakery import baker
+from catalogo.models import Categoria, Producto
+from reportes.models import ValuacionInventario
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/reportes/valuacion-inventario/"
+
+
+@pytest.fixture
+def inventario():
+    vinos = baker.make(Categoria, local_id=1, nombre="Vinos")
+    for marca, stock, costo in (("Trapiche", "10", "100"), ("Trapiche", "2", "50"), ("Norton", "1", "300")):
+        baker.make(
+            Producto, local_id=1, categoria=vinos, marca=marca,
+            stock_actual=Decimal(stock), precio_compra_prom=Decimal(costo),
+        )
+    baker.make(Producto, local_id=2, stock_actual=Decimal("99"), precio_compra_prom=Decimal("99"))
+
+
+def test_valuacion_actual(admin_client, inventario):
+    r = admin_client.get(URL)
+    assert r.status_code == 200, r.content
+    data = r.json()
+    assert data["origen"] == "actual"
+    assert data["total"] == "1400.00"
+    items = {i["marca"]: i for i in data["items"]}
+    assert items["Trapiche"]["productos"] == 2
+    assert items["Trapiche"]["valor"] == "1100.00"
+    assert data["por_categoria"] == [{"categoria": "Vinos", "valor": "1400.00"}]
+
+
+def test_snapshot_y_lectura_historica(admin_client, inventario):
+    call_command("snapshot_valuacion", "--fecha", "2025-10-31", "--local", "1")
+    # re-ejecutar pisa la foto en vez de duplicarla
+    call_command("snapshot_valuacion", "--fecha", "2025-10-31", "--local", "1")
+    assert ValuacionInventario.objects.filter(local_id=1, fecha=date(2025, 10, 31)).count() == 2
+
+    # el stock cambia después: la foto no
+    Producto.objects.filter(local_id=1).update(stock_actual=0)
+
+    data = admin_client.get(URL, {"fecha": "2025-11-15"}).json()
+    assert data["origen"] == "snapshot"
+    assert data["fecha"] == "2025-10-31"
+    assert data["total"] == "1400.00"
+
+    assert admin_client.get(URL, {"fecha": "2025-01-01"}).status_code == 404
+
+
+def test_valuacion_sólo_admin(auth_client):
+    assert auth_client.get(URL).status_code == 403
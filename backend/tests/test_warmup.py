@@ -0,0 +1,67 @@
+# tests/test_warmup.py
+import pytest
+from decimal import Decimal
+from django.core.cache import cache
+from model_bakery import baker
+
+from catalogo.lista_precios import leer_etag
+from catalogo.models import Categoria, Producto
+from catalogo.services import _clave_resumen_categorias
+from core_app.models import Local
+from core_app.services import CLAVE_LOCALES_ACTIVOS
+from core_app.warmup import precalentar_caches, precalentar_proceso
+
+pytestmark = pytest.mark.django_db
+
+
+def test_precalentar_proceso_publica_listas_de_precios():
+    baker.make(Producto, local_id=1, codigo="A1", precio_venta=Decimal("10"))
+    assert leer_etag(1) is None
+
+    precalentar_proceso()
+
+    assert leer_etag(1) is not None
+    assert leer_etag(2) is not None
+
+
+def test_precalentar_proceso_no_deja_pools_abiertos():
+    # los workers forkeados heredarían sus sockets y threads que ya no existen
+    pytest.importorskip("psycopg_pool")
+    from django.db import connections
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    connections.settings["pool_prueba"] = {
+        **connections.settings["default"],
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": "bebidas", "HOST": "db.example.com",
+        "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": {"min_size": 1, "max_size": 2}},
+    }
+    try:
+        assert connections["pool_prueba"].pool is not None  # open=False: no se conecta
+        precalentar_proceso()
+        assert "pool_prueba" not in DatabaseWrapper._connection_pools
+    finally:
+        DatabaseWrapper._connection_pools.pop("pool_prueba", None)
+        del connections["pool_prueba"]
+        del connections.settings["pool_prueba"]
+
+
+def test_precalentar_caches_llena_locales_y_resumenes():
+    baker.make(Categoria, local_id=1, nombre="Vinos")
+    precalentar_caches()
+
+    assert cache.get(CLAVE_LOCALES_ACTIVOS) is not None
+    assert cache.get(_clave_resumen_categorias(1)) is not None
+    assert cache.get(_clave_resumen_categorias(2)) is not None
+
+
+def test_locales_sale_de_cache_y_se_invalida(anon_client, django_assert_num_queries, django_capture_on_commit_callbacks):
+    assert [l["id"] for l in anon_client.get("/api/core/locales/").json()] == [1, 2]
+    with django_assert_num_queries(0):
+        anon_client.get("/api/core/locales/")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Local.objects.filter(id=2).update(activo=False)
+        Local.objects.get(id=2).save()
+    assert [l["id"] for l in anon_client.get("/api/core/locales/").json()] == [1]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 22:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0001_initial'),
+        ('ventas', '0003_alter_venta_options_alter_ventadetalle_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['local', 'fecha', 'id'], name='ventas_venta_local_fecha_idx'),
+        ),
+    ]
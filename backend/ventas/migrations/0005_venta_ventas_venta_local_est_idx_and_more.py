@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 23:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core_app.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('catalogo', '0009_preciohistorico_indices'),
+        ('core_app', '0002_local_lat_local_lng'),
+        ('ventas', '0004_venta_ventas_venta_local_fecha_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='venta',
+            index=models.Index(fields=['local', 'estado', 'fecha'], name='ventas_venta_local_est_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='ventadetalle',
+            index=models.Index(fields=['venta', 'producto'], name='ventas_det_venta_prod_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='ventadetalle',
+            index=models.Index(fields=['producto', 'venta'], name='ventas_det_prod_venta_idx'),
+        ),
+    ]
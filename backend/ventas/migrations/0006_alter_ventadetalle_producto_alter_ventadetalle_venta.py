@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 23:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core_app.operations import RemoveFieldIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('catalogo', '0009_preciohistorico_indices'),
+        ('ventas', '0005_venta_ventas_venta_local_est_idx_and_more'),
+    ]
+
+    operations = [
+        RemoveFieldIndexConcurrently(
+            model_name='ventadetalle',
+            name='producto',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, to='catalogo.producto'),
+        ),
+        RemoveFieldIndexConcurrently(
+            model_name='ventadetalle',
+            name='venta',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='detalles', to='ventas.venta'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower
+
+
+def estado_en_minusculas(apps, schema_editor):
+    # el historial filtra estado por igualdad (índice local, estado, fecha):
+    # las filas viejas guardadas como "Confirmada" dejarían de aparecer
+    Venta = apps.get_model("ventas", "Venta")
+    (
+        Venta.objects.annotate(estado_min=Lower("estado"))
+        .exclude(estado=F("estado_min"))
+        .update(estado=Lower("estado"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventas', '0006_alter_ventadetalle_producto_alter_ventadetalle_venta'),
+    ]
+
+    operations = [
+        migrations.RunPython(estado_en_minusculas, migrations.RunPython.noop),
+    ]
@@ -31,15 +31,24 @@ class Venta(models.Model):
         blank=True,
     )
 
+    class Meta:
+        indexes = [
+            # listados/keyset: WHERE local_id = ? ORDER BY fecha DESC, id DESC
+            models.Index(fields=["local", "fecha", "id"], name="ventas_venta_local_fecha_idx"),
+            # reportes e historial: WHERE local_id = ? AND estado = ? AND fecha BETWEEN ...
+            models.Index(fields=["local", "estado", "fecha"], name="ventas_venta_local_est_idx"),
+        ]
+
     def __str__(self):
         return f"Venta #{self.id or 'N'} - {self.estado}"
 
 
 class VentaDetalle(models.Model):
-    venta = models.ForeignKey(Venta, on_delete=models.CASCADE, related_name="detalles")
+    # sin índice propio: los cubren (venta, producto) y (producto, venta) de Meta
+    venta = models.ForeignKey(Venta, on_delete=models.CASCADE, related_name="detalles", db_index=False)
     renglon = models.PositiveIntegerField(default=1)
 
-    producto = models.ForeignKey(Producto, on_delete=models.PROTECT)
+    producto = models.ForeignKey(Producto, on_delete=models.PROTECT, db_index=False)
 
     cantidad = models.DecimalField(max_digits=14, decimal_places=4)
     precio_unitario = models.DecimalField(max_digits=14, decimal_places=4)
@@ -49,5 +58,13 @@ class VentaDetalle(models.Model):
 
     total_renglon = models.DecimalField(max_digits=14, decimal_places=4, default=0)
 
+    class Meta:
+        indexes = [
+            # detalles de un conjunto de ventas (top productos, prefetch de detalles)
+            models.Index(fields=["venta", "producto"], name="ventas_det_venta_prod_idx"),
+            # ventas de un producto (historial por producto, PROTECT al borrar)
+            models.Index(fields=["producto", "venta"], name="ventas_det_prod_venta_idx"),
+        ]
+
     def __str__(self):
         return f"Det #{self.id} de Venta #{self.venta_id}"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core_app.sparse import SparseFieldsMixin
 from .models import Venta, VentaDetalle
 from django.utils import timezone
 
@@ -28,7 +29,7 @@ class VentaDetalleReadSerializer(serializers.ModelSerializer):
         ]
 
 
-class VentaReadSerializer(serializers.ModelSerializer):
+class VentaReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     local_nombre = serializers.CharField(source="local.nombre", read_only=True)
     usuario_username = serializers.CharField(source="usuario.username", read_only=True)
 
@@ -50,6 +51,8 @@ class VentaReadSerializer(serializers.ModelSerializer):
             "total",
             "detalles",
         ]
+        # detalles sólo con ?expand=detalles en el listado
+        expandable_fields = ["detalles"]
 
 
 # -------------------------
@@ -31,7 +31,7 @@ def confirmar_venta(venta_id: int, *, local_id: int):
             )
 
         prod.stock_actual = prod.stock_actual - det.cantidad
-        prod.save(update_fields=["stock_actual"])
+        prod.save(update_fields=["stock_actual", "updated_at"])
 
     venta.estado = "confirmada"
     venta.save(update_fields=["estado"])
@@ -58,7 +58,7 @@ def anular_venta(venta_id: int, *, local_id: int):
                 {"producto": f"El producto {prod.id} no pertenece al Local {local_id}."}
             )
         prod.stock_actual = prod.stock_actual + det.cantidad
-        prod.save(update_fields=["stock_actual"])
+        prod.save(update_fields=["stock_actual", "updated_at"])
 
     venta.estado = "anulada"
     venta.save(update_fields=["estado"])
@@ -1,9 +1,10 @@
 # backend/ventas/views.py
 
+import logging
 from decimal import Decimal
-from io import BytesIO
 
 from django.db import transaction
+from django.db.models import Count, Q, Sum, Window
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 
@@ -12,17 +13,39 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-
-import qrcode
+from core_app.authentication import usuario_de
+from core_app.db_router import LecturaEnReplicaMixin
+from core_app.pagination import HistorialPagination, ListadoPagination
+from core_app.sparse import SparseFieldsViewMixin
+from core_app.fast_serializers import FastListMixin
 
 from .models import Venta, VentaDetalle
 from .serializers import VentaWriteSerializer, VentaReadSerializer
 from catalogo.models import Producto
 
+logger = logging.getLogger(__name__)
+
 
-class VentaViewSet(viewsets.ModelViewSet):
+def _totales(fila):
+    """Pie del historial a partir de las ventanas de una fila (vacía si no hubo ventas)."""
+    por_estado = {
+        clave: {
+            "cantidad": fila.get(f"cantidad_{clave}", 0),
+            # a la escala de Venta.total: SQLite devuelve la suma sin cuantizar
+            "total": (fila.get(f"total_{clave}") or Decimal("0")).quantize(Decimal("0.0001")),
+        }
+        for clave, _ in Venta.ESTADOS
+    }
+    return {
+        "cantidad": sum(e["cantidad"] for e in por_estado.values()),
+        "total": str(sum(e["total"] for e in por_estado.values())),
+        "por_estado": {
+            clave: {"cantidad": e["cantidad"], "total": str(e["total"])} for clave, e in por_estado.items()
+        },
+    }
+
+
+class VentaViewSet(LecturaEnReplicaMixin, SparseFieldsViewMixin, FastListMixin, viewsets.ModelViewSet):
     """
     /api/ventas/                -> list / create
     /api/ventas/{id}/           -> retrieve
@@ -30,7 +53,11 @@ class VentaViewSet(viewsets.ModelViewSet):
     /api/ventas/{id}/anular/    -> POST anular
     /api/ventas/{id}/ticket/    -> GET ticket PDF
     /api/ventas/historial/      -> GET (dashboard)
+
+    Lecturas: ?fields=id,fecha,total y ?expand=detalles (ver core_app.sparse).
+    El historial se lee de la réplica si está configurada (core_app.db_router).
     """
+    replica_actions = {"historial"}
     queryset = (
         Venta.objects
         .select_related("local", "usuario")
@@ -39,6 +66,17 @@ class VentaViewSet(viewsets.ModelViewSet):
         .order_by("-fecha", "-id")
     )
     permission_classes = [IsAuthenticated]
+    expandable = {"detalles": ("detalles", "detalles__producto")}
+    pagination_class = ListadoPagination
+    keyset_ordering = ("-fecha", "-id")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # si viene X-Local-ID filtramos por local (así el listado usa el índice local/fecha/id)
+        local_id = self.request.headers.get("X-Local-ID", "")
+        if local_id.isdigit():
+            qs = qs.filter(local_id=int(local_id))
+        return qs
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -55,16 +93,15 @@ class VentaViewSet(viewsets.ModelViewSet):
         RESPUESTA -> {id, estado, total}
         (esto es lo que el front necesita para después confirmar)
         """
-        print("💾 perform_create() entrando...")
-        print("💾 request.data =", request.data)
-
         serializer = VentaWriteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        # sin el payload: puede traer datos del cliente y es lo más voluminoso
+        logger.debug("Creando venta", extra={"renglones": len(serializer.validated_data.get("detalles", ()))})
 
         # por ahora local fijo=1, más adelante vendrá del header X-Local-ID
         venta = serializer.save(
             local_id=1,
-            usuario=request.user,
+            usuario=usuario_de(request),
         )
 
         # calculamos total, por si el serializer todavía no lo setea
@@ -73,6 +110,7 @@ class VentaViewSet(viewsets.ModelViewSet):
             total_sum += Decimal(det.cantidad) * Decimal(det.precio_unitario)
         venta.total = total_sum
         venta.save(update_fields=["total"])
+        logger.info("Venta borrador creada", extra={"venta_id": venta.id, "total": str(venta.total)})
 
         # armamos respuesta cortita y clara
         data_resp = {
@@ -140,7 +178,7 @@ class VentaViewSet(viewsets.ModelViewSet):
             prod.stock_actual = (
                 Decimal(prod.stock_actual) - Decimal(det.cantidad)
             )
-            prod.save(update_fields=["stock_actual"])
+            prod.save(update_fields=["stock_actual", "updated_at"])
 
         # 3) marcar confirmada
         venta.estado = "confirmada"
@@ -193,7 +231,7 @@ class VentaViewSet(viewsets.ModelViewSet):
             prod.stock_actual = (
                 Decimal(prod.stock_actual) + Decimal(det.cantidad)
             )
-            prod.save(update_fields=["stock_actual"])
+            prod.save(update_fields=["stock_actual", "updated_at"])
 
         venta.estado = "anulada"
         venta.save(update_fields=["estado", "updated_at"])
@@ -214,9 +252,13 @@ class VentaViewSet(viewsets.ModelViewSet):
         /api/ventas/historial/?desde=2025-10-26&hasta=2025-10-26&estado=todos
         Devuelve ventas en ese rango de fechas (inclusive),
         filtrando opcionalmente por estado.
+
+        Paginado por keyset ({next, previous, results}, ver HistorialPagination).
+        La primera página trae además `totales`: cantidad y suma por estado de
+        todo el rango, para el pie de la tabla.
         """
-        desde_str = request.query_params.get("desde")
-        hasta_str = request.query_params.get("hasta")
+        desde_str = request.query_params.get("desde", "")
+        hasta_str = request.query_params.get("hasta", "")
         estado = request.query_params.get("estado", "todos").lower()
 
         hoy = timezone.localdate()
@@ -234,26 +276,47 @@ class VentaViewSet(viewsets.ModelViewSet):
             )
         )
 
+        # sólo se devuelven 4 columnas: values(), sin joins ni prefetch de detalles
         qs = (
             self.get_queryset()
             .filter(fecha__range=(desde_dt, hasta_dt))
-            .prefetch_related("detalles", "detalles__producto")
+            .select_related(None)
+            .prefetch_related(None)
         )
 
         if estado != "todos":
-            qs = qs.filter(estado__iexact=estado)
+            # minúsculas acá y en la base (migración estado_en_minusculas): igualdad
+            # exacta para usar el índice (local, estado, fecha)
+            qs = qs.filter(estado=estado)
+
+        paginador = HistorialPagination()
+        primera_pagina = paginador.cursor_query_param not in request.query_params
+        columnas = ["id", "fecha", "estado", "total"]
+        if primera_pagina:
+            # el pie va en la misma query: ventanas sobre todo el rango (se
+            # calculan antes del LIMIT) que vienen repetidas en cada fila
+            pie = {}
+            for clave, _ in Venta.ESTADOS:
+                pie[f"cantidad_{clave}"] = Window(Count("id", filter=Q(estado=clave)))
+                pie[f"total_{clave}"] = Window(Sum("total", filter=Q(estado=clave)))
+            qs = qs.annotate(**pie)
+            columnas += pie
+
+        filas = paginador.paginate_queryset(qs.values(*columnas), request, view=self)
 
-        # devolvemos lista resumida (no hace falta cada detalle ahora)
         data = [
             {
-                "id": v.id,
-                "fecha": v.fecha,
-                "estado": v.estado,
-                "total": str(v.total),
+                "id": v["id"],
+                "fecha": v["fecha"],
+                "estado": v["estado"],
+                "total": str(v["total"]),
             }
-            for v in qs
+            for v in filas
         ]
-        return Response(data, status=status.HTTP_200_OK)
+        response = paginador.get_paginated_response(data)
+        if primera_pagina:
+            response.data["totales"] = _totales(filas[0] if filas else {})
+        return response
 
     # =========================
     # TICKET (PDF + QR)
@@ -276,7 +339,8 @@ class VentaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # más adelante: armar el PDF con reportlab + qrcode,
+        # más adelante: armar el PDF con reportlab + qrcode (importados acá
+        # adentro, no a nivel módulo: pesan y sólo los usa este camino),
         # generar BytesIO, devolver como FileResponse.
         # Por ahora:
         return Response(
@@ -1,6 +1,8 @@
 import { useEffect, useState } from "react";
 import {
+  cursorDe,
   fetchHistorialVentas,
+  fetchHistorialVentasSiguiente,
   fetchVentaDetalle,
 } from "../services/historial.js";
 import ModalDetalleOperacion from "../components/ModalDetalleOperacion.jsx";
@@ -14,6 +16,13 @@ export default function HistorialVentas() {
 
   const [items, setItems] = useState([]); // listado
   const [loadingList, setLoadingList] = useState(false);
+  // el historial viene paginado (100 por página): el cursor de la siguiente
+  // y los filtros con los que se buscó (los inputs pueden haber cambiado)
+  const [siguiente, setSiguiente] = useState(null);
+  const [filtros, setFiltros] = useState(null);
+  const [loadingMas, setLoadingMas] = useState(false);
+  // totales de todo el rango (sólo vienen en la primera página)
+  const [totales, setTotales] = useState(null);
 
   const [showModal, setShowModal] = useState(false);
   const [detalle, setDetalle] = useState(null);
@@ -22,13 +31,13 @@ export default function HistorialVentas() {
   const buscar = async () => {
     setLoadingList(true);
     try {
-      const resp = await fetchHistorialVentas({
-        desde,
-        hasta,
-        estado,
-      });
+      const params = { desde, hasta, estado };
+      const resp = await fetchHistorialVentas(params);
       const data = resp.data?.results || [];
       setItems(data);
+      setFiltros(params);
+      setSiguiente(cursorDe(resp.data?.next));
+      setTotales(resp.data?.totales || null);
     } catch (err) {
       console.error("Error cargando historial ventas", err);
       alert("No se pudo cargar el historial de ventas.");
@@ -37,6 +46,27 @@ export default function HistorialVentas() {
     }
   };
 
+  const verMas = async () => {
+    if (!siguiente) return;
+    setLoadingMas(true);
+    try {
+      const resp = await fetchHistorialVentasSiguiente(filtros, siguiente);
+      const data = resp.data?.results || [];
+      setItems((prev) => [...prev, ...data]);
+      setSiguiente(cursorDe(resp.data?.next));
+    } catch (err) {
+      console.error("Error cargando más ventas", err);
+      alert("No se pudieron cargar más ventas.");
+    } finally {
+      setLoadingMas(false);
+    }
+  };
+
+  const formatoPesos = (valor) =>
+    Number(valor || 0).toLocaleString("es-AR", {
+      minimumFractionDigits: 2,
+    });
+
   const verDetalle = async (id) => {
     setShowModal(true);
     setLoadingDetalle(true);
@@ -138,12 +168,7 @@ export default function HistorialVentas() {
                   <td>#{venta.id}</td>
                   <td>{new Date(venta.fecha).toLocaleString()}</td>
                   <td className="text-capitalize">{venta.estado}</td>
-                  <td>
-                    $
-                    {Number(venta.total || 0).toLocaleString("es-AR", {
-                      minimumFractionDigits: 2,
-                    })}
-                  </td>
+                  <td>${formatoPesos(venta.total)}</td>
                   <td>
                     <button
                       className="btn btn-outline-dark btn-sm"
@@ -156,9 +181,43 @@ export default function HistorialVentas() {
               ))
             )}
           </tbody>
+          {totales && totales.cantidad > 0 && (
+            <tfoot className="table-light">
+              <tr>
+                <td colSpan="3" className="fw-bold">
+                  {totales.cantidad} ventas en el rango
+                  {items.length < totales.cantidad &&
+                    ` (mostrando ${items.length})`}
+                  <div className="small fw-normal text-muted">
+                    {Object.entries(totales.por_estado)
+                      .filter(([, e]) => e.cantidad > 0)
+                      .map(
+                        ([nombre, e]) =>
+                          `${nombre}: ${e.cantidad} ($${formatoPesos(e.total)})`
+                      )
+                      .join(" · ")}
+                  </div>
+                </td>
+                <td className="fw-bold">${formatoPesos(totales.total)}</td>
+                <td></td>
+              </tr>
+            </tfoot>
+          )}
         </table>
       </div>
 
+      {siguiente && (
+        <div className="d-grid mt-3">
+          <button
+            className="btn btn-outline-primary"
+            disabled={loadingMas}
+            onClick={verMas}
+          >
+            {loadingMas ? "Cargando..." : "Ver más"}
+          </button>
+        </div>
+      )}
+
       {/* Modal detalle */}
       <ModalDetalleOperacion
         show={showModal}
@@ -5,6 +5,15 @@ import api from "../api/client.jsx";
 export const fetchHistorialVentas = (params) =>
   api.get("/ventas/historial/", { params });
 
+// el `next` del backend es una URL absoluta (detrás del proxy sale con
+// http://): de ahí sólo usamos el cursor y lo mandamos por la baseURL de siempre
+export const cursorDe = (next) =>
+  next ? new URL(next, window.location.origin).searchParams.get("cursor") : null;
+
+// las páginas siguientes: mismos filtros que la primera, más el cursor
+export const fetchHistorialVentasSiguiente = (params, cursor) =>
+  api.get("/ventas/historial/", { params: { ...params, cursor } });
+
 export const fetchVentaDetalle = (id) =>
   api.get(`/ventas/${id}/`);
 